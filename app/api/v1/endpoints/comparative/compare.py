@@ -6,6 +6,8 @@ from typing import List
 from app.services.comparative_service import ComparativeService
 from app.utils.ticker_formatter import parse_ticker_list
 from app.models.comparative import CompareResponse
+from app.utils.dispatch import dispatcher, YAHOO
+from app.utils.priority_scheduler import set_request_priority, PRIORITY_BATCH
 
 router = APIRouter(prefix="/compare", tags=["comparative"])
 
@@ -19,6 +21,10 @@ async def compare_tickers(
     if not ticker_list:
         return {"tickers": [], "comparison": {}, "error": "No se proporcionaron tickers válidos", "status": "error"}
     
-    result = ComparativeService.compare_tickers(ticker_list)
+    # Consulta masiva: cede los turnos de Yahoo a las consultas interactivas
+    if len(ticker_list) > 1:
+        set_request_priority(PRIORITY_BATCH)
+    
+    result = await dispatcher.run(YAHOO, ComparativeService.compare_tickers, ticker_list)
     return result
 
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Path, Query
 from app.services.comparative_service import ComparativeService
 from app.utils.ticker_formatter import parse_ticker_list
 from app.models.comparative import CorrelationResponse
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["comparative"])
 
@@ -20,6 +21,6 @@ async def get_correlation(
     if not ticker_list:
         return {"ticker": ticker, "correlations": {}, "error": "No se proporcionaron tickers válidos", "status": "error"}
     
-    result = ComparativeService.get_correlation(ticker, ticker_list, period)
+    result = await dispatcher.run(YAHOO, ComparativeService.get_correlation, ticker, ticker_list, period)
     return result
 
@@ -1,16 +1,18 @@
 """
 Endpoint para historial de dividendos
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.corporate_actions_service import CorporateActionsService
 from app.models.corporate_actions import DividendsHistoryResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["corporate-actions"])
 
 
 @router.get("/{ticker}/dividends-history", response_model=DividendsHistoryResponse)
-async def get_dividends_history(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_dividends_history(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene historial completo de dividendos pagados"""
-    result = CorporateActionsService.get_dividends_history(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, CorporateActionsService.get_dividends_history, ticker)
+    return cached_json_response(request, result, DividendsHistoryResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para splits de acciones
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.corporate_actions_service import CorporateActionsService
 from app.models.corporate_actions import SplitsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["corporate-actions"])
 
 
 @router.get("/{ticker}/splits", response_model=SplitsResponse)
-async def get_splits(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_splits(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene historial de splits de acciones"""
-    result = CorporateActionsService.get_splits(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, CorporateActionsService.get_splits, ticker)
+    return cached_json_response(request, result, SplitsResponse)
 
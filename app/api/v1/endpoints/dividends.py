@@ -6,6 +6,8 @@ from typing import List, Optional
 from app.services.yfinance_service import YFinanceService
 from app.utils.ticker_formatter import parse_ticker_list
 from app.models.dividend import DividendResponse
+from app.utils.dispatch import dispatcher, YAHOO
+from app.utils.priority_scheduler import set_request_priority, PRIORITY_BATCH
 
 router = APIRouter(prefix="/dividends", tags=["dividends"])
 
@@ -71,8 +73,12 @@ async def get_dividends(
             detail="No se proporcionaron tickers válidos"
         )
     
+    # Varios tickers: consulta masiva, cede los turnos de Yahoo a las consultas interactivas
+    if len(ticker_list) > 1:
+        set_request_priority(PRIORITY_BATCH)
+    
     # Obtener información de dividendos
-    results = YFinanceService.get_multiple_dividends(ticker_list)
+    results = await dispatcher.run(YAHOO, YFinanceService.get_multiple_dividends, ticker_list)
     
     return results
 
@@ -1,16 +1,18 @@
 """
 Endpoint para balance general
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.fundamentals_service import FundamentalsService
 from app.models.fundamentals import BalanceSheetResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["fundamentals"])
 
 
 @router.get("/{ticker}/balance-sheet", response_model=BalanceSheetResponse)
-async def get_balance_sheet(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_balance_sheet(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene balance general histórico"""
-    result = FundamentalsService.get_balance_sheet(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, FundamentalsService.get_balance_sheet, ticker)
+    return cached_json_response(request, result, BalanceSheetResponse)
 
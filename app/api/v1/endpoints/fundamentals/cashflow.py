@@ -1,16 +1,18 @@
 """
 Endpoint para flujo de efectivo
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.fundamentals_service import FundamentalsService
 from app.models.fundamentals import CashflowResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["fundamentals"])
 
 
 @router.get("/{ticker}/cashflow", response_model=CashflowResponse)
-async def get_cashflow(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_cashflow(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene flujo de efectivo histórico"""
-    result = FundamentalsService.get_cashflow(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, FundamentalsService.get_cashflow, ticker)
+    return cached_json_response(request, result, CashflowResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para ganancias
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.fundamentals_service import FundamentalsService
 from app.models.fundamentals import EarningsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["fundamentals"])
 
 
 @router.get("/{ticker}/earnings", response_model=EarningsResponse)
-async def get_earnings(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_earnings(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene datos históricos de ganancias"""
-    result = FundamentalsService.get_earnings(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, FundamentalsService.get_earnings, ticker)
+    return cached_json_response(request, result, EarningsResponse)
 
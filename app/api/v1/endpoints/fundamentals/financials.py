@@ -1,16 +1,18 @@
 """
 Endpoint para estados financieros
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.fundamentals_service import FundamentalsService
 from app.models.fundamentals import FinancialsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["fundamentals"])
 
 
 @router.get("/{ticker}/financials", response_model=FinancialsResponse)
-async def get_financials(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_financials(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene estados financieros históricos"""
-    result = FundamentalsService.get_financials(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, FundamentalsService.get_financials, ticker)
+    return cached_json_response(request, result, FinancialsResponse)
 
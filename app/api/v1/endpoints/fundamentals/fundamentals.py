@@ -1,16 +1,23 @@
 """
 Endpoint para análisis fundamental completo
 """
-from fastapi import APIRouter, Path
+from typing import Optional
+from fastapi import APIRouter, Path, Query, Request
 from app.services.fundamentals_service import FundamentalsService
 from app.models.fundamentals import FundamentalsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["fundamentals"])
 
 
 @router.get("/{ticker}/fundamentals", response_model=FundamentalsResponse)
-async def get_fundamentals(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_fundamentals(
+    request: Request,
+    ticker: str = Path(..., description="Ticker de la acción"),
+    deadline: Optional[float] = Query(None, gt=0, le=30, description="Tiempo límite en segundos para obtener los datos")
+):
     """Obtiene análisis fundamental completo de una acción"""
-    result = FundamentalsService.get_fundamentals(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, FundamentalsService.get_fundamentals, ticker, deadline)
+    return cached_json_response(request, result, FundamentalsResponse)
 
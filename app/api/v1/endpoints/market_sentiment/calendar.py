@@ -1,16 +1,18 @@
 """
 Endpoint para calendario de eventos
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.market_sentiment_service import MarketSentimentService
 from app.models.market_sentiment import CalendarResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["market-sentiment"])
 
 
 @router.get("/{ticker}/calendar", response_model=CalendarResponse)
-async def get_calendar(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_calendar(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene calendario de eventos (earnings, dividendos, splits)"""
-    result = MarketSentimentService.get_calendar(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, MarketSentimentService.get_calendar, ticker)
+    return cached_json_response(request, result, CalendarResponse)
 
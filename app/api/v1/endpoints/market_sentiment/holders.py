@@ -1,16 +1,18 @@
 """
 Endpoint para accionistas
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.market_sentiment_service import MarketSentimentService
 from app.models.market_sentiment import HoldersResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["market-sentiment"])
 
 
 @router.get("/{ticker}/holders", response_model=HoldersResponse)
-async def get_holders(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_holders(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene información de accionistas principales e institucionales"""
-    result = MarketSentimentService.get_holders(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, MarketSentimentService.get_holders, ticker)
+    return cached_json_response(request, result, HoldersResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para noticias
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.market_sentiment_service import MarketSentimentService
 from app.models.market_sentiment import NewsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["market-sentiment"])
 
 
 @router.get("/{ticker}/news", response_model=NewsResponse)
-async def get_news(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_news(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene noticias recientes relacionadas con la acción"""
-    result = MarketSentimentService.get_news(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, MarketSentimentService.get_news, ticker)
+    return cached_json_response(request, result, NewsResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para recomendaciones de analistas
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.market_sentiment_service import MarketSentimentService
 from app.models.market_sentiment import RecommendationResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["market-sentiment"])
 
 
 @router.get("/{ticker}/recommendations", response_model=RecommendationResponse)
-async def get_recommendations(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_recommendations(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene recomendaciones de analistas"""
-    result = MarketSentimentService.get_recommendations(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, MarketSentimentService.get_recommendations, ticker)
+    return cached_json_response(request, result, RecommendationResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para métricas clave
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.summary_service import SummaryService
 from app.models.summary import KeyMetricsResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["summary"])
 
 
 @router.get("/{ticker}/key-metrics", response_model=KeyMetricsResponse)
-async def get_key_metrics(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_key_metrics(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene métricas clave organizadas por categoría"""
-    result = SummaryService.get_key_metrics(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, SummaryService.get_key_metrics, ticker)
+    return cached_json_response(request, result, KeyMetricsResponse)
 
@@ -1,16 +1,18 @@
 """
 Endpoint para resumen completo
 """
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
 from app.services.summary_service import SummaryService
 from app.models.summary import SummaryResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["summary"])
 
 
 @router.get("/{ticker}/summary", response_model=SummaryResponse)
-async def get_summary(ticker: str = Path(..., description="Ticker de la acción")):
+async def get_summary(request: Request, ticker: str = Path(..., description="Ticker de la acción")):
     """Obtiene resumen completo de la acción"""
-    result = SummaryService.get_summary(ticker)
-    return result
+    result = await dispatcher.run(YAHOO, SummaryService.get_summary, ticker)
+    return cached_json_response(request, result, SummaryResponse)
 
@@ -1,19 +1,73 @@
 """
 Endpoint para indicadores técnicos
 """
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
+from app.config import settings
 from app.services.technical_service import TechnicalService
-from app.models.technical import TechnicalIndicatorsResponse
+from app.models.technical import (
+    TechnicalIndicatorsResponse, TechnicalIndicatorsBatchResponse, CustomIndicatorsResponse, IndicatorRegistryResponse
+)
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
+from app.utils.ticker_formatter import parse_ticker_list
+from app.utils.priority_scheduler import set_request_priority, PRIORITY_BATCH
+from app.utils.indicator_registry import indicator_registry
 
 router = APIRouter(tags=["technical"])
 
 
 @router.get("/{ticker}/technical-indicators", response_model=TechnicalIndicatorsResponse)
 async def get_technical_indicators(
+    request: Request,
     ticker: str = Path(..., description="Ticker de la acción"),
-    period: str = Query("6mo", description="Período para cálculo: 1mo, 3mo, 6mo, 1y, 2y")
+    period: str = Query("6mo", description="Período para cálculo: 1mo, 3mo, 6mo, 1y, 2y"),
+    series: bool = Query(False, description="Incluir la serie completa de cada indicador en el período")
 ):
     """Obtiene indicadores técnicos (RSI, MACD, Bollinger Bands, etc.)"""
-    result = TechnicalService.get_technical_indicators(ticker, period)
-    return result
+    result = await dispatcher.run(YAHOO, TechnicalService.get_technical_indicators, ticker, period, series)
+    return cached_json_response(request, result, TechnicalIndicatorsResponse)
+
+
+@router.get("/technical-indicators/registry", response_model=IndicatorRegistryResponse)
+async def get_indicator_registry():
+    """Lista los indicadores disponibles con sus parámetros y dependencias"""
+    return {"indicators": indicator_registry.describe(), "status": "success"}
+
+
+@router.get("/{ticker}/technical-indicators/custom", response_model=CustomIndicatorsResponse)
+async def get_custom_indicators(
+    request: Request,
+    ticker: str = Path(..., description="Ticker de la acción"),
+    indicators: str = Query(..., description="Indicadores con parámetros opcionales (ej: rsi(period=21),macd(fast=8,slow=21),sma(window=100))"),
+    period: str = Query("6mo", description="Período para cálculo: 1mo, 3mo, 6mo, 1y, 2y"),
+    series: bool = Query(False, description="Incluir la serie completa de cada indicador en el período")
+):
+    """Obtiene indicadores del registro con parámetros arbitrarios"""
+    result = await dispatcher.run(YAHOO, TechnicalService.get_custom_indicators, ticker, indicators, period, series)
+    return cached_json_response(request, result, CustomIndicatorsResponse)
+
+
+@router.get("/technical-indicators", response_model=TechnicalIndicatorsBatchResponse)
+async def get_technical_indicators_batch(
+    request: Request,
+    tickers: str = Query(..., description="Múltiples tickers separados por comas (ej: ECOPETROL,ISA,FALABELLA.CL)"),
+    period: str = Query("6mo", description="Período para cálculo: 1mo, 3mo, 6mo, 1y, 2y")
+):
+    """Obtiene los indicadores técnicos de varios tickers en un solo cálculo (tabla tickers × indicadores)"""
+    ticker_list = parse_ticker_list(tickers=tickers)
+    if not ticker_list:
+        return {"tickers": [], "error": "No se proporcionaron tickers válidos", "status": "error"}
+    if len(ticker_list) > settings.INDICATORS_BATCH_MAX_TICKERS:
+        return {
+            "tickers": [],
+            "error": f"Máximo {settings.INDICATORS_BATCH_MAX_TICKERS} tickers por consulta",
+            "status": "error"
+        }
+    
+    # Consulta masiva: cede los turnos de Yahoo a las consultas interactivas
+    if len(ticker_list) > 1:
+        set_request_priority(PRIORITY_BATCH)
+    
+    result = await dispatcher.run(YAHOO, TechnicalService.get_technical_indicators_batch, ticker_list, period)
+    return cached_json_response(request, result, TechnicalIndicatorsBatchResponse)
 
@@ -1,19 +1,22 @@
 """
 Endpoint para análisis de rendimiento
 """
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
 from app.services.technical_service import TechnicalService
 from app.models.technical import PerformanceResponse
+from app.utils.http_cache import cached_json_response
+from app.utils.dispatch import dispatcher, YAHOO
 
 router = APIRouter(tags=["technical"])
 
 
 @router.get("/{ticker}/performance", response_model=PerformanceResponse)
 async def get_performance(
+    request: Request,
     ticker: str = Path(..., description="Ticker de la acción"),
     period: str = Query("1y", description="Período: 1mo, 3mo, 6mo, 1y, 2y, 5y")
 ):
     """Obtiene análisis de rendimiento histórico"""
-    result = TechnicalService.get_performance(ticker, period)
-    return result
+    result = await dispatcher.run(YAHOO, TechnicalService.get_performance, ticker, period)
+    return cached_json_response(request, result, PerformanceResponse)
 
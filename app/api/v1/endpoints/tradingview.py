@@ -4,6 +4,7 @@ Endpoints para TradingView Scraper
 from fastapi import APIRouter, Path
 from app.services.tradingview_service import TradingViewService
 from app.models.tradingview import OverviewResponse, IncomeStatementResponse, StatisticsResponse
+from app.utils.rate_limiter import rate_limiters, TRADINGVIEW_HOST
 
 router = APIRouter(tags=["tradingview"])
 
@@ -18,7 +19,9 @@ async def get_overview(symbol: str = Path(..., description="Símbolo en formato
     - Datos de precio (open, high, low, close, change, volume)
     - Máximos y mínimos de 52 semanas
     """
-    result = TradingViewService.get_overview(symbol)
+    # Esperar turno sin bloquear el event loop
+    await rate_limiters.get(TRADINGVIEW_HOST).acquire_async()
+    result = await TradingViewService.get_overview(symbol)
     return result
 
 
@@ -35,7 +38,9 @@ async def get_income_statement(symbol: str = Path(..., description="Símbolo en
     - EBITDA
     - BPA básico y diluido
     """
-    result = TradingViewService.get_income_statement(symbol)
+    # Esperar turno sin bloquear el event loop
+    await rate_limiters.get(TRADINGVIEW_HOST).acquire_async()
+    result = await TradingViewService.get_income_statement(symbol)
     return result
 
 
@@ -50,5 +55,7 @@ async def get_statistics(symbol: str = Path(..., description="Símbolo en format
     - Métricas de rentabilidad (ROE, ROA, ROI)
     - Información de dividendos
     """
-    result = TradingViewService.get_statistics(symbol)
+    # Esperar turno sin bloquear el event loop
+    await rate_limiters.get(TRADINGVIEW_HOST).acquire_async()
+    result = await TradingViewService.get_statistics(symbol)
     return result
@@ -2,7 +2,7 @@
 Configuración centralizada de la aplicación
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Optional, Dict, List
 
 
 class Settings(BaseSettings):
@@ -23,6 +23,109 @@ class Settings(BaseSettings):
     DEFAULT_COUNTRY_SUFFIX: str = ".CL"
     MAX_TICKER_LENGTH_WITHOUT_SUFFIX: int = 5
     
+    # Configuración del caché en memoria
+    # Ventana stale-while-revalidate: segundos tras el TTL en los que se sirve el valor obsoleto
+    CACHE_STALE_TTL: int = 3600
+    CACHE_MAX_ENTRIES: int = 5000
+    CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256 MB aproximados
+    # Bytes máximos por prefijo de clave, para que un tipo de dato no desplace a los demás
+    CACHE_PREFIX_QUOTAS: Dict[str, int] = {
+        "bars": 128 * 1024 * 1024,
+        "history": 64 * 1024 * 1024,
+        "financials": 32 * 1024 * 1024,
+        "balance_sheet": 32 * 1024 * 1024,
+        "cashflow": 32 * 1024 * 1024,
+    }
+    # Segundo nivel persistente en disco (SQLite); None lo desactiva. En Vercel usar /tmp
+    CACHE_DISK_PATH: Optional[str] = None
+    CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024  # 512 MB
+    # Caché negativo: TTL en segundos por tipo de error de la fuente ({} lo desactiva)
+    CACHE_NEGATIVE_TTLS: Dict[str, int] = {
+        "not_found": 1800,    # Ticker inexistente o deslistado: no cambia pronto
+        "rate_limited": 60,   # 429 / circuit breaker: esperar antes de reintentar
+        "transient": 15,      # Timeouts y errores de red
+    }
+    # Segundos entre barridos de entradas vencidas en segundo plano (0 lo desactiva)
+    CACHE_SWEEP_INTERVAL: int = 30
+    
+    # Ventana mínima de barras diarias a descargar por ticker; todos los análisis recortan de ella
+    BARS_MIN_PERIOD: str = "1y"
+    # Máximo de series (ticker y período) con estado incremental de indicadores en memoria
+    INDICATOR_STATE_MAX_ENTRIES: int = 512
+    # Máximo de tickers por consulta de indicadores en lote
+    INDICATORS_BATCH_MAX_TICKERS: int = 500
+    
+    # Rate limiting por host de las fuentes externas: ráfaga máxima (max_requests) y
+    # ventana en segundos. La tasa de Yahoo la ajusta además el pacer adaptativo.
+    RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "finance.yahoo.com": {"max_requests": 2, "time_window": 4.0},
+        "www.alphavantage.co": {"max_requests": 5, "time_window": 60.0},   # Plan gratuito: 5/min
+        "scanner.tradingview.com": {"max_requests": 5, "time_window": 5.0},
+    }
+    
+    # Hilos por fuente para ejecutar los servicios síncronos fuera del event loop:
+    # máximo de llamadas concurrentes a cada fuente por worker de uvicorn
+    DISPATCH_WORKERS: Dict[str, int] = {
+        "yahoo": 8,
+    }
+    
+    # Fundamentals: carrera entre fuentes con tiempo límite. Se consulta la fuente
+    # primaria y, si no respondió en el percentil FUNDAMENTALS_HEDGE_PERCENTILE de
+    # sus latencias recientes (acotado a [MIN, MAX] segundos), se lanza también la
+    # secundaria; gana la primera respuesta válida y la otra se cancela.
+    FUNDAMENTALS_PRIMARY_SOURCE: str = "alpha_vantage"  # alpha_vantage o yahoo
+    FUNDAMENTALS_DEADLINE: float = 8.0
+    FUNDAMENTALS_HEDGE_PERCENTILE: float = 0.9
+    FUNDAMENTALS_HEDGE_MIN_DELAY: float = 0.5
+    FUNDAMENTALS_HEDGE_MAX_DELAY: float = 3.0
+    # Hilos para las consultas en carrera (cada carrera usa hasta dos)
+    HEDGE_WORKERS: int = 16
+    
+    # Sesiones HTTP síncronas (yfinance, Alpha Vantage): conexiones keep-alive por
+    # host y reintentos comunes (errores de conexión y 502/503/504)
+    HTTP_POOL_SIZES: Dict[str, int] = {
+        "finance.yahoo.com": 16,
+        "www.alphavantage.co": 4,
+    }
+    HTTP_RETRY_TOTAL: int = 2
+    HTTP_RETRY_BACKOFF: float = 0.5
+    
+    # Clientes HTTP async (Alpha Vantage, TradingView): uno por host, con pool de conexiones
+    ASYNC_HTTP_MAX_CONNECTIONS: int = 100
+    ASYNC_HTTP_MAX_KEEPALIVE: int = 20
+    ASYNC_HTTP_TIMEOUT: float = 10.0
+    
+    # Circuit breakers por host: se abren si en la ventana (segundos) hubo al menos
+    # min_requests peticiones y la proporción de fallos llega a failure_rate. Tras
+    # recovery_timeout dejan pasar una sola petición de prueba (semiabierto).
+    CIRCUIT_BREAKERS: Dict[str, Dict[str, float]] = {
+        "finance.yahoo.com": {"window": 120.0, "min_requests": 4, "failure_rate": 0.5, "recovery_timeout": 60.0},
+        "www.alphavantage.co": {"window": 300.0, "min_requests": 3, "failure_rate": 0.5, "recovery_timeout": 120.0},
+        "scanner.tradingview.com": {"window": 60.0, "min_requests": 5, "failure_rate": 0.5, "recovery_timeout": 30.0},
+    }
+    
+    # Pacer adaptativo de Yahoo Finance (AIMD, peticiones por segundo)
+    YAHOO_PACER_INITIAL_RATE: float = 0.5
+    YAHOO_PACER_MIN_RATE: float = 1.0 / 15.0   # Piso tras 429 sucesivos (1 petición cada 15 s)
+    YAHOO_PACER_MAX_RATE: float = 2.0
+    # Prioridad ante el rate limiter de Yahoo: una petición que consume más de estos
+    # turnos pasa de interactiva a batch; peso por cliente (X-Client-Id o IP, por defecto 1)
+    YAHOO_INTERACTIVE_BUDGET: int = 3
+    YAHOO_CLIENT_WEIGHTS: Dict[str, float] = {}
+    
+    # Precalentamiento del caché: tickers (formato Yahoo, ej: ECOPETROL.CL, AAPL) cuyos
+    # summary, fundamentals, historial e indicadores se mantienen calientes. Vacío lo desactiva.
+    # Solo usa tokens libres del pacer de Yahoo; con tasas bajas conviene no pasar de ~10 tickers.
+    WARMUP_WATCHLIST: List[str] = []
+    WARMUP_INTERVAL: int = 120        # Segundos entre ciclos
+    WARMUP_REFRESH_AHEAD: int = 150   # Recargar entradas que expiran en menos de estos segundos
+    
+    # Calendario bursátil para la política de TTL de datos de mercado
+    # Segundos tras el cierre antes de considerar definitiva la barra diaria
+    MARKET_CLOSE_SETTLE_SECONDS: int = 1800
+    # Feriados adicionales por exchange (BVC, BCS, BVL, NYSE) en formato YYYY-MM-DD
+    MARKET_EXTRA_HOLIDAYS: Dict[str, List[str]] = {}
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True
@@ -1,10 +1,21 @@
 """
 Punto de entrada principal de la aplicación FastAPI
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.v1.router import api_router
+from app.utils.request_context import start_request_context, end_request_context, get_request_context
+from app.utils.cache import cache
+from app.services.warmup_service import cache_warmer
+from app.utils.adaptive_pacer import yahoo_pacer
+from app.utils.rate_limiter import rate_limiters
+from app.utils.dispatch import dispatcher
+from app.utils.async_http import async_http
+from app.utils.circuit_breaker import circuit_breakers
+from app.utils.hedging import hedged_racer
+from app.utils.http_sessions import http_sessions
+from app.utils.streaming_indicators import indicator_states
 
 # Crear instancia de FastAPI
 app = FastAPI(
@@ -25,10 +36,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_context_middleware(request: Request, call_next):
+    """Crea el contexto por petición y expone la metadata de caché como headers (X-Cache, Age)"""
+    token = start_request_context()
+    try:
+        context = get_request_context()
+        # Cache-Control: no-cache fuerza a reintentar tickers con error cacheado
+        context.bypass_negative_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+        # Cliente para el reparto justo de los turnos de Yahoo
+        context.client_id = request.headers.get("x-client-id") or (request.client.host if request.client else None)
+        response = await call_next(request)
+        for header, value in context.cache_headers().items():
+            response.headers[header] = value
+        return response
+    finally:
+        end_request_context(token)
+
+
 # Incluir routers de la API
 app.include_router(api_router)
 
 
+@app.on_event("startup")
+async def start_cache_sweeper():
+    """Inicia el barrido periódico de entradas vencidas y el precalentamiento del caché"""
+    if settings.CACHE_SWEEP_INTERVAL > 0:
+        cache.start_sweeper(settings.CACHE_SWEEP_INTERVAL)
+    cache_warmer.start()
+
+
+@app.on_event("shutdown")
+async def stop_cache_sweeper():
+    """Detiene el barrido y el precalentamiento del caché y cierra los pools y clientes HTTP"""
+    cache_warmer.stop()
+    cache.stop_sweeper()
+    dispatcher.shutdown()
+    hedged_racer.shutdown()
+    http_sessions.close()
+    await async_http.aclose()
+
+
 @app.get("/", tags=["root"])
 async def root():
     """Endpoint raíz con información de la API"""
@@ -53,7 +101,22 @@ async def health_check():
     """Endpoint de salud para verificar que la API está funcionando"""
     return {
         "status": "healthy",
-        "version": settings.APP_VERSION
+        "version": settings.APP_VERSION,
+        "circuits": circuit_breakers.get_states()
     }
 
 
+@app.get("/cache/stats", tags=["health"])
+async def cache_stats():
+    """Métricas del caché: tamaño, bytes y contadores por prefijo (hits, misses, latencia de carga)"""
+    stats = cache.get_stats()
+    stats['warmup'] = cache_warmer.get_stats()
+    stats['yahoo_pacer'] = yahoo_pacer.get_stats()
+    stats['rate_limits'] = rate_limiters.get_stats()
+    stats['dispatch'] = dispatcher.get_stats()
+    stats['async_http'] = async_http.get_stats()
+    stats['circuit_breakers'] = circuit_breakers.get_stats()
+    stats['hedging'] = hedged_racer.get_stats()
+    stats['http_sessions'] = http_sessions.get_stats()
+    stats['indicator_state'] = indicator_states.get_stats()
+    return stats
@@ -2,7 +2,7 @@
 Modelos para análisis fundamental
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List
 
 
 class FundamentalsResponse(BaseModel):
@@ -52,6 +52,10 @@ class FundamentalsResponse(BaseModel):
     sector: Optional[str] = Field(None, description="Sector")
     industry: Optional[str] = Field(None, description="Industria")
     
+    # Origen de los datos
+    source: Optional[str] = Field(None, description="Fuente que respondió: alpha_vantage o yahoo")
+    timing: Optional[Dict[str, Any]] = Field(None, description="Tiempos de la consulta: total, retardo antes de consultar la segunda fuente y desenlace de cada fuente")
+    
     status: str = Field(..., description="Estado de la consulta")
     error: Optional[str] = Field(None, description="Mensaje de error si status es 'error'")
 
@@ -2,7 +2,7 @@
 Modelos para análisis técnico
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List
 
 
 class HistoryResponse(BaseModel):
@@ -14,6 +14,13 @@ class HistoryResponse(BaseModel):
     error: Optional[str] = Field(None, description="Mensaje de error")
 
 
+class IndicatorSeries(BaseModel):
+    """Series de indicadores en formato columnar, alineadas con las barras"""
+    
+    index: List[str] = Field(..., description="Fecha de cada barra")
+    columns: Dict[str, List[Optional[float]]] = Field(..., description="Valores de cada indicador por barra (null donde no está definido)")
+
+
 class TechnicalIndicatorsResponse(BaseModel):
     """Modelo de respuesta para indicadores técnicos"""
     
@@ -34,6 +41,50 @@ class TechnicalIndicatorsResponse(BaseModel):
     stochastic_k: Optional[float] = Field(None, description="Estocástico %K")
     stochastic_d: Optional[float] = Field(None, description="Estocástico %D")
     current_price: Optional[float] = Field(None, description="Precio actual")
+    series: Optional[IndicatorSeries] = Field(None, description="Series completas del período (solo con series=true)")
+    status: str = Field(..., description="Estado de la consulta")
+    error: Optional[str] = Field(None, description="Mensaje de error")
+
+
+class CustomIndicatorsResponse(BaseModel):
+    """Modelo de respuesta para indicadores del registro con parámetros arbitrarios"""
+    
+    ticker: str = Field(..., description="Ticker de la acción")
+    period: Optional[str] = Field(None, description="Período de cálculo")
+    last_bar: Optional[str] = Field(None, description="Fecha de la última barra usada")
+    indicators: Dict[str, Optional[float]] = Field(default_factory=dict, description="Último valor por indicador (ej: rsi(period=21))")
+    series: Optional[IndicatorSeries] = Field(None, description="Series completas del período (solo con series=true)")
+    status: str = Field(..., description="Estado de la consulta")
+    error: Optional[str] = Field(None, description="Mensaje de error")
+
+
+class IndicatorRegistryResponse(BaseModel):
+    """Modelo de respuesta para el listado de indicadores disponibles"""
+    
+    indicators: List[Dict[str, Any]] = Field(..., description="Indicadores con sus parámetros (tipo, valor por defecto, rango) y dependencias")
+    status: str = Field(..., description="Estado de la consulta")
+
+
+class TickerDataGaps(BaseModel):
+    """Huecos de datos de un ticker respecto del calendario común del lote"""
+    
+    bars: int = Field(..., description="Barras usadas en el cálculo")
+    first_date: str = Field(..., description="Fecha de la primera barra")
+    last_date: str = Field(..., description="Fecha de la última barra")
+    missing_values: int = Field(..., description="Barras descartadas por tener precios faltantes (NaN)")
+    missing_sessions: int = Field(..., description="Sesiones del calendario común sin barra dentro de su rango")
+    sessions_behind: int = Field(..., description="Sesiones del calendario común posteriores a su última barra")
+
+
+class TechnicalIndicatorsBatchResponse(BaseModel):
+    """Modelo de respuesta para indicadores técnicos de varios tickers"""
+    
+    period: Optional[str] = Field(None, description="Período de cálculo")
+    tickers: List[str] = Field(..., description="Tickers calculados (filas de values)")
+    columns: List[str] = Field(default_factory=list, description="Indicadores (columnas de values)")
+    values: List[List[Optional[float]]] = Field(default_factory=list, description="Último valor de cada indicador por ticker")
+    gaps: Dict[str, TickerDataGaps] = Field(default_factory=dict, description="Huecos de datos por ticker")
+    errors: Dict[str, Optional[str]] = Field(default_factory=dict, description="Tickers sin datos suficientes y su error")
     status: str = Field(..., description="Estado de la consulta")
     error: Optional[str] = Field(None, description="Mensaje de error")
 
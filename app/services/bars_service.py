@@ -0,0 +1,321 @@
+"""
+Servicio de barras OHLCV crudas compartidas por todos los análisis de un ticker
+"""
+import yfinance as yf
+import pandas as pd
+from typing import Dict, List, Optional
+from app.config import settings
+from app.utils.yfinance_client import YFinanceClient
+from app.utils.adaptive_pacer import yahoo_pacer
+from app.utils.cache import cache
+from app.utils.http_sessions import http_sessions
+from app.utils.market_calendar import market_data_ttl
+from app.utils.request_context import get_request_context, ensure_upstream_allowed
+from app.utils.single_flight import SingleFlight
+
+
+# Períodos de yfinance ordenados de menor a mayor ventana
+_PERIOD_ORDER = ["1d", "5d", "1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y", "10y", "max"]
+
+# Ampliaciones de ventana y descargas masivas en curso (una sola descarga por clave)
+_widen_flights = SingleFlight()
+
+# Columnas de stock.history() (con acciones corporativas) para que ambos caminos den las mismas barras
+_HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+
+def _period_rank(period: str) -> Optional[int]:
+    """Posición del período en _PERIOD_ORDER (None si no es un período estándar)"""
+    try:
+        return _PERIOD_ORDER.index(period)
+    except ValueError:
+        return None
+
+
+def _widest_period(period: str, other: str) -> str:
+    """El período de mayor ventana entre dos períodos estándar"""
+    return other if _period_rank(other) > _period_rank(period) else period
+
+
+def _bars_version(bars: pd.DataFrame) -> str:
+    """
+    Versión de las barras derivada de su contenido
+
+    Si un refresco trae exactamente las mismas barras la versión no cambia y los
+    resultados derivados siguen siendo válidos.
+    """
+    if bars.empty:
+        return "empty"
+    digest = int(pd.util.hash_pandas_object(bars, index=True).sum()) & 0xFFFFFFFFFFFF
+    return f"{len(bars)}-{digest:012x}"
+
+
+def slice_period(bars: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Recorta las barras a la ventana de un período de yfinance
+
+    La ventana se ancla en la última barra disponible: los períodos en días
+    toman las últimas N sesiones, los de meses y años una ventana calendario
+    y ytd desde el 1 de enero del año de la última barra.
+
+    Args:
+        bars: Barras OHLCV con índice temporal
+        period: Período de yfinance (1d, 5d, 1mo, ..., max)
+
+    Returns:
+        DataFrame con las barras dentro de la ventana
+    """
+    if bars.empty or period == "max":
+        return bars
+
+    last = bars.index[-1]
+    if period == "ytd":
+        return bars[bars.index.year == last.year]
+    if period.endswith("d"):
+        days = int(period[:-1])
+        sessions = pd.Index(bars.index.normalize()).unique()
+        start = sessions[-days] if len(sessions) >= days else sessions[0]
+        return bars[bars.index >= start]
+    if period.endswith("mo"):
+        return bars[bars.index > last - pd.DateOffset(months=int(period[:-2]))]
+    if period.endswith("y"):
+        return bars[bars.index > last - pd.DateOffset(years=int(period[:-1]))]
+    return bars
+
+
+def session_dates(index: pd.Index) -> pd.DatetimeIndex:
+    """
+    Fecha de sesión (sin zona horaria) de cada barra
+
+    Cada exchange fecha sus barras diarias en su zona horaria, así que las barras
+    de distintos tickers se comparan por fecha de sesión y no por timestamp.
+    """
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return pd.DatetimeIndex(index).normalize()
+
+
+def align_closes(bars_by_ticker: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Alinea los cierres de varios tickers en un índice de fechas común
+
+    Cada exchange fecha sus barras diarias en su zona horaria, así que se
+    alinea por fecha de sesión (sin zona horaria) y no por timestamp.
+
+    Args:
+        bars_by_ticker: Barras OHLCV por ticker
+
+    Returns:
+        DataFrame con una columna de cierres por ticker (NaN donde un ticker no cotizó)
+    """
+    closes = {}
+    for ticker, bars in bars_by_ticker.items():
+        if bars.empty:
+            continue
+        close = bars["Close"]
+        close = pd.Series(close.to_numpy(), index=session_dates(close.index))
+        closes[ticker] = close[~close.index.duplicated(keep="last")]
+    return pd.DataFrame(closes).sort_index()
+
+
+class BarsService:
+    """
+    Capa de barras crudas: una descarga por ticker e intervalo para todos los análisis
+
+    Las barras se guardan en el caché como bars:{ticker}:{interval} con la
+    ventana más amplia descargada hasta el momento (al menos BARS_MIN_PERIOD).
+    Historial, indicadores, volatilidad, rendimiento y correlación recortan su
+    período de esas barras y cachean su resultado con la versión de las barras
+    en la clave, de modo que se invalidan solos cuando las barras cambian.
+    """
+
+    @staticmethod
+    def _fetch(ticker_formatted: str, period: str, interval: str) -> Dict:
+        """Descarga las barras desde Yahoo Finance"""
+        try:
+            stock = YFinanceClient.get_ticker(ticker_formatted)
+            bars = stock.history(period=period, interval=interval)
+            return {
+                "ticker": ticker_formatted,
+                "interval": interval,
+                "period": period,
+                "bars": bars,
+                "version": _bars_version(bars),
+                "status": "success"
+            }
+        except Exception as e:
+            return {"ticker": ticker_formatted, "error": str(e), "status": "error"}
+
+    @staticmethod
+    def get_bars(ticker_formatted: str, period: str = "1y", interval: str = "1d") -> Dict:
+        """
+        Obtiene las barras crudas que cubren al menos el período pedido
+
+        Args:
+            ticker_formatted: Ticker formateado para Yahoo Finance
+            period: Período mínimo que deben cubrir las barras
+            interval: Intervalo de las barras
+
+        Returns:
+            Diccionario con "bars" (DataFrame sin recortar), "version" y "period"
+            descargado, o una respuesta de error ({"status": "error"})
+        """
+        rank = _period_rank(period)
+        ttl = market_data_ttl(ticker_formatted, interval, default=900)
+
+        # Períodos no estándar: clave propia, sin compartir ventana
+        if rank is None:
+            cache_key = f"bars:{ticker_formatted}:{interval}:{period}"
+            return cache.get_or_load(cache_key, lambda: BarsService._fetch(ticker_formatted, period, interval), ttl=ttl)
+
+        cache_key = f"bars:{ticker_formatted}:{interval}"
+        fetch_period = period
+        min_rank = _period_rank(settings.BARS_MIN_PERIOD)
+        if interval == "1d" and min_rank is not None and min_rank > rank:
+            fetch_period = settings.BARS_MIN_PERIOD
+
+        # El loader también lo reejecutan el refresco en segundo plano y el precalentamiento:
+        # descarga la ventana más amplia entre la pedida y la de la entrada que reemplaza
+        def _load():
+            current = cache.peek(cache_key)
+            period_to_fetch = fetch_period
+            if current is not None and current.get("status") == "success":
+                period_to_fetch = _widest_period(period_to_fetch, current["period"])
+            return BarsService._fetch(ticker_formatted, period_to_fetch, interval)
+
+        result = cache.get_or_load(cache_key, _load, ttl=ttl)
+        if result.get("status") != "success" or _period_rank(result["period"]) >= rank:
+            return result
+
+        # Las barras en caché no cubren el período: ampliar la ventana y reemplazarlas
+        ensure_upstream_allowed()
+        def _widen():
+            current = cache.get(cache_key)
+            if current is not None and _period_rank(current["period"]) >= rank:
+                return current
+            widened = BarsService._fetch(ticker_formatted, period, interval)
+            if widened.get("status") == "success":
+                cache.set(cache_key, widened, ttl=ttl)
+            return widened
+
+        return _widen_flights.do(f"{cache_key}:{period}", _widen)
+
+    @staticmethod
+    def _download(tickers: List[str], period: str, interval: str) -> Dict[str, Dict]:
+        """
+        Descarga las barras de varios tickers en una sola petición (yf.download)
+
+        Returns:
+            Respuesta por ticker con el mismo formato que _fetch (error "no encontrado"
+            para los tickers que la descarga no trae)
+        """
+        try:
+            data = yahoo_pacer.call(lambda: yf.download(
+                tickers,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                actions=True,
+                ignore_tz=False,
+                threads=False,
+                session=http_sessions.get_yahoo(),
+                progress=False
+            ))
+        except Exception as e:
+            return {t: {"ticker": t, "error": str(e), "status": "error"} for t in tickers}
+
+        results = {}
+        downloaded = set(data.columns.get_level_values(0)) if data is not None and not data.empty else set()
+        for ticker in tickers:
+            bars = data[ticker].dropna(how="all") if ticker in downloaded else None
+            if bars is None or bars.empty:
+                # yf.download omite (o deja vacíos) los tickers inexistentes o deslistados
+                results[ticker] = {
+                    "ticker": ticker,
+                    "error": f"{ticker}: no price data found (posiblemente deslistado)",
+                    "status": "error"
+                }
+                continue
+            bars = bars[[c for c in _HISTORY_COLUMNS if c in bars.columns]]
+            bars.columns.name = None
+            bars.index.name = "Date" if interval in ("1d", "5d", "1wk", "1mo", "3mo") else "Datetime"
+            results[ticker] = {
+                "ticker": ticker,
+                "interval": interval,
+                "period": period,
+                "bars": bars,
+                "version": _bars_version(bars),
+                "status": "success"
+            }
+        return results
+
+    @staticmethod
+    def get_bars_many(tickers: List[str], period: str = "1y", interval: str = "1d") -> Dict[str, Dict]:
+        """
+        Obtiene las barras de varios tickers con una sola descarga para los que falten
+
+        Los tickers cuyas barras en caché ya cubren el período no se descargan.
+        El resto se piden juntos con yf.download (un solo turno del rate limit)
+        y se guardan en el caché como bars:{ticker}:{interval}, de modo que los
+        análisis individuales de esos tickers también los reutilizan.
+
+        Args:
+            tickers: Tickers formateados para Yahoo Finance
+            period: Período mínimo que deben cubrir las barras
+            interval: Intervalo de las barras
+
+        Returns:
+            Diccionario ticker -> respuesta de get_bars
+        """
+        rank = _period_rank(period)
+        unique = list(dict.fromkeys(tickers))
+        if rank is None or len(unique) < 2:
+            return {t: BarsService.get_bars(t, period, interval) for t in unique}
+
+        results: Dict[str, Dict] = {}
+        missing = []
+        for ticker in unique:
+            cached = cache.get(f"bars:{ticker}:{interval}")
+            if cached is not None and _period_rank(cached["period"]) >= rank:
+                results[ticker] = cached
+            else:
+                missing.append(ticker)
+
+        if len(missing) == 1:
+            results[missing[0]] = BarsService.get_bars(missing[0], period, interval)
+        elif missing:
+            ensure_upstream_allowed()
+            fetch_period = period
+            min_rank = _period_rank(settings.BARS_MIN_PERIOD)
+            if interval == "1d" and min_rank is not None and min_rank > rank:
+                fetch_period = settings.BARS_MIN_PERIOD
+            # No achicar las entradas obsoletas que se van a reemplazar
+            for ticker in missing:
+                stale = cache.peek(f"bars:{ticker}:{interval}")
+                if stale is not None and stale.get("status") == "success":
+                    fetch_period = _widest_period(fetch_period, stale["period"])
+
+            context = get_request_context()
+            if context is not None:
+                context.record_cache("MISS")
+
+            def _load():
+                downloaded = BarsService._download(missing, fetch_period, interval)
+                for ticker, result in downloaded.items():
+                    if result.get("status") == "success":
+                        cache.set(
+                            f"bars:{ticker}:{interval}",
+                            result,
+                            ttl=market_data_ttl(ticker, interval, default=900)
+                        )
+                    elif cache.peek(f"bars:{ticker}:{interval}") is None:
+                        # Igual que get_bars: el error queda en caché negativo según su tipo,
+                        # salvo que haya barras obsoletas que se sigan pudiendo servir
+                        cache.set_negative(f"bars:{ticker}:{interval}", result)
+                return downloaded
+
+            flight_key = f"bulk:{interval}:{fetch_period}:{','.join(sorted(missing))}"
+            results.update(_widen_flights.do(flight_key, _load))
+
+        return {t: results[t] for t in unique}
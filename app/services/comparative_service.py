@@ -1,13 +1,14 @@
 """
 Servicio para análisis comparativo y correlación
 """
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from typing import Dict, List
 from app.utils.ticker_formatter import format_ticker, parse_ticker_list
 from app.services.fundamentals_service import FundamentalsService
-from app.utils.yfinance_client import YFinanceClient
+from app.services.bars_service import BarsService, slice_period, align_closes
+from app.utils.cache import cache
+from app.utils.market_calendar import market_data_ttl
 
 
 class ComparativeService:
@@ -52,42 +53,55 @@ class ComparativeService:
             ticker_formatted = format_ticker(ticker)
             compare_formatted = [format_ticker(t) for t in compare_tickers]
             
-            # Obtener datos históricos del ticker principal
-            stock_main = YFinanceClient.get_ticker(ticker_formatted)
-            hist_main = stock_main.history(period=period)
+            # Barras de todos los tickers: una sola descarga masiva para los que no estén en caché
+            all_bars = BarsService.get_bars_many([ticker_formatted] + compare_formatted, period)
+            bars_main = all_bars[ticker_formatted]
+            if bars_main.get("status") != "success":
+                return {"ticker": ticker, "error": bars_main.get("error"), "status": "error"}
             
-            if hist_main.empty:
-                return {"ticker": ticker_formatted, "error": "Datos insuficientes para ticker principal", "status": "error"}
+            # La clave incluye la versión de las barras de todos los tickers
+            versions = ",".join(
+                f"{t}@{all_bars[t].get('version', 'error')}" for t in sorted(set(compare_formatted))
+            )
+            cache_key = f"correlation:{ticker_formatted}@{bars_main['version']}:{period}:{versions}"
             
-            returns_main = hist_main['Close'].pct_change().dropna()
-            correlations = {}
-            
-            # Calcular correlación con cada ticker de comparación
-            for compare_ticker in compare_formatted:
-                try:
-                    stock_compare = YFinanceClient.get_ticker(compare_ticker)
-                    hist_compare = stock_compare.history(period=period)
-                    
-                    if not hist_compare.empty:
-                        returns_compare = hist_compare['Close'].pct_change().dropna()
+            def _load():
+                hist_main = slice_period(bars_main["bars"], period)
+                
+                if hist_main.empty:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes para ticker principal", "status": "error"}
+                
+                # Cierres alineados por fecha de sesión (los exchanges fechan en distintas zonas horarias)
+                closes = align_closes({
+                    t: slice_period(b["bars"], period)
+                    for t, b in all_bars.items()
+                    if b.get("status") == "success"
+                })
+                correlations = {}
+                
+                # Calcular correlación con cada ticker de comparación
+                for compare_ticker in compare_formatted:
+                    try:
+                        if compare_ticker not in closes.columns or compare_ticker == ticker_formatted:
+                            correlations[compare_ticker] = None if compare_ticker not in closes.columns else 1.0
+                            continue
                         
-                        # Alinear índices
-                        common_index = returns_main.index.intersection(returns_compare.index)
-                        if len(common_index) > 1:
-                            corr = returns_main.loc[common_index].corr(returns_compare.loc[common_index])
+                        # Retornos sobre las fechas en que cotizaron ambos
+                        returns = closes[[ticker_formatted, compare_ticker]].dropna().pct_change().dropna()
+                        if len(returns) > 1:
+                            corr = returns[ticker_formatted].corr(returns[compare_ticker])
                             correlations[compare_ticker] = float(corr) if not np.isnan(corr) else None
                         else:
                             correlations[compare_ticker] = None
-                    else:
+                    except:
                         correlations[compare_ticker] = None
-                except:
-                    correlations[compare_ticker] = None
+                
+                return {
+                    "ticker": ticker_formatted,
+                    "correlations": correlations,
+                    "status": "success"
+                }
             
-            return {
-                "ticker": ticker_formatted,
-                "correlations": correlations,
-                "status": "success"
-            }
+            return cache.get_or_load(cache_key, _load, ttl=market_data_ttl(ticker_formatted, default=600))
         except Exception as e:
             return {"ticker": ticker, "error": str(e), "status": "error"}
-
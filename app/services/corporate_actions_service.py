@@ -17,71 +17,66 @@ class CorporateActionsService:
         ticker_formatted = format_ticker(ticker)
         cache_key = f"dividends_history:{ticker_formatted}"
         
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        def _load():
+            try:
+                stock = YFinanceClient.get_ticker(ticker_formatted)
+                dividends = stock.dividends
+                
+                dividends_list = []
+                total_dividends = 0.0
+                
+                if dividends is not None and not dividends.empty:
+                    for date, value in dividends.items():
+                        dividends_list.append({
+                            "date": str(date),
+                            "dividend": float(value)
+                        })
+                        total_dividends += float(value)
+                
+                average_dividend = total_dividends / len(dividends_list) if dividends_list else None
+                
+                result = {
+                    "ticker": ticker_formatted,
+                    "dividends": dividends_list,
+                    "total_dividends": float(total_dividends) if total_dividends > 0 else None,
+                    "average_dividend": float(average_dividend) if average_dividend else None,
+                    "status": "success"
+                }
+                
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
         
-        try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            dividends = stock.dividends
-            
-            dividends_list = []
-            total_dividends = 0.0
-            
-            if dividends is not None and not dividends.empty:
-                for date, value in dividends.items():
-                    dividends_list.append({
-                        "date": str(date),
-                        "dividend": float(value)
-                    })
-                    total_dividends += float(value)
-            
-            average_dividend = total_dividends / len(dividends_list) if dividends_list else None
-            
-            result = {
-                "ticker": ticker_formatted,
-                "dividends": dividends_list,
-                "total_dividends": float(total_dividends) if total_dividends > 0 else None,
-                "average_dividend": float(average_dividend) if average_dividend else None,
-                "status": "success"
-            }
-            
-            cache.set(cache_key, result, ttl=900)  # 15 minutos
-            return result
-        except Exception as e:
-            return {"ticker": ticker, "error": str(e), "status": "error"}
-    
+        return cache.get_or_load(cache_key, _load, ttl=900)  # 15 minutos
+
     @staticmethod
     def get_splits(ticker: str) -> Dict:
         """Obtiene historial de splits"""
         ticker_formatted = format_ticker(ticker)
         cache_key = f"splits:{ticker_formatted}"
         
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        def _load():
+            try:
+                stock = YFinanceClient.get_ticker(ticker_formatted)
+                splits = stock.splits
+                
+                splits_list = []
+                
+                if splits is not None and not splits.empty:
+                    for date, value in splits.items():
+                        splits_list.append({
+                            "date": str(date),
+                            "split": str(value)
+                        })
+                
+                result = {
+                    "ticker": ticker_formatted,
+                    "splits": splits_list,
+                    "status": "success"
+                }
+                
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
         
-        try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            splits = stock.splits
-            
-            splits_list = []
-            
-            if splits is not None and not splits.empty:
-                for date, value in splits.items():
-                    splits_list.append({
-                        "date": str(date),
-                        "split": str(value)
-                    })
-            
-            result = {
-                "ticker": ticker_formatted,
-                "splits": splits_list,
-                "status": "success"
-            }
-            
-            cache.set(cache_key, result, ttl=900)  # 15 minutos
-            return result
-        except Exception as e:
-            return {"ticker": ticker, "error": str(e), "status": "error"}
-
+        return cache.get_or_load(cache_key, _load, ttl=900)  # 15 minutos
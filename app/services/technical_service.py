@@ -1,55 +1,69 @@
 """
 Servicio para análisis técnico
 """
-import yfinance as yf
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from app.utils.ticker_formatter import format_ticker
 from app.utils.yfinance_client import YFinanceClient
 from app.utils.cache import cache
+from app.services.bars_service import BarsService, slice_period, session_dates
+from app.utils.market_calendar import market_data_ttl
+from app.utils.indicator_engine import as_float_array, compute_series
+from app.utils.streaming_indicators import indicator_states
+from app.utils.indicator_registry import indicator_registry, IndicatorContext, parse_indicator_specs
 
 
 class TechnicalService:
-    """Servicio para análisis técnico"""
+    """
+    Servicio para análisis técnico
+
+    Todos los análisis se calculan sobre las barras compartidas de BarsService
+    (una descarga por ticker). Sus resultados se cachean con la versión de las
+    barras en la clave, así que se recalculan solo cuando las barras cambian.
+    """
     
     @staticmethod
     def get_history(ticker: str, period: str = "1y", interval: str = "1d") -> Dict:
         """Obtiene datos históricos"""
         ticker_formatted = format_ticker(ticker)
-        cache_key = f"history:{ticker_formatted}:{period}:{interval}"
-        
-        # Intentar obtener del caché
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
         try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            hist = stock.history(period=period, interval=interval)
-            
-            if hist.empty:
-                result = {"ticker": ticker_formatted, "history": [], "status": "success"}
-            else:
-                # Convertir a lista de diccionarios
-                hist_dict = hist.reset_index().to_dict('records')
-                # Convertir Timestamp a string
-                for record in hist_dict:
-                    if 'Date' in record:
-                        record['Date'] = str(record['Date'])
-                
-                result = {
-                    "ticker": ticker_formatted,
-                    "history": hist_dict,
-                    "status": "success"
-                }
-            
-            # Guardar en caché (15 minutos - datos históricos)
-            cache.set(cache_key, result, ttl=900)
-            return result
+            bars = BarsService.get_bars(ticker_formatted, period, interval)
         except Exception as e:
             return {"ticker": ticker, "error": str(e), "status": "error"}
-    
+        if bars.get("status") != "success":
+            return {"ticker": ticker, "error": bars.get("error"), "status": "error"}
+        cache_key = f"history:{ticker_formatted}:{period}:{interval}@{bars['version']}"
+        
+        # Se deriva de las barras compartidas (solo se ejecuta si no hay dato en caché)
+        def _load():
+            try:
+                hist = slice_period(bars["bars"], period)
+                
+                if hist.empty:
+                    result = {"ticker": ticker_formatted, "history": [], "status": "success"}
+                else:
+                    # Convertir a lista de diccionarios
+                    hist_dict = hist.reset_index().to_dict('records')
+                    # Convertir Timestamp a string
+                    for record in hist_dict:
+                        if 'Date' in record:
+                            record['Date'] = str(record['Date'])
+                    
+                    result = {
+                        "ticker": ticker_formatted,
+                        "history": hist_dict,
+                        "status": "success"
+                    }
+                
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        # TTL según la sesión del exchange: intradía corto con mercado abierto, diario hasta el próximo cierre
+        return cache.get_or_load(cache_key, _load, ttl=market_data_ttl(ticker_formatted, interval, default=900))
+
     @staticmethod
     def calculate_rsi(prices: pd.Series, period: int = 14) -> float:
         """Calcula RSI"""
@@ -80,198 +94,573 @@ class TechnicalService:
         return upper.iloc[-1] if not upper.empty else None, sma.iloc[-1] if not sma.empty else None, lower.iloc[-1] if not lower.empty else None
     
     @staticmethod
-    def get_technical_indicators(ticker: str, period: str = "6mo") -> Dict:
-        """Obtiene indicadores técnicos"""
+    def compute_indicators_pandas(hist: pd.DataFrame) -> Dict[str, Optional[float]]:
+        """
+        Calcula el conjunto estándar de indicadores con pandas (rolling/ewm)
+        
+        Es el cálculo de referencia del motor NumPy (app.utils.indicator_engine),
+        que lo reemplaza salvo cuando las barras tienen huecos (NaN).
+        
+        Args:
+            hist: Barras con columnas Close, High y Low
+        
+        Returns:
+            Diccionario con el último valor de cada indicador
+        """
+        close = hist['Close']
+        
+        rsi = TechnicalService.calculate_rsi(close)
+        macd, macd_signal, macd_hist = TechnicalService.calculate_macd(close)
+        bb_upper, bb_middle, bb_lower = TechnicalService.calculate_bollinger_bands(close)
+        
+        # Medias móviles
+        sma_20 = close.rolling(window=20).mean().iloc[-1] if len(close) >= 20 else None
+        sma_50 = close.rolling(window=50).mean().iloc[-1] if len(close) >= 50 else None
+        sma_200 = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
+        ema_12 = close.ewm(span=12).mean().iloc[-1] if len(close) >= 12 else None
+        ema_26 = close.ewm(span=26).mean().iloc[-1] if len(close) >= 26 else None
+        
+        # ADX simplificado
+        high = hist['High']
+        low = hist['Low']
+        plus_dm = high.diff()
+        minus_dm = -low.diff()
+        plus_dm[plus_dm < 0] = 0
+        minus_dm[minus_dm < 0] = 0
+        tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
+        atr = tr.rolling(14).mean()
+        plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
+        minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        adx = dx.rolling(14).mean().iloc[-1] if len(dx) >= 14 else None
+        
+        # Estocástico
+        low_14 = low.rolling(14).min()
+        high_14 = high.rolling(14).max()
+        k_percent = 100 * ((close - low_14) / (high_14 - low_14))
+        d_percent = k_percent.rolling(3).mean()
+        stoch_k = k_percent.iloc[-1] if not k_percent.empty else None
+        stoch_d = d_percent.iloc[-1] if not d_percent.empty else None
+        
+        return {
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_hist,
+            "bollinger_upper": bb_upper,
+            "bollinger_middle": bb_middle,
+            "bollinger_lower": bb_lower,
+            "sma_20": sma_20,
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "ema_12": ema_12,
+            "ema_26": ema_26,
+            "adx": adx,
+            "stochastic_k": stoch_k,
+            "stochastic_d": stoch_d,
+            "current_price": close.iloc[-1] if not close.empty else None,
+        }
+    
+    @staticmethod
+    def compute_series_pandas(hist: pd.DataFrame) -> Dict[str, pd.Series]:
+        """
+        Calcula la serie completa de cada indicador del conjunto estándar con pandas
+        
+        Reemplaza a indicator_engine.compute_series cuando las barras tienen huecos (NaN).
+        
+        Args:
+            hist: Barras con columnas Close, High y Low
+        
+        Returns:
+            Diccionario de series alineadas con las barras
+        """
+        close = hist['Close']
+        high = hist['High']
+        low = hist['Low']
+        
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        
+        ema_12 = close.ewm(span=12).mean()
+        ema_26 = close.ewm(span=26).mean()
+        macd = ema_12 - ema_26
+        signal_line = macd.ewm(span=9).mean()
+        
+        sma_20 = close.rolling(window=20).mean()
+        std_20 = close.rolling(window=20).std()
+        
+        plus_dm = high.diff()
+        minus_dm = -low.diff()
+        plus_dm[plus_dm < 0] = 0
+        minus_dm[minus_dm < 0] = 0
+        tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
+        atr = tr.rolling(14).mean()
+        plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
+        minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        
+        low_14 = low.rolling(14).min()
+        high_14 = high.rolling(14).max()
+        k_percent = 100 * ((close - low_14) / (high_14 - low_14))
+        
+        return {
+            "rsi": 100 - (100 / (1 + gain / loss)),
+            "macd": macd,
+            "macd_signal": signal_line,
+            "macd_histogram": macd - signal_line,
+            "bollinger_upper": sma_20 + std_20 * 2,
+            "bollinger_middle": sma_20,
+            "bollinger_lower": sma_20 - std_20 * 2,
+            "sma_20": sma_20,
+            "sma_50": close.rolling(window=50).mean(),
+            "sma_200": close.rolling(window=200).mean(),
+            "ema_12": ema_12,
+            "ema_26": ema_26,
+            "adx": dx.rolling(14).mean(),
+            "stochastic_k": k_percent,
+            "stochastic_d": k_percent.rolling(3).mean(),
+        }
+    
+    @staticmethod
+    def _indicators_result(ticker: str, values: Dict[str, Optional[float]]) -> Dict:
+        """Respuesta con los valores escalares (NaN pasa a None)"""
+        result = {"ticker": ticker}
+        for name, value in values.items():
+            result[name] = float(value) if value is not None and not np.isnan(value) else None
+        result["status"] = "success"
+        return result
+    
+    @staticmethod
+    def get_technical_indicators(ticker: str, period: str = "6mo", series: bool = False) -> Dict:
+        """
+        Obtiene indicadores técnicos
+        
+        Args:
+            ticker: Ticker de la acción
+            period: Período de cálculo
+            series: Si es True agrega la serie completa de cada indicador en el período
+                (formato columnar: {"index": [fechas], "columns": {indicador: [valores]}})
+        
+        Returns:
+            Diccionario con el último valor de cada indicador (y las series si se pidieron)
+        """
         ticker_formatted = format_ticker(ticker)
-        cache_key = f"technical_indicators:{ticker_formatted}:{period}"
+        try:
+            bars = BarsService.get_bars(ticker_formatted, period)
+        except Exception as e:
+            return {"ticker": ticker, "error": str(e), "status": "error"}
+        if bars.get("status") != "success":
+            return {"ticker": ticker, "error": bars.get("error"), "status": "error"}
+        cache_key = f"technical_indicators:{ticker_formatted}:{period}@{bars['version']}"
+        ttl = market_data_ttl(ticker_formatted, default=600)
         
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        def _load():
+            try:
+                hist = slice_period(bars["bars"], period)
+                
+                if hist.empty or len(hist) < 50:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+                
+                shared = bars["bars"]
+                close = as_float_array(shared['Close'])
+                high = as_float_array(shared['High'])
+                low = as_float_array(shared['Low'])
+                start = len(shared) - len(hist)
+                
+                # Estado incremental sobre las barras compartidas (por ticker e intervalo):
+                # solo se incorporan las barras nuevas desde la llamada anterior y la ventana
+                # del período se toma de ese estado aunque se deslice. Con huecos (NaN) fuera
+                # de la ventana se usa el motor NumPy sobre ella, y dentro, el cálculo con pandas.
+                if np.isfinite(close).all() and np.isfinite(high).all() and np.isfinite(low).all():
+                    values = indicator_states.latest(
+                        f"{ticker_formatted}:{bars['interval']}",
+                        shared.index.asi8,
+                        close, high, low,
+                        start
+                    )
+                elif (
+                    np.isfinite(close[start:]).all()
+                    and np.isfinite(high[start:]).all()
+                    and np.isfinite(low[start:]).all()
+                ):
+                    columns = compute_series(close[start:], high[start:], low[start:])
+                    values = {name: column[-1] for name, column in columns.items()}
+                    values["current_price"] = close[-1]
+                else:
+                    values = TechnicalService.compute_indicators_pandas(hist)
+                
+                return TechnicalService._indicators_result(ticker_formatted, values)
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        if not series:
+            return cache.get_or_load(cache_key, _load, ttl=ttl)
+        
+        # Las series se cachean junto a los escalares, que salen de la misma pasada
+        def _load_series():
+            try:
+                hist = slice_period(bars["bars"], period)
+                
+                if hist.empty or len(hist) < 50:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+                
+                close = as_float_array(hist['Close'])
+                high = as_float_array(hist['High'])
+                low = as_float_array(hist['Low'])
+                
+                if np.isfinite(close).all() and np.isfinite(high).all() and np.isfinite(low).all():
+                    columns = compute_series(close, high, low)
+                else:
+                    columns = {
+                        name: as_float_array(column)
+                        for name, column in TechnicalService.compute_series_pandas(hist).items()
+                    }
+                
+                # El último elemento de cada serie es el valor escalar
+                values = {name: column[-1] for name, column in columns.items()}
+                values["current_price"] = close[-1]
+                result = TechnicalService._indicators_result(ticker_formatted, values)
+                cache.set(cache_key, result, ttl=ttl)
+                
+                result = dict(result)
+                result["series"] = {
+                    "index": [str(ts) for ts in hist.index],
+                    "columns": {
+                        name: np.where(np.isfinite(column), column, None).tolist()
+                        for name, column in columns.items()
+                    },
+                }
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        series_key = f"technical_indicators_series:{ticker_formatted}:{period}@{bars['version']}"
+        return cache.get_or_load(series_key, _load_series, ttl=ttl)
+
+    @staticmethod
+    def get_custom_indicators(ticker: str, indicators: str, period: str = "6mo", series: bool = False) -> Dict:
+        """
+        Obtiene indicadores del registro con parámetros arbitrarios
+        
+        Los arrays calculados (incluidos los intermedios, como las EMA del MACD)
+        se guardan en el caché por ticker, período, última barra, indicador y
+        parámetros, así que otra petición sobre las mismas barras los reutiliza.
+        
+        Args:
+            ticker: Ticker de la acción
+            indicators: Indicadores separados por comas con parámetros opcionales
+                (ej: "rsi(period=21),macd(fast=8,slow=21),bollinger_upper(std=2.5)")
+            period: Período de cálculo
+            series: Si es True agrega la serie completa de cada indicador en el período
+        
+        Returns:
+            Diccionario con el último valor de cada indicador por su nombre canónico
+            (ej: "rsi(period=21)") y las series si se pidieron
+        """
+        ticker_formatted = format_ticker(ticker)
+        try:
+            requested = [indicator_registry.resolve(name, params) for name, params in parse_indicator_specs(indicators)]
+        except ValueError as e:
+            return {"ticker": ticker, "error": str(e), "status": "error"}
+        if not requested:
+            return {"ticker": ticker, "error": "No se indicaron indicadores", "status": "error"}
+        labels = list(dict.fromkeys(indicator.label(params) for indicator, params in requested))
         
         try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            hist = stock.history(period=period)
-            
-            if hist.empty or len(hist) < 50:
-                return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
-            
-            close = hist['Close']
-            
-            # Calcular indicadores
-            rsi = TechnicalService.calculate_rsi(close)
-            macd, macd_signal, macd_hist = TechnicalService.calculate_macd(close)
-            bb_upper, bb_middle, bb_lower = TechnicalService.calculate_bollinger_bands(close)
-            
-            # Medias móviles
-            sma_20 = close.rolling(window=20).mean().iloc[-1] if len(close) >= 20 else None
-            sma_50 = close.rolling(window=50).mean().iloc[-1] if len(close) >= 50 else None
-            sma_200 = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
-            ema_12 = close.ewm(span=12).mean().iloc[-1] if len(close) >= 12 else None
-            ema_26 = close.ewm(span=26).mean().iloc[-1] if len(close) >= 26 else None
-            
-            # ADX simplificado
-            high = hist['High']
-            low = hist['Low']
-            plus_dm = high.diff()
-            minus_dm = -low.diff()
-            plus_dm[plus_dm < 0] = 0
-            minus_dm[minus_dm < 0] = 0
-            tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
-            atr = tr.rolling(14).mean()
-            plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
-            minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            adx = dx.rolling(14).mean().iloc[-1] if len(dx) >= 14 else None
-            
-            # Estocástico
-            low_14 = low.rolling(14).min()
-            high_14 = high.rolling(14).max()
-            k_percent = 100 * ((close - low_14) / (high_14 - low_14))
-            d_percent = k_percent.rolling(3).mean()
-            stoch_k = k_percent.iloc[-1] if not k_percent.empty else None
-            stoch_d = d_percent.iloc[-1] if not d_percent.empty else None
-            
-            return {
-                "ticker": ticker_formatted,
-                "rsi": float(rsi) if rsi is not None and not np.isnan(rsi) else None,
-                "macd": float(macd) if macd is not None and not np.isnan(macd) else None,
-                "macd_signal": float(macd_signal) if macd_signal is not None and not np.isnan(macd_signal) else None,
-                "macd_histogram": float(macd_hist) if macd_hist is not None and not np.isnan(macd_hist) else None,
-                "bollinger_upper": float(bb_upper) if bb_upper is not None and not np.isnan(bb_upper) else None,
-                "bollinger_middle": float(bb_middle) if bb_middle is not None and not np.isnan(bb_middle) else None,
-                "bollinger_lower": float(bb_lower) if bb_lower is not None and not np.isnan(bb_lower) else None,
-                "sma_20": float(sma_20) if sma_20 is not None and not np.isnan(sma_20) else None,
-                "sma_50": float(sma_50) if sma_50 is not None and not np.isnan(sma_50) else None,
-                "sma_200": float(sma_200) if sma_200 is not None and not np.isnan(sma_200) else None,
-                "ema_12": float(ema_12) if ema_12 is not None and not np.isnan(ema_12) else None,
-                "ema_26": float(ema_26) if ema_26 is not None and not np.isnan(ema_26) else None,
-                "adx": float(adx) if adx is not None and not np.isnan(adx) else None,
-                "stochastic_k": float(stoch_k) if stoch_k is not None and not np.isnan(stoch_k) else None,
-                "stochastic_d": float(stoch_d) if stoch_d is not None and not np.isnan(stoch_d) else None,
-                "current_price": float(close.iloc[-1]) if not close.empty else None,
-                "status": "success"
-            }
+            bars = BarsService.get_bars(ticker_formatted, period)
         except Exception as e:
             return {"ticker": ticker, "error": str(e), "status": "error"}
-    
+        if bars.get("status") != "success":
+            return {"ticker": ticker, "error": bars.get("error"), "status": "error"}
+        if bars["bars"].empty:
+            return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+        
+        last_bar = bars["bars"].index[-1]
+        cache_key = f"technical_indicators_custom:{ticker_formatted}:{period}@{bars['version']}:{','.join(labels)}"
+        if series:
+            cache_key += ":series"
+        ttl = market_data_ttl(ticker_formatted, default=600)
+        
+        def _load():
+            try:
+                hist = slice_period(bars["bars"], period)
+                complete = hist[['Close', 'High', 'Low']].dropna()
+                
+                if len(complete) < 50:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+                
+                # Memo por (ticker, período, última barra, indicador, parámetros); la versión
+                # cubre las correcciones de la última barra mientras la sesión está abierta
+                context = IndicatorContext(
+                    indicator_registry,
+                    {
+                        "close": as_float_array(complete['Close']),
+                        "high": as_float_array(complete['High']),
+                        "low": as_float_array(complete['Low']),
+                    },
+                    memo_prefix=f"indicator:{ticker_formatted}:{period}:{last_bar.value}@{bars['version']}",
+                    ttl=ttl
+                )
+                columns = {
+                    indicator.label(params): context.get(indicator.name, **dict(params))
+                    for indicator, params in requested
+                }
+                
+                result = {
+                    "ticker": ticker_formatted,
+                    "period": period,
+                    "last_bar": str(last_bar),
+                    "indicators": {
+                        label: float(column[-1]) if np.isfinite(column[-1]) else None
+                        for label, column in columns.items()
+                    },
+                }
+                if series:
+                    result["series"] = {
+                        "index": [str(ts) for ts in complete.index],
+                        "columns": {
+                            label: np.where(np.isfinite(column), column, None).tolist()
+                            for label, column in columns.items()
+                        },
+                    }
+                result["status"] = "success"
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        return cache.get_or_load(cache_key, _load, ttl=ttl)
+
+    @staticmethod
+    def get_technical_indicators_batch(tickers: List[str], period: str = "6mo") -> Dict:
+        """
+        Obtiene los indicadores técnicos de varios tickers en un solo cálculo
+        
+        Las barras que no estén en caché se descargan juntas (un turno de Yahoo)
+        y se apilan en matrices tickers × barras, alineadas en la última barra
+        de cada ticker y rellenas con NaN al inicio: cada indicador se calcula
+        una sola vez para todas las filas y coincide con el de cada ticker.
+        
+        Los huecos se informan por ticker respecto del calendario común (unión
+        de las sesiones de todos los tickers): barras con NaN descartadas,
+        sesiones faltantes dentro de su rango y sesiones de atraso al final.
+        
+        Args:
+            tickers: Tickers de las acciones
+            period: Período de cálculo
+        
+        Returns:
+            Tabla compacta (tickers × columns en values), huecos por ticker y
+            errores de los tickers sin datos suficientes
+        """
+        try:
+            tickers_formatted = list(dict.fromkeys(format_ticker(t) for t in tickers))
+            all_bars = BarsService.get_bars_many(tickers_formatted, period)
+        except Exception as e:
+            return {"tickers": tickers, "error": str(e), "status": "error"}
+        
+        # La clave depende de la versión de las barras de todos los tickers
+        versions = ",".join(f"{t}@{all_bars[t].get('version', 'error')}" for t in tickers_formatted)
+        digest = hashlib.blake2b(versions.encode("utf-8"), digest_size=12).hexdigest()
+        cache_key = f"technical_indicators_batch:{period}:{digest}"
+        
+        def _load():
+            try:
+                errors = {}
+                windows = {}
+                for ticker in tickers_formatted:
+                    bars = all_bars[ticker]
+                    if bars.get("status") != "success":
+                        errors[ticker] = bars.get("error")
+                        continue
+                    hist = slice_period(bars["bars"], period)
+                    complete = hist[['Close', 'High', 'Low']].dropna() if not hist.empty else hist
+                    if len(complete) < 50:
+                        errors[ticker] = "Datos insuficientes"
+                        continue
+                    windows[ticker] = (len(hist) - len(complete), complete)
+                
+                if not windows:
+                    return {
+                        "tickers": tickers_formatted,
+                        "errors": errors,
+                        "error": "Ningún ticker con datos suficientes",
+                        "status": "error"
+                    }
+                
+                names = list(windows)
+                width = max(len(complete) for _, complete in windows.values())
+                close = np.full((len(names), width), np.nan)
+                high = np.full((len(names), width), np.nan)
+                low = np.full((len(names), width), np.nan)
+                dates = {}
+                for row, ticker in enumerate(names):
+                    complete = windows[ticker][1]
+                    close[row, width - len(complete):] = complete['Close'].to_numpy(dtype=np.float64)
+                    high[row, width - len(complete):] = complete['High'].to_numpy(dtype=np.float64)
+                    low[row, width - len(complete):] = complete['Low'].to_numpy(dtype=np.float64)
+                    dates[ticker] = session_dates(complete.index).unique()
+                
+                series = compute_series(close, high, low)
+                columns = list(series) + ["current_price"]
+                table = np.column_stack([series[name][:, -1] for name in series] + [close[:, -1]])
+                
+                # Huecos respecto del calendario común
+                calendar = dates[names[0]]
+                for ticker in names[1:]:
+                    calendar = calendar.union(dates[ticker])
+                gaps = {}
+                for ticker in names:
+                    own = dates[ticker]
+                    span = calendar[(calendar >= own[0]) & (calendar <= own[-1])]
+                    gaps[ticker] = {
+                        "bars": len(windows[ticker][1]),
+                        "first_date": str(own[0].date()),
+                        "last_date": str(own[-1].date()),
+                        "missing_values": windows[ticker][0],
+                        "missing_sessions": int((~span.isin(own)).sum()),
+                        "sessions_behind": int((calendar > own[-1]).sum()),
+                    }
+                
+                return {
+                    "period": period,
+                    "tickers": names,
+                    "columns": columns,
+                    "values": np.where(np.isfinite(table), table, None).tolist(),
+                    "gaps": gaps,
+                    "errors": errors,
+                    "status": "success"
+                }
+            except Exception as e:
+                return {"tickers": tickers_formatted, "error": str(e), "status": "error"}
+        
+        ttl = min(market_data_ttl(t, default=600) for t in tickers_formatted)
+        return cache.get_or_load(cache_key, _load, ttl=ttl)
+
     @staticmethod
     def get_volatility(ticker: str, period: str = "1y") -> Dict:
         """Obtiene análisis de volatilidad"""
         ticker_formatted = format_ticker(ticker)
-        cache_key = f"volatility:{ticker_formatted}:{period}"
-        
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
         try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            hist = stock.history(period=period)
-            info = stock.info
-            
-            if hist.empty:
-                return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
-            
-            close = hist['Close']
-            returns = close.pct_change().dropna()
-            
-            # Volatilidad anualizada
-            volatility = returns.std() * np.sqrt(252) * 100
-            
-            # Beta
-            beta = info.get("beta", None)
-            
-            # Volatilidad diaria
-            daily_vol = returns.std() * 100
-            
-            # Máximo drawdown
-            cumulative = (1 + returns).cumprod()
-            running_max = cumulative.expanding().max()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = drawdown.min() * 100
-            
-            # Sharpe Ratio (asumiendo risk-free rate de 0)
-            sharpe = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() > 0 else None
-            
-            result = {
-                "ticker": ticker_formatted,
-                "volatility": float(volatility) if not np.isnan(volatility) else None,
-                "beta": float(beta) if beta is not None else None,
-                "daily_volatility": float(daily_vol) if not np.isnan(daily_vol) else None,
-                "max_drawdown": float(max_drawdown) if not np.isnan(max_drawdown) else None,
-                "sharpe_ratio": float(sharpe) if sharpe is not None and not np.isnan(sharpe) else None,
-                "status": "success"
-            }
-            
-            cache.set(cache_key, result, ttl=600)  # 10 minutos
-            return result
+            bars = BarsService.get_bars(ticker_formatted, period)
         except Exception as e:
             return {"ticker": ticker, "error": str(e), "status": "error"}
-    
+        if bars.get("status") != "success":
+            return {"ticker": ticker, "error": bars.get("error"), "status": "error"}
+        cache_key = f"volatility:{ticker_formatted}:{period}@{bars['version']}"
+        
+        def _load():
+            try:
+                hist = slice_period(bars["bars"], period)
+                # Beta solo está en info
+                stock = YFinanceClient.get_ticker(ticker_formatted)
+                info = stock.info
+                
+                if hist.empty:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+                
+                close = hist['Close']
+                returns = close.pct_change().dropna()
+                
+                # Volatilidad anualizada
+                volatility = returns.std() * np.sqrt(252) * 100
+                
+                # Beta
+                beta = info.get("beta", None)
+                
+                # Volatilidad diaria
+                daily_vol = returns.std() * 100
+                
+                # Máximo drawdown
+                cumulative = (1 + returns).cumprod()
+                running_max = cumulative.expanding().max()
+                drawdown = (cumulative - running_max) / running_max
+                max_drawdown = drawdown.min() * 100
+                
+                # Sharpe Ratio (asumiendo risk-free rate de 0)
+                sharpe = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() > 0 else None
+                
+                result = {
+                    "ticker": ticker_formatted,
+                    "volatility": float(volatility) if not np.isnan(volatility) else None,
+                    "beta": float(beta) if beta is not None else None,
+                    "daily_volatility": float(daily_vol) if not np.isnan(daily_vol) else None,
+                    "max_drawdown": float(max_drawdown) if not np.isnan(max_drawdown) else None,
+                    "sharpe_ratio": float(sharpe) if sharpe is not None and not np.isnan(sharpe) else None,
+                    "status": "success"
+                }
+                
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        return cache.get_or_load(cache_key, _load, ttl=market_data_ttl(ticker_formatted, default=600))
+
     @staticmethod
     def get_performance(ticker: str, period: str = "1y") -> Dict:
         """Obtiene análisis de rendimiento"""
         ticker_formatted = format_ticker(ticker)
-        cache_key = f"performance:{ticker_formatted}:{period}"
-        
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
         try:
-            stock = YFinanceClient.get_ticker(ticker_formatted)
-            hist = stock.history(period=period)
-            
-            if hist.empty:
-                return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
-            
-            close = hist['Close']
-            returns = close.pct_change().dropna()
-            
-            # Retornos
-            daily_return = returns.iloc[-1] * 100 if len(returns) > 0 else None
-            
-            # Retorno semanal (últimos 5 días)
-            weekly_return = ((close.iloc[-1] / close.iloc[-5]) - 1) * 100 if len(close) >= 5 else None
-            
-            # Retorno mensual (últimos 20 días)
-            monthly_return = ((close.iloc[-1] / close.iloc[-20]) - 1) * 100 if len(close) >= 20 else None
-            
-            # YTD (año a la fecha)
-            ytd_return = ((close.iloc[-1] / close.iloc[0]) - 1) * 100 if len(close) > 0 else None
-            
-            # Retorno anualizado
-            days = len(hist)
-            annual_return = ((close.iloc[-1] / close.iloc[0]) ** (252 / days) - 1) * 100 if days > 0 else None
-            
-            # Máximo drawdown
-            cumulative = (1 + returns).cumprod()
-            running_max = cumulative.expanding().max()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = drawdown.min() * 100
-            
-            # Sharpe Ratio
-            sharpe = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() > 0 else None
-            
-            # Volatilidad
-            volatility = returns.std() * np.sqrt(252) * 100
-            
-            result = {
-                "ticker": ticker_formatted,
-                "daily_return": float(daily_return) if daily_return is not None and not np.isnan(daily_return) else None,
-                "weekly_return": float(weekly_return) if weekly_return is not None and not np.isnan(weekly_return) else None,
-                "monthly_return": float(monthly_return) if monthly_return is not None and not np.isnan(monthly_return) else None,
-                "ytd_return": float(ytd_return) if ytd_return is not None and not np.isnan(ytd_return) else None,
-                "annual_return": float(annual_return) if annual_return is not None and not np.isnan(annual_return) else None,
-                "max_drawdown": float(max_drawdown) if not np.isnan(max_drawdown) else None,
-                "sharpe_ratio": float(sharpe) if sharpe is not None and not np.isnan(sharpe) else None,
-                "volatility": float(volatility) if not np.isnan(volatility) else None,
-                "status": "success"
-            }
-            
-            cache.set(cache_key, result, ttl=600)  # 10 minutos
-            return result
+            bars = BarsService.get_bars(ticker_formatted, period)
         except Exception as e:
             return {"ticker": ticker, "error": str(e), "status": "error"}
-
+        if bars.get("status") != "success":
+            return {"ticker": ticker, "error": bars.get("error"), "status": "error"}
+        cache_key = f"performance:{ticker_formatted}:{period}@{bars['version']}"
+        
+        def _load():
+            try:
+                hist = slice_period(bars["bars"], period)
+                
+                if hist.empty:
+                    return {"ticker": ticker_formatted, "error": "Datos insuficientes", "status": "error"}
+                
+                close = hist['Close']
+                returns = close.pct_change().dropna()
+                
+                # Retornos
+                daily_return = returns.iloc[-1] * 100 if len(returns) > 0 else None
+                
+                # Retorno semanal (últimos 5 días)
+                weekly_return = ((close.iloc[-1] / close.iloc[-5]) - 1) * 100 if len(close) >= 5 else None
+                
+                # Retorno mensual (últimos 20 días)
+                monthly_return = ((close.iloc[-1] / close.iloc[-20]) - 1) * 100 if len(close) >= 20 else None
+                
+                # YTD (año a la fecha)
+                ytd_return = ((close.iloc[-1] / close.iloc[0]) - 1) * 100 if len(close) > 0 else None
+                
+                # Retorno anualizado
+                days = len(hist)
+                annual_return = ((close.iloc[-1] / close.iloc[0]) ** (252 / days) - 1) * 100 if days > 0 else None
+                
+                # Máximo drawdown
+                cumulative = (1 + returns).cumprod()
+                running_max = cumulative.expanding().max()
+                drawdown = (cumulative - running_max) / running_max
+                max_drawdown = drawdown.min() * 100
+                
+                # Sharpe Ratio
+                sharpe = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() > 0 else None
+                
+                # Volatilidad
+                volatility = returns.std() * np.sqrt(252) * 100
+                
+                result = {
+                    "ticker": ticker_formatted,
+                    "daily_return": float(daily_return) if daily_return is not None and not np.isnan(daily_return) else None,
+                    "weekly_return": float(weekly_return) if weekly_return is not None and not np.isnan(weekly_return) else None,
+                    "monthly_return": float(monthly_return) if monthly_return is not None and not np.isnan(monthly_return) else None,
+                    "ytd_return": float(ytd_return) if ytd_return is not None and not np.isnan(ytd_return) else None,
+                    "annual_return": float(annual_return) if annual_return is not None and not np.isnan(annual_return) else None,
+                    "max_drawdown": float(max_drawdown) if not np.isnan(max_drawdown) else None,
+                    "sharpe_ratio": float(sharpe) if sharpe is not None and not np.isnan(sharpe) else None,
+                    "volatility": float(volatility) if not np.isnan(volatility) else None,
+                    "status": "success"
+                }
+                
+                return result
+            except Exception as e:
+                return {"ticker": ticker, "error": str(e), "status": "error"}
+        
+        return cache.get_or_load(cache_key, _load, ttl=market_data_ttl(ticker_formatted, default=600))
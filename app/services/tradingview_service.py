@@ -1,17 +1,80 @@
 """
-Servicio para obtener datos de TradingView usando tradingview-scraper
+Servicio para obtener datos de TradingView (endpoint /symbol del scanner, vía httpx async)
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import httpx
 from tradingview_scraper.symbols.overview import Overview
 from tradingview_scraper.symbols.fundamental_graphs import FundamentalGraphs
+from tradingview_scraper.symbols.utils import generate_user_agent
 from app.models.tradingview import OverviewResponse, IncomeStatementResponse, StatisticsResponse
+from app.utils.async_http import async_http
+from app.utils.rate_limiter import TRADINGVIEW_HOST
+from app.utils.circuit_breaker import circuit_breakers, CircuitOpenError
 
 
 class TradingViewService:
     """Servicio para obtener datos de TradingView"""
     
+    # Campos de cada consulta (los mismos que piden los scrapers de tradingview-scraper)
+    OVERVIEW_FIELDS: List[str] = Overview.ALL_FIELDS
+    STATISTICS_FIELDS: List[str] = Overview.MARKET_FIELDS + Overview.VALUATION_FIELDS + Overview.DIVIDEND_FIELDS
+    INCOME_STATEMENT_FIELDS: List[str] = FundamentalGraphs.INCOME_STATEMENT_FIELDS
+    
+    @staticmethod
+    async def _fetch_symbol(symbol: str, fields: List[str]) -> Dict[str, Any]:
+        """
+        Consulta los campos de un símbolo en el scanner de TradingView
+        
+        Misma petición que Overview.get_symbol_overview de tradingview-scraper,
+        pero con el cliente httpx compartido: no ocupa un hilo mientras espera
+        y se cancela si se cancela la petición HTTP que la originó.
+        
+        Args:
+            symbol: Símbolo en formato TradingView (ej: "NASDAQ:AAPL")
+            fields: Campos a consultar
+        
+        Returns:
+            {"status": "success", "data": {...}} o {"status": "failed", "error": "..."}
+        """
+        if not symbol or ":" not in symbol:
+            return {
+                "status": "failed",
+                "error": "Symbol must include exchange prefix (e.g., 'NASDAQ:AAPL', 'BITSTAMP:BTCUSD')"
+            }
+        symbol = symbol.strip().upper()
+        
+        breaker = circuit_breakers.get(TRADINGVIEW_HOST)
+        if not breaker.allow_request():
+            return {"status": "failed", "error": str(CircuitOpenError(breaker))}
+        
+        try:
+            client = async_http.get(TRADINGVIEW_HOST)
+            response = await client.get(
+                "/symbol",
+                params={"symbol": symbol, "fields": ",".join(fields)},
+                headers={"User-Agent": generate_user_agent()}
+            )
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            return {"status": "failed", "error": f"Request failed: {e}"}
+        
+        # 429 y 5xx son fallos de la fuente; otros 4xx (símbolo inválido) son respuestas válidas
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        
+        if response.status_code != 200:
+            return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
+        
+        data = response.json()
+        if not data:
+            return {"status": "failed", "error": f"No data found for symbol: {symbol}"}
+        data["symbol"] = symbol
+        return {"status": "success", "data": data}
+    
     @staticmethod
-    def get_overview(symbol: str) -> OverviewResponse:
+    async def get_overview(symbol: str) -> OverviewResponse:
         """
         Obtiene resumen general de la empresa
         
@@ -22,8 +85,7 @@ class TradingViewService:
             OverviewResponse con datos del resumen general
         """
         try:
-            overview_scraper = Overview()
-            result = overview_scraper.get_symbol_overview(symbol=symbol)
+            result = await TradingViewService._fetch_symbol(symbol, TradingViewService.OVERVIEW_FIELDS)
             
             if result.get('status') == 'success':
                 data = result.get('data', {})
@@ -55,7 +117,7 @@ class TradingViewService:
             return OverviewResponse(status="error", error=str(e))
     
     @staticmethod
-    def get_income_statement(symbol: str) -> IncomeStatementResponse:
+    async def get_income_statement(symbol: str) -> IncomeStatementResponse:
         """
         Obtiene estado de resultados (información financiera)
         
@@ -66,8 +128,7 @@ class TradingViewService:
             IncomeStatementResponse con datos del estado de resultados
         """
         try:
-            fundamentals_scraper = FundamentalGraphs()
-            result = fundamentals_scraper.get_income_statement(symbol=symbol)
+            result = await TradingViewService._fetch_symbol(symbol, TradingViewService.INCOME_STATEMENT_FIELDS)
             
             if result.get('status') == 'success':
                 data = result.get('data', {})
@@ -95,7 +156,7 @@ class TradingViewService:
             return IncomeStatementResponse(status="error", error=str(e))
     
     @staticmethod
-    def get_statistics(symbol: str) -> StatisticsResponse:
+    async def get_statistics(symbol: str) -> StatisticsResponse:
         """
         Obtiene estadísticas de mercado y valoración
         
@@ -106,8 +167,7 @@ class TradingViewService:
             StatisticsResponse con estadísticas
         """
         try:
-            overview_scraper = Overview()
-            result = overview_scraper.get_statistics(symbol=symbol)
+            result = await TradingViewService._fetch_symbol(symbol, TradingViewService.STATISTICS_FIELDS)
             
             if result.get('status') == 'success':
                 data = result.get('data', {})
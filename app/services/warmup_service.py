@@ -0,0 +1,151 @@
+"""
+Precalentamiento periódico del caché para una lista de tickers configurada
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services.summary_service import SummaryService
+from app.services.fundamentals_service import FundamentalsService
+from app.services.technical_service import TechnicalService
+from app.utils.adaptive_pacer import yahoo_pacer
+from app.utils.request_context import (
+    start_request_context,
+    end_request_context,
+    get_request_context,
+    active_requests,
+)
+from app.utils.ticker_formatter import format_ticker
+
+
+# Datos que se mantienen calientes por ticker (con los parámetros por defecto de los endpoints)
+_WARMUP_TASKS: List[Tuple[str, Callable[[str], Dict]]] = [
+    ("summary", SummaryService.get_summary),
+    ("fundamentals", FundamentalsService.get_fundamentals),
+    ("history", TechnicalService.get_history),
+    ("technical_indicators", TechnicalService.get_technical_indicators),
+]
+
+
+class CacheWarmer:
+    """
+    Mantiene caliente el caché de una lista de tickers en un hilo de fondo
+
+    En cada ciclo recorre la lista y llama a los servicios como lo haría una
+    petición, con refresh_ahead en el contexto: las entradas frescas se saltan
+    sin costo y las que expiran pronto (o faltan) se recargan. Antes de cada
+    tarea espera a que no haya peticiones en vivo en curso y a que el pacer
+    de Yahoo tenga tokens libres, para no competir con el tráfico interactivo.
+    """
+
+    def __init__(
+        self,
+        watchlist: List[str],
+        interval: float = 300.0,
+        refresh_ahead: float = 120.0,
+        min_free_slots: int = 1
+    ):
+        """
+        Args:
+            watchlist: Tickers a mantener calientes
+            interval: Segundos entre ciclos
+            refresh_ahead: Segundos antes de expirar en los que se recarga una entrada
+            min_free_slots: Tokens libres del pacer necesarios para lanzar una tarea
+        """
+        self.watchlist = [format_ticker(t) for t in watchlist]
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.min_free_slots = min_free_slots
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cycles = 0
+        self._tasks_run = 0
+        self._refreshed = 0
+        self._errors = 0
+        self._last_cycle_seconds: Optional[float] = None
+
+    def _wait_for_budget(self) -> bool:
+        """
+        Espera a que no haya tráfico en vivo y queden tokens en el pacer de Yahoo
+
+        Returns:
+            False si se pidió detener el precalentamiento mientras esperaba
+        """
+        while not self._stop.is_set():
+            if active_requests() == 0 and yahoo_pacer.available_tokens() >= self.min_free_slots:
+                return True
+            self._stop.wait(1.0)
+        return False
+
+    def _run_task(self, ticker: str, name: str, task: Callable[[str], Dict]) -> None:
+        """Ejecuta una tarea de precalentamiento en un contexto de segundo plano"""
+        token = start_request_context(background=True)
+        try:
+            context = get_request_context()
+            context.refresh_ahead = self.refresh_ahead
+            result = task(ticker)
+            self._tasks_run += 1
+            if context.cache_status == "MISS":
+                self._refreshed += 1
+            if isinstance(result, dict) and result.get("status") == "error":
+                self._errors += 1
+        except Exception as e:
+            self._errors += 1
+            print(f"Precalentamiento falló para {name}:{ticker}: {e}")
+        finally:
+            end_request_context(token)
+
+    def run_cycle(self) -> None:
+        """Recorre una vez la lista de tickers"""
+        start = time.time()
+        for ticker in self.watchlist:
+            for name, task in _WARMUP_TASKS:
+                if not self._wait_for_budget():
+                    return
+                self._run_task(ticker, name, task)
+        self._cycles += 1
+        self._last_cycle_seconds = time.time() - start
+
+    def start(self) -> None:
+        """Inicia el precalentamiento en un hilo daemon (no hace nada si la lista está vacía)"""
+        if not self.watchlist or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    print(f"Error en el ciclo de precalentamiento: {e}")
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=_run, name="cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el precalentamiento"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene estadísticas del precalentamiento"""
+        return {
+            'watchlist': list(self.watchlist),
+            'running': self._thread is not None and self._thread.is_alive(),
+            'cycles': self._cycles,
+            'tasks_run': self._tasks_run,
+            'refreshed': self._refreshed,
+            'errors': self._errors,
+            'last_cycle_seconds': self._last_cycle_seconds,
+        }
+
+
+# Instancia global del precalentador (se configura con WARMUP_WATCHLIST)
+cache_warmer = CacheWarmer(
+    settings.WARMUP_WATCHLIST,
+    interval=settings.WARMUP_INTERVAL,
+    refresh_ahead=settings.WARMUP_REFRESH_AHEAD
+)
@@ -25,63 +25,60 @@ class YFinanceService:
         """
         cache_key = f"dividends:{ticker}"
         
-        # Intentar obtener del caché primero
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        try:
-            stock = YFinanceClient.get_ticker(ticker)
-            info = stock.info
-            
-            # Función auxiliar para obtener valores seguros
-            def safe_get(key, default=0):
-                value = info.get(key)
-                return value if value is not None else default
-            
-            # Extraer métricas de dividendos básicas
-            dividend_yield_raw = safe_get("dividendYield", 0)
-            dividend_yield = f"{dividend_yield_raw}%" if dividend_yield_raw else "0%"
-            
-            # Métricas de salud financiera del dividendo
-            data = {
-                "ticker": ticker,
-                # Métricas básicas de dividendos
-                "dividend_yield": dividend_yield,
-                "payout_ratio": (safe_get("payoutRatio", 0) or 0) * 100,
-                "dividend_rate": safe_get("dividendRate", 0),
-                "last_dividend_value": safe_get("lastDividendValue", 0),
-                "currency": info.get("currency", settings.DEFAULT_CURRENCY),
+        # Carga desde la fuente (solo se ejecuta si no hay dato en caché)
+        def _load():
+            try:
+                stock = YFinanceClient.get_ticker(ticker)
+                info = stock.info
                 
-                # Métricas históricas y proyectadas de dividendos
-                "trailing_annual_dividend_rate": safe_get("trailingAnnualDividendRate", 0),
-                "trailing_annual_dividend_yield": safe_get("trailingAnnualDividendYield", 0),
-                "five_year_avg_dividend_yield": safe_get("fiveYearAvgDividendYield", 0),
-                "forward_dividend_yield": safe_get("forwardDividendYield", 0),
-                "forward_dividend_rate": safe_get("forwardDividendRate", 0),
+                # Función auxiliar para obtener valores seguros
+                def safe_get(key, default=0):
+                    value = info.get(key)
+                    return value if value is not None else default
                 
-                # Métricas de salud financiera (capacidad de pagar dividendos)
-                "free_cashflow": safe_get("freeCashflow", 0),
-                "operating_cashflow": safe_get("operatingCashflow", 0),
-                "current_ratio": safe_get("currentRatio", 0),
-                "debt_to_equity": safe_get("debtToEquity", 0),
-                "return_on_equity": safe_get("returnOnEquity", 0),
-                "profit_margins": (safe_get("profitMargins", 0) or 0) * 100,
-                "earnings_growth": (safe_get("earningsGrowth", 0) or 0) * 100,
+                # Extraer métricas de dividendos básicas
+                dividend_yield_raw = safe_get("dividendYield", 0)
+                dividend_yield = f"{dividend_yield_raw}%" if dividend_yield_raw else "0%"
                 
-                "status": "success"
-            }
-            
-            # Guardar en caché (5 minutos)
-            cache.set(cache_key, data, ttl=300)
-            return data
-        except Exception as e:
-            return {
-                "ticker": ticker,
-                "error": str(e),
-                "status": "error"
-            }
-    
+                # Métricas de salud financiera del dividendo
+                data = {
+                    "ticker": ticker,
+                    # Métricas básicas de dividendos
+                    "dividend_yield": dividend_yield,
+                    "payout_ratio": (safe_get("payoutRatio", 0) or 0) * 100,
+                    "dividend_rate": safe_get("dividendRate", 0),
+                    "last_dividend_value": safe_get("lastDividendValue", 0),
+                    "currency": info.get("currency", settings.DEFAULT_CURRENCY),
+                    
+                    # Métricas históricas y proyectadas de dividendos
+                    "trailing_annual_dividend_rate": safe_get("trailingAnnualDividendRate", 0),
+                    "trailing_annual_dividend_yield": safe_get("trailingAnnualDividendYield", 0),
+                    "five_year_avg_dividend_yield": safe_get("fiveYearAvgDividendYield", 0),
+                    "forward_dividend_yield": safe_get("forwardDividendYield", 0),
+                    "forward_dividend_rate": safe_get("forwardDividendRate", 0),
+                    
+                    # Métricas de salud financiera (capacidad de pagar dividendos)
+                    "free_cashflow": safe_get("freeCashflow", 0),
+                    "operating_cashflow": safe_get("operatingCashflow", 0),
+                    "current_ratio": safe_get("currentRatio", 0),
+                    "debt_to_equity": safe_get("debtToEquity", 0),
+                    "return_on_equity": safe_get("returnOnEquity", 0),
+                    "profit_margins": (safe_get("profitMargins", 0) or 0) * 100,
+                    "earnings_growth": (safe_get("earningsGrowth", 0) or 0) * 100,
+                    
+                    "status": "success"
+                }
+                
+                return data
+            except Exception as e:
+                return {
+                    "ticker": ticker,
+                    "error": str(e),
+                    "status": "error"
+                }
+        
+        return cache.get_or_load(cache_key, _load, ttl=300)
+
     @staticmethod
     def get_multiple_dividends(tickers: List[str]) -> List[Dict]:
         """
@@ -0,0 +1,240 @@
+"""
+Pacer adaptativo (AIMD) sobre el rate limiter de Yahoo Finance
+"""
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from app.config import settings
+from app.utils.rate_limiter import RateLimiter, rate_limiters, YAHOO_HOST
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, circuit_breakers
+from app.utils.upstream_errors import classify_error, ERROR_RATE_LIMITED, ERROR_NOT_FOUND
+from app.utils.request_context import ensure_upstream_allowed
+from app.utils.priority_scheduler import PriorityScheduler
+
+
+class AdaptivePacer:
+    """
+    Controlador AIMD de la tasa de un RateLimiter según la respuesta de la fuente
+
+    Cada petición reserva un turno en el rate limiter. Con cada éxito la tasa
+    sube de forma aditiva (hasta max_rate) y con cada 429 / "Too Many Requests"
+    baja de forma multiplicativa (hasta min_rate). Si hay holgura los turnos
+    están disponibles y no se espera nada; solo se frena cuando la fuente
+    empieza a rechazar.
+
+    Las reservas y la espera fuera del lock las hace el RateLimiter, así que
+    las peticiones concurrentes quedan escalonadas en orden de llegada.
+
+    Si tiene un circuit breaker, cada petición pasa antes por él y le reporta
+    su resultado (un "no encontrado" cuenta como respuesta válida de la fuente).
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        initial_rate: float = 0.5,
+        min_rate: float = 1.0 / 15.0,
+        max_rate: float = 2.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        backoff_cooldown: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
+        scheduler: Optional[PriorityScheduler] = None
+    ):
+        """
+        Args:
+            limiter: Rate limiter cuya tasa se ajusta (su max_requests define la ráfaga)
+            initial_rate: Tasa inicial en peticiones por segundo
+            min_rate: Tasa mínima tras retrocesos sucesivos
+            max_rate: Tasa máxima alcanzable con éxitos
+            increase: Incremento aditivo de la tasa por cada éxito
+            decrease: Factor multiplicativo aplicado a la tasa ante un 429
+            backoff_cooldown: Segundos en los que varios 429 seguidos cuentan como un solo retroceso
+            breaker: Circuit breaker de la fuente (opcional)
+            scheduler: Planificador que reparte los turnos por prioridad (opcional;
+                sin él los turnos se asignan en orden de llegada)
+        """
+        self.limiter = limiter
+        self.breaker = breaker
+        self.scheduler = scheduler
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_cooldown = backoff_cooldown
+        self._last_backoff = 0.0
+        self._successes = 0
+        self._throttles = 0
+        self._lock = Lock()
+        limiter.set_rate(max(min_rate, min(initial_rate, max_rate)))
+
+    def reserve(self) -> float:
+        """
+        Reserva un turno y retorna cuántos segundos hay que esperar para usarlo
+
+        Returns:
+            Segundos de espera (0 si había un turno disponible)
+        """
+        return self.limiter.reserve()
+
+    def acquire(self) -> None:
+        """Espera (fuera del lock) hasta poder hacer la siguiente petición"""
+        if self.scheduler is not None:
+            self.scheduler.acquire()
+        else:
+            self.limiter.acquire(wait=True)
+
+    def record_success(self) -> None:
+        """Incremento aditivo de la tasa tras una petición exitosa"""
+        with self._lock:
+            self._successes += 1
+            self.limiter.set_rate(min(self.max_rate, self.limiter.rate + self.increase))
+
+    def record_throttle(self) -> None:
+        """Retroceso multiplicativo de la tasa tras un 429"""
+        with self._lock:
+            now = time.monotonic()
+            self._throttles += 1
+            # Las peticiones que ya estaban en vuelo fallan juntas: un solo retroceso
+            if now - self._last_backoff < self.backoff_cooldown:
+                return
+            self._last_backoff = now
+            self.limiter.set_rate(max(self.min_rate, self.limiter.rate * self.decrease))
+        # Vaciar el bucket para que la nueva tasa aplique de inmediato
+        self.limiter.drain()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta una petición a la fuente respetando el pacer y registrando el resultado
+
+        Args:
+            fn: Función sin argumentos que hace la petición
+
+        Returns:
+            Resultado de fn (las excepciones se propagan tras registrarlas)
+
+        Raises:
+            CircuitOpenError: Si el circuito de la fuente está abierto (no se hace la petición)
+        """
+        ensure_upstream_allowed()
+        if self.breaker is not None and not self.breaker.allow_request():
+            raise CircuitOpenError(self.breaker)
+        try:
+            self.acquire()
+            # La espera del turno puede ser larga: la tarea pudo cancelarse mientras tanto
+            ensure_upstream_allowed()
+        except BaseException:
+            # La petición no se hace: no debe consumir la prueba del circuito semiabierto
+            if self.breaker is not None:
+                self.breaker.release_probe()
+            raise
+        try:
+            result = fn()
+        except Exception as e:
+            kind = classify_error(str(e))
+            if kind == ERROR_RATE_LIMITED:
+                self.record_throttle()
+            if self.breaker is not None:
+                if kind == ERROR_NOT_FOUND:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+            raise
+        self.record_success()
+        if self.breaker is not None:
+            self.breaker.record_success()
+        return result
+
+    def available_tokens(self) -> float:
+        """Turnos disponibles en este momento (negativo si hay peticiones esperando)"""
+        return self.limiter.available_slots()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene estadísticas del pacer"""
+        with self._lock:
+            stats = {
+                'rate': round(self.limiter.rate, 4),
+                'min_rate': self.min_rate,
+                'max_rate': self.max_rate,
+                'successes': self._successes,
+                'throttles': self._throttles,
+            }
+        stats['available_tokens'] = round(self.available_tokens(), 3)
+        stats['limiter'] = self.limiter.get_stats()
+        if self.breaker is not None:
+            stats['circuit'] = self.breaker.get_state()
+        if self.scheduler is not None:
+            stats['scheduler'] = self.scheduler.get_stats()
+        return stats
+
+
+class PacedTicker:
+    """
+    Envoltorio de yf.Ticker que pasa cada petición por el pacer y memoriza sus resultados
+
+    Las propiedades de datos (info, financials, actions, ...) y los métodos
+    (history, get_*) consumen un turno y reportan éxito o 429 al pacer. Cada
+    propiedad, y cada método por sus argumentos, se obtiene una sola vez por
+    objeto: con un lock por clave, los accesos concurrentes esperan al primero
+    en lugar de repetir la petición. Los resultados se comparten, así que no
+    deben modificarse in place.
+    """
+
+    # Atributos de yf.Ticker que no hacen peticiones
+    _LOCAL_ATTRIBUTES = frozenset({"ticker", "session", "proxy"})
+
+    def __init__(self, ticker: Any, pacer: AdaptivePacer):
+        self._ticker = ticker
+        self._pacer = pacer
+        self._memo: Dict[Any, Any] = {}
+        self._locks: Dict[Any, Lock] = {}
+        self._guard = Lock()
+
+    def _fetch(self, key: Any, fn: Callable[[], Any]) -> Any:
+        """Obtiene un resultado memorizado o hace la petición (una sola vez por clave)"""
+        with self._guard:
+            if key in self._memo:
+                return self._memo[key]
+            lock = self._locks.setdefault(key, Lock())
+
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = self._pacer.call(fn)
+            return self._memo[key]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name in self._LOCAL_ATTRIBUTES:
+            return getattr(self._ticker, name)
+
+        if callable(getattr(type(self._ticker), name, None)):
+            method = getattr(self._ticker, name)
+
+            def _paced(*args, **kwargs):
+                try:
+                    key = (name, args, tuple(sorted(kwargs.items())))
+                    hash(key)
+                except TypeError:
+                    # Argumentos no hashables: sin memorizar
+                    return self._pacer.call(lambda: method(*args, **kwargs))
+                return self._fetch(key, lambda: method(*args, **kwargs))
+
+            return _paced
+
+        return self._fetch(name, lambda: getattr(self._ticker, name))
+
+
+# Instancia global compartida por todos los servicios que consultan Yahoo Finance
+# Controla el bucket de Yahoo del registro de rate limiters (rate_limiters.get(YAHOO_HOST)),
+# reparte sus turnos por prioridad y reporta al circuito de Yahoo (circuit_breakers.get(YAHOO_HOST))
+yahoo_pacer = AdaptivePacer(
+    rate_limiters.get(YAHOO_HOST),
+    initial_rate=settings.YAHOO_PACER_INITIAL_RATE,
+    min_rate=settings.YAHOO_PACER_MIN_RATE,
+    max_rate=settings.YAHOO_PACER_MAX_RATE,
+    breaker=circuit_breakers.get(YAHOO_HOST),
+    scheduler=PriorityScheduler(
+        rate_limiters.get(YAHOO_HOST),
+        interactive_budget=settings.YAHOO_INTERACTIVE_BUDGET,
+        client_weights=settings.YAHOO_CLIENT_WEIGHTS
+    )
+)
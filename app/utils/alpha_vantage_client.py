@@ -1,10 +1,13 @@
 """
 Cliente para Alpha Vantage como fallback cuando Yahoo Finance falla
 """
-import requests
 import time
 from typing import Dict, Optional
 from app.config import settings
+from app.utils.rate_limiter import rate_limiters, ALPHA_VANTAGE_HOST
+from app.utils.request_context import ensure_upstream_allowed
+from app.utils.http_sessions import http_sessions
+from app.utils.circuit_breaker import circuit_breakers
 
 
 class AlphaVantageClient:
@@ -16,6 +19,67 @@ class AlphaVantageClient:
     
     BASE_URL = "https://www.alphavantage.co/query"
     
+    @staticmethod
+    def _acquire_slot() -> bool:
+        """
+        Verifica el circuito y toma un turno del rate limit de Alpha Vantage sin esperar
+
+        Si el circuito está abierto o no hay cupo se omite la petición (quien
+        llama cae a Yahoo Finance) en lugar de bloquear hasta el siguiente turno.
+        """
+        ensure_upstream_allowed()
+        breaker = circuit_breakers.get(ALPHA_VANTAGE_HOST)
+        if not breaker.allow_request():
+            print(f"Alpha Vantage: circuito abierto, siguiente intento en {breaker.get_wait_time():.0f}s")
+            return False
+        acquired, wait = rate_limiters.get(ALPHA_VANTAGE_HOST).try_acquire()
+        if not acquired:
+            # La petición no se hace: no debe consumir la prueba del circuito semiabierto
+            breaker.release_probe()
+            print(f"Alpha Vantage: sin cupo de rate limit, siguiente turno en {wait:.1f}s")
+        return acquired
+    
+    @classmethod
+    def _params(cls, function: str, symbol: str, api_key: Optional[str]) -> Dict[str, str]:
+        """Parámetros de la consulta (sin sufijo .CL, que Alpha Vantage no reconoce)"""
+        return {
+            "function": function,
+            "symbol": symbol.replace(".CL", ""),
+            "apikey": api_key if api_key is not None else cls.DEFAULT_API_KEY
+        }
+    
+    @staticmethod
+    def _parse(data: Dict) -> Optional[Dict]:
+        """
+        Interpreta la respuesta y reporta el resultado al circuito de Alpha Vantage
+
+        Alpha Vantage retorna error en el JSON si falla: "Note" es el aviso de
+        límite de cuota (cuenta como fallo de la fuente) y "Error Message" un
+        símbolo o función inválidos (la fuente respondió bien).
+        """
+        breaker = circuit_breakers.get(ALPHA_VANTAGE_HOST)
+        if "Note" in data:
+            breaker.record_failure()
+            return None
+        breaker.record_success()
+        if "Error Message" in data:
+            return None
+        return data
+    
+    @classmethod
+    def _query(cls, function: str, symbol: str, api_key: Optional[str]) -> Optional[Dict]:
+        """Hace la consulta (síncrona); None si se omitió o Alpha Vantage respondió con error"""
+        if not cls._acquire_slot():
+            return None
+        try:
+            response = http_sessions.get(ALPHA_VANTAGE_HOST).get(cls.BASE_URL, params=cls._params(function, symbol, api_key), timeout=10)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            circuit_breakers.get(ALPHA_VANTAGE_HOST).record_failure()
+            raise
+        return cls._parse(data)
+    
     @classmethod
     def get_overview(cls, symbol: str, api_key: Optional[str] = None) -> Optional[Dict]:
         """
@@ -28,28 +92,8 @@ class AlphaVantageClient:
         Returns:
             Diccionario con datos o None si falla
         """
-        if api_key is None:
-            api_key = cls.DEFAULT_API_KEY
-        
-        # Remover sufijo .CL si existe para Alpha Vantage
-        clean_symbol = symbol.replace(".CL", "").replace(".CL", "")
-        
-        params = {
-            "function": "OVERVIEW",
-            "symbol": clean_symbol,
-            "apikey": api_key
-        }
-        
         try:
-            response = requests.get(cls.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Alpha Vantage retorna error en el JSON si falla
-            if "Error Message" in data or "Note" in data:
-                return None
-            
-            return data
+            return cls._query("OVERVIEW", symbol, api_key)
         except Exception as e:
             print(f"Alpha Vantage error: {e}")
             return None
@@ -66,27 +110,9 @@ class AlphaVantageClient:
         Returns:
             Diccionario con datos o None si falla
         """
-        if api_key is None:
-            api_key = cls.DEFAULT_API_KEY
-        
-        clean_symbol = symbol.replace(".CL", "")
-        
-        params = {
-            "function": "GLOBAL_QUOTE",
-            "symbol": clean_symbol,
-            "apikey": api_key
-        }
-        
         try:
-            response = requests.get(cls.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if "Error Message" in data or "Note" in data:
-                return None
-            
-            return data.get("Global Quote", {})
+            data = cls._query("GLOBAL_QUOTE", symbol, api_key)
+            return data.get("Global Quote", {}) if data is not None else None
         except Exception as e:
             print(f"Alpha Vantage quote error: {e}")
             return None
-
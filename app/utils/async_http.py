@@ -0,0 +1,86 @@
+"""
+Clientes HTTP async (httpx) compartidos por host de las fuentes externas
+"""
+import asyncio
+from threading import Lock
+from typing import Any, Dict, Tuple
+import httpx
+from app.config import settings
+
+
+class AsyncHTTPClients:
+    """
+    Un httpx.AsyncClient por host, reutilizado por todas las peticiones
+
+    Cada cliente mantiene su pool de conexiones keep-alive, así que cientos de
+    peticiones concurrentes a una fuente comparten unas pocas conexiones sin
+    ocupar un hilo cada una. Cancelar la tarea que espera una respuesta cancela
+    la petición. Los clientes quedan ligados al event loop que los creó: si
+    cambia el loop (p. ej. en scripts con varios asyncio.run) se crean de nuevo.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, timeout: float = 10.0):
+        """
+        Args:
+            max_connections: Conexiones simultáneas máximas por host
+            max_keepalive: Conexiones ociosas que se conservan abiertas por host
+            timeout: Timeout por defecto de cada petición en segundos
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+        self._timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self._clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, host: str) -> httpx.AsyncClient:
+        """
+        Obtiene (o crea) el cliente de un host para el event loop en curso
+
+        Args:
+            host: Host de la fuente (ej: www.alphavantage.co)
+
+        Returns:
+            Cliente httpx compartido
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            current = self._clients.get(host)
+            if current is not None and current[0] is loop and not current[1].is_closed:
+                client = current[1]
+            else:
+                client = httpx.AsyncClient(
+                    base_url=f"https://{host}",
+                    limits=self._limits,
+                    timeout=self._timeout
+                )
+                self._clients[host] = (loop, client)
+            self._requests[host] = self._requests.get(host, 0) + 1
+            return client
+
+    async def aclose(self) -> None:
+        """Cierra los clientes creados en el event loop en curso"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            hosts = [host for host, (owner, _) in self._clients.items() if owner is loop]
+            clients = [self._clients.pop(host)[1] for host in hosts]
+        for client in clients:
+            await client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Peticiones por host y clientes abiertos"""
+        with self._lock:
+            return {
+                'open_clients': sorted(h for h, (_, c) in self._clients.items() if not c.is_closed),
+                'requests': dict(self._requests),
+            }
+
+
+# Instancia global compartida por los clientes de Alpha Vantage y TradingView
+async_http = AsyncHTTPClients(
+    max_connections=settings.ASYNC_HTTP_MAX_CONNECTIONS,
+    max_keepalive=settings.ASYNC_HTTP_MAX_KEEPALIVE,
+    timeout=settings.ASYNC_HTTP_TIMEOUT
+)
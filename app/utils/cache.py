@@ -1,95 +1,710 @@
 """
 Sistema de caché en memoria para reducir peticiones a Yahoo Finance
 """
+import sys
 import time
-from typing import Optional, Dict, Any
+import hashlib
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from threading import Lock
+import pandas as pd
+from app.config import settings
+from app.utils.single_flight import SingleFlight
+from app.utils.disk_cache import DiskCache
+from app.utils.request_context import (
+    get_request_context,
+    ensure_upstream_allowed,
+    start_request_context,
+    end_request_context,
+)
+from app.utils.upstream_errors import classify_error
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Estima el tamaño en bytes de un valor recorriendo contenedores anidados
+
+    Es una aproximación (sys.getsizeof de cada objeto alcanzable), suficiente
+    para acotar la memoria del caché sin serializar el valor. Los DataFrame y
+    Series de pandas se miden con memory_usage(deep=True).
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        if isinstance(obj, pd.DataFrame):
+            size += int(obj.memory_usage(index=True, deep=True).sum())
+            continue
+        if isinstance(obj, pd.Series):
+            size += int(obj.memory_usage(index=True, deep=True))
+            continue
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+def _is_error_result(value: Any) -> bool:
+    """Indica si un valor es una respuesta de error de los servicios ({"status": "error"})"""
+    return isinstance(value, dict) and value.get("status") == "error"
+
+
+def _key_prefix(key: str) -> str:
+    """Obtiene el prefijo de una clave (ej: 'history:AAPL:1y:1d' -> 'history')"""
+    return key.split(":", 1)[0]
+
+
+class _CacheEntry:
+    """
+    Entrada del caché con su metadata de expiración y tamaño
+
+    expires_at es el TTL suave (hasta cuándo el valor es fresco) y stale_until
+    el TTL duro (hasta cuándo puede servirse como obsoleto mientras se refresca).
+    Las entradas negativas (errores cacheados) tienen error_kind distinto de None.
+    encoded guarda la respuesta ya serializada (bytes, ETag) para no re-codificar en cada hit.
+    """
+
+    __slots__ = ("value", "expires_at", "stale_until", "created_at", "size", "prefix", "error_kind", "encoded")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        stale_until: float,
+        created_at: float,
+        size: int,
+        prefix: str,
+        error_kind: Optional[str] = None
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.created_at = created_at
+        self.size = size
+        self.prefix = prefix
+        self.error_kind = error_kind
+        self.encoded: Optional[Tuple[bytes, str]] = None
+
+
+class _PrefixStats:
+    """Contadores de uso del caché para un prefijo de clave"""
+
+    __slots__ = ("hits", "stale_hits", "negative_hits", "misses", "evictions", "expirations", "fetches", "fetch_seconds")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+
+    def as_dict(self, bytes_used: int) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_ratio': round((lookups - self.misses) / lookups, 4) if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'bytes': bytes_used,
+            'avg_fetch_ms': round(self.fetch_seconds / self.fetches * 1000, 1) if self.fetches else None,
+        }
+
+
+def compute_etag(body: bytes) -> str:
+    """ETag fuerte a partir del hash del contenido serializado"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
 
 
 class Cache:
-    """Caché simple en memoria con TTL (Time To Live)"""
-    
-    def __init__(self, default_ttl: int = 300):  # 5 minutos por defecto
+    """
+    Caché en memoria con TTL (Time To Live) y expulsión LRU acotada
+
+    Limita el número de entradas, los bytes totales y, opcionalmente, los bytes
+    por prefijo de clave (ej: que 'history' no desplace a 'fundamentals').
+    Todas las operaciones de expulsión son O(1) usando OrderedDict.
+
+    Cada entrada tiene un TTL suave y uno duro (stale-while-revalidate): entre
+    ambos, get_or_load devuelve el valor obsoleto de inmediato y lanza un único
+    refresco en segundo plano.
+
+    Opcionalmente usa un segundo nivel persistente (DiskCache) de forma
+    read-through/write-through: los fallos en memoria se buscan en disco y
+    cada set se escribe también en disco.
+
+    Los errores de las fuentes ({"status": "error"}) se guardan como entradas
+    negativas de TTL corto según su tipo (no encontrado, rate limit, transitorio)
+    para no repetir peticiones que van a fallar. Solo viven en memoria.
+
+    Las entradas vencidas se eliminan con un barrido en segundo plano
+    (start_sweeper) que usa un heap ordenado por stale_until y procesa lotes
+    pequeños para no retener el lock. Se llevan contadores por prefijo
+    (hits, misses, obsoletos, expulsiones, latencia de carga) en get_stats.
+    """
+
+    # Entradas procesadas por cada toma del lock durante el barrido
+    SWEEP_BATCH = 256
+
+    def __init__(
+        self,
+        default_ttl: int = 300,  # 5 minutos por defecto
+        default_stale_ttl: int = 0,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        prefix_quotas: Optional[Dict[str, int]] = None,
+        disk: Optional[DiskCache] = None,
+        negative_ttls: Optional[Dict[str, int]] = None
+    ):
         """
         Args:
             default_ttl: Tiempo de vida por defecto en segundos
+            default_stale_ttl: Segundos adicionales tras expirar en los que se sirve el valor obsoleto
+            max_entries: Número máximo de entradas (None = sin límite)
+            max_bytes: Tamaño máximo aproximado en bytes (None = sin límite)
+            prefix_quotas: Bytes máximos por prefijo de clave (ej: {"history": 64 * 1024 * 1024})
+            disk: Segundo nivel persistente opcional
+            negative_ttls: TTL en segundos por tipo de error (ej: {"not_found": 1800}); vacío desactiva el caché negativo
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # Orden global LRU: la primera entrada es la menos usada recientemente
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # Orden LRU por prefijo, para expulsar dentro de una cuota en O(1)
+        self._prefix_lru: Dict[str, "OrderedDict[str, None]"] = {}
+        self._prefix_bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._evictions = 0
+        self._prefix_stats: Dict[str, _PrefixStats] = {}
+        # Heap (stale_until, key) para el barrido; las entradas reemplazadas se descartan al salir
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
         self._lock = Lock()
+        self._flights = SingleFlight()
         self.default_ttl = default_ttl
-    
+        self.default_stale_ttl = default_stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.prefix_quotas = dict(prefix_quotas or {})
+        self.disk = disk
+        self.negative_ttls = dict(negative_ttls or {})
+
+    def _remove(self, key: str) -> None:
+        """Elimina una entrada y actualiza contadores (requiere el lock)"""
+        entry = self._cache.pop(key)
+        self._total_bytes -= entry.size
+        self._prefix_bytes[entry.prefix] -= entry.size
+        prefix_lru = self._prefix_lru[entry.prefix]
+        del prefix_lru[key]
+        if not prefix_lru:
+            del self._prefix_lru[entry.prefix]
+            del self._prefix_bytes[entry.prefix]
+
+    def _evict(self, key: str) -> None:
+        """Expulsa una entrada por capacidad (requiere el lock)"""
+        prefix = self._cache[key].prefix
+        self._remove(key)
+        self._evictions += 1
+        self._stats_for(prefix).evictions += 1
+
+    def _stats_for(self, prefix: str) -> _PrefixStats:
+        """Contadores del prefijo, creándolos si no existen (requiere el lock)"""
+        stats = self._prefix_stats.get(prefix)
+        if stats is None:
+            stats = self._prefix_stats[prefix] = _PrefixStats()
+        return stats
+
+    def _count(self, key: str, counter: str) -> None:
+        """Incrementa un contador del prefijo de la clave"""
+        with self._lock:
+            stats = self._stats_for(_key_prefix(key))
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _enforce_limits(self, prefix: str) -> None:
+        """Expulsa entradas LRU hasta respetar cuota del prefijo y límites globales"""
+        quota = self.prefix_quotas.get(prefix)
+        if quota is not None:
+            while self._prefix_bytes.get(prefix, 0) > quota and len(self._prefix_lru[prefix]) > 1:
+                self._evict(next(iter(self._prefix_lru[prefix])))
+
+        if self.max_entries is not None:
+            while len(self._cache) > self.max_entries:
+                self._evict(next(iter(self._cache)))
+
+        if self.max_bytes is not None:
+            while self._total_bytes > self.max_bytes and len(self._cache) > 1:
+                self._evict(next(iter(self._cache)))
+
     def get(self, key: str) -> Optional[Any]:
         """
         Obtiene un valor del caché si existe y no ha expirado
-        
+
         Args:
             key: Clave del caché
-        
+
         Returns:
             Valor almacenado o None si no existe o expiró
         """
+        entry = self._lookup(key)
+        if entry is None or entry.error_kind is not None or time.time() > entry.expires_at:
+            return None
+        return entry.value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Obtiene el valor aunque esté obsoleto (sin contar hits ni lanzar refrescos)
+
+        Args:
+            key: Clave del caché
+
+        Returns:
+            Valor almacenado o None si no existe, superó su TTL duro o es un error
+        """
+        entry = self._lookup(key)
+        if entry is None or entry.error_kind is not None:
+            return None
+        return entry.value
+
+    def _lookup(self, key: str) -> Optional[_CacheEntry]:
+        """
+        Obtiene la entrada (fresca u obsoleta) si no superó su TTL duro
+
+        Args:
+            key: Clave del caché
+
+        Returns:
+            Entrada del caché o None si no existe o superó stale_until
+        """
         with self._lock:
-            if key not in self._cache:
-                return None
-            
-            entry = self._cache[key]
-            expires_at = entry.get('expires_at', 0)
-            
-            # Si expiró, eliminar y retornar None
-            if time.time() > expires_at:
-                del self._cache[key]
-                return None
-            
-            return entry.get('value')
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+            entry = self._cache.get(key)
+            if entry is not None:
+                # Si superó el TTL duro, eliminar y retornar None
+                if time.time() > entry.stale_until:
+                    self._remove(key)
+                    return None
+
+                # Marcar como usada recientemente
+                self._cache.move_to_end(key)
+                self._prefix_lru[entry.prefix].move_to_end(key)
+                return entry
+
+        if self.disk is None:
+            return None
+
+        # Read-through: buscar en disco y promover a memoria
+        try:
+            stored = self.disk.get(key)
+        except Exception as e:
+            print(f"Caché en disco no disponible: {e}")
+            return None
+        if stored is None:
+            return None
+
+        value, expires_at, stale_until, created_at = stored
+        entry = _CacheEntry(value, expires_at, stale_until, created_at, _estimate_size(value), _key_prefix(key))
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: Optional[int] = None) -> None:
         """
         Almacena un valor en el caché
-        
+
         Args:
             key: Clave del caché
             value: Valor a almacenar
             ttl: Tiempo de vida en segundos (usa default_ttl si es None)
+            stale_ttl: Segundos tras expirar en los que se sirve obsoleto (usa default_stale_ttl si es None)
         """
         if ttl is None:
             ttl = self.default_ttl
-        
+        if stale_ttl is None:
+            stale_ttl = self.default_stale_ttl
+
+        # Estimar tamaño fuera del lock (puede recorrer listas grandes)
+        now = time.time()
+        entry = _CacheEntry(value, now + ttl, now + ttl + stale_ttl, now, _estimate_size(value), _key_prefix(key))
+
         with self._lock:
-            self._cache[key] = {
-                'value': value,
-                'expires_at': time.time() + ttl,
-                'created_at': time.time()
-            }
-    
+            self._store(key, entry)
+
+        # Write-through al segundo nivel
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, entry.expires_at, entry.stale_until, entry.created_at)
+            except Exception as e:
+                print(f"No se pudo escribir {key} en caché en disco: {e}")
+
+    def _store(self, key: str, entry: _CacheEntry) -> None:
+        """Inserta una entrada en memoria y aplica los límites (requiere el lock)"""
+        if key in self._cache:
+            self._remove(key)
+
+        self._cache[key] = entry
+        self._prefix_lru.setdefault(entry.prefix, OrderedDict())[key] = None
+        self._prefix_bytes[entry.prefix] = self._prefix_bytes.get(entry.prefix, 0) + entry.size
+        self._total_bytes += entry.size
+        heapq.heappush(self._expiry_heap, (entry.stale_until, key))
+
+        self._enforce_limits(entry.prefix)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        bypass_negative: bool = False
+    ) -> Any:
+        """
+        Obtiene un valor del caché o lo carga una sola vez aunque haya llamadas concurrentes
+
+        Implementa el patrón cache.get -> fetch -> cache.set con coalescencia:
+        si varias peticiones fallan en el caché para la misma clave, solo una
+        ejecuta el loader y todas reciben su resultado (incluidos los errores).
+        Las respuestas de error ({"status": "error"}) no se guardan en el caché.
+
+        Si la entrada está obsoleta (entre el TTL suave y el duro) se devuelve
+        de inmediato y se lanza un único refresco en segundo plano. El estado
+        (HIT/STALE/MISS), la edad y si hay refresco en curso se registran en el
+        contexto de la petición para exponerlos como headers.
+
+        Si el loader devuelve un error se guarda como entrada negativa con el
+        TTL de su tipo; mientras viva se devuelve ese error sin ir a la fuente,
+        salvo que se pida bypass_negative (o la petición traiga Cache-Control: no-cache).
+
+        Args:
+            key: Clave del caché
+            loader: Función sin argumentos que obtiene el valor desde la fuente
+            ttl: Tiempo de vida en segundos (usa default_ttl si es None)
+            stale_ttl: Segundos tras expirar en los que se sirve obsoleto (usa default_stale_ttl si es None)
+            bypass_negative: Ignora las entradas negativas y vuelve a consultar la fuente
+
+        Returns:
+            Valor del caché o el resultado del loader
+        """
+        context = get_request_context()
+        if context is not None and context.bypass_negative_cache:
+            bypass_negative = True
+
+        value = self._get_or_load(key, loader, ttl, stale_ttl, bypass_negative, context)
+        # La última clave resuelta es la que respalda la respuesta (las claves de
+        # las que depende, como las barras crudas, se resuelven antes)
+        if context is not None:
+            context.cache_key = key
+        return value
+
+    def _get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: Optional[int],
+        bypass_negative: bool,
+        context: Any
+    ) -> Any:
+        """Implementación de get_or_load (ver su documentación)"""
+        entry = self._lookup(key)
+        if entry is not None and entry.error_kind is not None:
+            if not bypass_negative:
+                self._count(key, "negative_hits")
+                if context is not None:
+                    context.record_cache("NEGATIVE", time.time() - entry.created_at)
+                return entry.value
+            entry = None
+
+        if entry is not None:
+            now = time.time()
+            age = now - entry.created_at
+            # Precalentamiento: recargar ya las entradas a punto de expirar
+            if (
+                context is not None
+                and context.refresh_ahead
+                and now <= entry.expires_at < now + context.refresh_ahead
+            ):
+                self._count(key, "misses")
+                context.record_cache("MISS")
+                return self._flights.do(key, lambda: self._reload(key, loader, ttl, stale_ttl))
+
+            if now <= entry.expires_at:
+                self._count(key, "hits")
+                if context is not None:
+                    context.record_cache("HIT", age)
+                return entry.value
+
+            self._count(key, "stale_hits")
+            refreshing = self._refresh_in_background(key, loader, ttl, stale_ttl)
+            if context is not None:
+                context.record_cache("STALE", age, refreshing=refreshing)
+            return entry.value
+
+        # Una sonda de caché no carga: quien la lanzó ejecuta el servicio normalmente
+        ensure_upstream_allowed()
+        self._count(key, "misses")
+        if context is not None:
+            context.record_cache("MISS")
+
+        def _load():
+            # Otro líder pudo haber llenado el caché mientras esperábamos
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            value = self._timed_load(key, loader)
+            if _is_error_result(value):
+                self.set_negative(key, value)
+            elif value is not None:
+                self.set(key, value, ttl, stale_ttl)
+            return value
+
+        return self._flights.do(key, _load)
+
+    def get_encoded(self, key: str, value: Any, encoder: Callable[[Any], bytes]) -> Tuple[bytes, str]:
+        """
+        Obtiene la respuesta serializada y su ETag, memoizadas en la entrada del caché
+
+        Solo se reutiliza la serialización si la entrada sigue guardando el mismo
+        objeto (comparación por identidad); si la clave se refrescó o expulsó,
+        se serializa de nuevo. Los bytes memoizados cuentan para los límites de memoria.
+
+        Args:
+            key: Clave del caché que produjo el valor
+            value: Valor retornado por get_or_load
+            encoder: Función que serializa el valor a bytes
+
+        Returns:
+            Tupla (bytes, ETag)
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry.value is value and entry.encoded is not None:
+                return entry.encoded
+
+        # Serializar fuera del lock
+        body = encoder(value)
+        encoded = (body, compute_etag(body))
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry.value is value and entry.encoded is None:
+                entry.encoded = encoded
+                extra = len(body)
+                entry.size += extra
+                self._prefix_bytes[entry.prefix] += extra
+                self._total_bytes += extra
+                self._enforce_limits(entry.prefix)
+
+        return encoded
+
+    def _timed_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Ejecuta el loader registrando su latencia en los contadores del prefijo"""
+        start = time.perf_counter()
+        try:
+            return loader()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats_for(_key_prefix(key))
+                stats.fetches += 1
+                stats.fetch_seconds += elapsed
+
+    def _reload(self, key: str, loader: Callable[[], Any], ttl: Optional[int], stale_ttl: Optional[int]) -> Any:
+        """Recarga una entrada existente; si falla se conserva el valor anterior hasta su TTL duro"""
+        value = self._timed_load(key, loader)
+        if value is not None and not _is_error_result(value):
+            self.set(key, value, ttl, stale_ttl)
+        return value
+
+    def set_negative(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Guarda un error como entrada negativa con el TTL de su tipo (solo en memoria)
+
+        Args:
+            key: Clave del caché
+            value: Respuesta de error ({"error": ..., "status": "error"}); si su tipo
+                no tiene TTL en negative_ttls no se guarda
+        """
+        error_kind = classify_error(str(value.get("error", "")))
+        ttl = self.negative_ttls.get(error_kind)
+        if not ttl:
+            return
+
+        now = time.time()
+        entry = _CacheEntry(value, now + ttl, now + ttl, now, _estimate_size(value), _key_prefix(key), error_kind)
+        with self._lock:
+            self._store(key, entry)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int],
+        stale_ttl: Optional[int]
+    ) -> bool:
+        """
+        Lanza un refresco en segundo plano salvo que ya haya uno en curso para la clave
+
+        Returns:
+            True si hay un refresco en curso (recién lanzado o previo)
+        """
+        if self._flights.in_flight(key):
+            return True
+
+        def _refresh():
+            # Otro refresco pudo haber terminado justo antes
+            value = self.get(key)
+            if value is not None:
+                return value
+            return self._reload(key, loader, ttl, stale_ttl)
+
+        def _run():
+            # Contexto de segundo plano: el refresco solo usa la capacidad ociosa de la fuente
+            token = start_request_context(background=True)
+            try:
+                self._flights.do(key, _refresh)
+            except Exception as e:
+                print(f"Refresco en segundo plano falló para {key}: {e}")
+            finally:
+                end_request_context(token)
+
+        threading.Thread(target=_run, name=f"cache-refresh:{key}", daemon=True).start()
+        return True
+
     def delete(self, key: str) -> None:
         """Elimina una entrada del caché"""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
-    
+                self._remove(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
     def clear(self) -> None:
         """Limpia todo el caché"""
         with self._lock:
             self._cache.clear()
-    
-    def cleanup_expired(self) -> None:
-        """Elimina entradas expiradas del caché"""
-        current_time = time.time()
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if current_time > entry.get('expires_at', 0)
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Obtiene estadísticas del caché"""
+            self._prefix_lru.clear()
+            self._prefix_bytes.clear()
+            self._expiry_heap.clear()
+            self._total_bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _sweep_batch(self, now: float, batch: int) -> Tuple[int, bool]:
+        """
+        Elimina hasta `batch` entradas vencidas desde la cima del heap (requiere el lock)
+
+        Returns:
+            Tupla (entradas eliminadas, si quedan vencidas por procesar)
+        """
+        heap = self._expiry_heap
+        removed = 0
+        for _ in range(batch):
+            if not heap or heap[0][0] >= now:
+                return removed, False
+            stale_until, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Descartar referencias a entradas ya reemplazadas o eliminadas
+            if entry is None or entry.stale_until != stale_until:
+                continue
+            self._remove(key)
+            self._stats_for(entry.prefix).expirations += 1
+            removed += 1
+        return removed, bool(heap) and heap[0][0] < now
+
+    def _compact_heap(self) -> None:
+        """Reconstruye el heap si acumula demasiadas referencias obsoletas (requiere el lock)"""
+        if len(self._expiry_heap) > 2 * len(self._cache) + self.SWEEP_BATCH:
+            self._expiry_heap = [(entry.stale_until, key) for key, entry in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def cleanup_expired(self) -> int:
+        """
+        Elimina entradas expiradas del caché en lotes pequeños
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        now = time.time()
+        total = 0
+        pending = True
+        while pending:
+            with self._lock:
+                removed, pending = self._sweep_batch(now, self.SWEEP_BATCH)
+                if not pending:
+                    self._compact_heap()
+            total += removed
+        return total
+
+    def start_sweeper(self, interval: float = 30.0) -> None:
+        """
+        Inicia el barrido periódico de entradas vencidas en un hilo daemon
+
+        Args:
+            interval: Segundos entre barridos
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+
+        def _run():
+            while not self._sweeper_stop.wait(interval):
+                try:
+                    self.cleanup_expired()
+                except Exception as e:
+                    print(f"Error en el barrido del caché: {e}")
+
+        self._sweeper = threading.Thread(target=_run, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Detiene el barrido periódico"""
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+    def get_stats(self, include_keys: bool = False) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas del caché
+
+        Args:
+            include_keys: Incluir la lista de claves (copia todas las claves bajo el lock)
+        """
         with self._lock:
-            return {
+            prefixes = {
+                prefix: stats.as_dict(self._prefix_bytes.get(prefix, 0))
+                for prefix, stats in self._prefix_stats.items()
+            }
+            stats = {
                 'size': len(self._cache),
-                'keys': list(self._cache.keys())
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+                'prefix_bytes': dict(self._prefix_bytes),
+                'prefix_quotas': dict(self.prefix_quotas),
+                'prefixes': prefixes,
+                'expiry_heap_size': len(self._expiry_heap),
             }
+            if include_keys:
+                stats['keys'] = list(self._cache.keys())
+
+        stats['single_flight'] = self._flights.get_stats()
+        stats['disk'] = self.disk.get_stats() if self.disk is not None else None
+        return stats
 
 
 # Instancia global del caché
@@ -97,5 +712,18 @@ class Cache:
 # - Info básica (fundamentals, dividends): 5 minutos (300s)
 # - Datos históricos: 15 minutos (900s) - cambian menos frecuentemente
 # - Noticias, recomendaciones: 10 minutos (600s)
-cache = Cache(default_ttl=300)
+# Tras expirar, el valor se sirve obsoleto durante CACHE_STALE_TTL segundos mientras se refresca
+# Errores de las fuentes se cachean con TTL corto por tipo (CACHE_NEGATIVE_TTLS)
+# Límites configurables vía settings (CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_PREFIX_QUOTAS)
+# Segundo nivel en disco opcional: se activa configurando CACHE_DISK_PATH
+disk_cache = DiskCache(settings.CACHE_DISK_PATH, max_bytes=settings.CACHE_DISK_MAX_BYTES) if settings.CACHE_DISK_PATH else None
 
+cache = Cache(
+    default_ttl=300,
+    default_stale_ttl=settings.CACHE_STALE_TTL,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    prefix_quotas=settings.CACHE_PREFIX_QUOTAS,
+    disk=disk_cache,
+    negative_ttls=settings.CACHE_NEGATIVE_TTLS
+)
@@ -1,75 +1,238 @@
 """
-Circuit breaker para evitar peticiones cuando Yahoo Finance está bloqueando
+Circuit breakers por fuente externa (Yahoo Finance, Alpha Vantage, TradingView)
 """
 import time
+from collections import deque
 from threading import Lock
-from typing import Optional
+from typing import Any, Deque, Dict, Optional, Tuple
+from app.config import settings
+from app.utils.rate_limiter import YAHOO_HOST
 
 
 class CircuitBreaker:
-    """Circuit breaker simple para detectar bloqueos de Yahoo Finance"""
-    
-    def __init__(self, failure_threshold: int = 2, recovery_timeout: int = 300):
+    """
+    Circuit breaker por tasa de error en una ventana deslizante
+
+    Cerrado: deja pasar todo y registra el resultado de cada petición. Se abre
+    cuando en los últimos `window` segundos hubo al menos `min_requests`
+    peticiones y la proporción de fallos llega a `failure_rate`.
+    Abierto: rechaza todo hasta que pasa `recovery_timeout`.
+    Semiabierto: deja pasar una sola petición de prueba; si tiene éxito el
+    circuito se cierra y si falla se vuelve a abrir. Si la prueba no reporta
+    resultado en `probe_timeout` segundos se concede otra.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        window: float = 60.0,
+        min_requests: int = 5,
+        failure_rate: float = 0.5,
+        recovery_timeout: float = 60.0,
+        probe_timeout: float = 30.0
+    ):
         """
         Args:
-            failure_threshold: Número de fallos consecutivos antes de abrir el circuito
-            recovery_timeout: Tiempo en segundos antes de intentar de nuevo
+            name: Nombre del circuito (normalmente el host de la fuente)
+            window: Ventana deslizante en segundos para calcular la tasa de error
+            min_requests: Peticiones mínimas en la ventana antes de poder abrir el circuito
+            failure_rate: Proporción de fallos (0-1) que abre el circuito
+            recovery_timeout: Segundos abierto antes de permitir una petición de prueba
+            probe_timeout: Segundos tras los que una prueba sin resultado se da por perdida
         """
-        self.failure_threshold = failure_threshold
+        self.name = name
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
         self.recovery_timeout = recovery_timeout
-        self.failure_count = 0
-        self.last_failure_time: Optional[float] = None
+        self.probe_timeout = probe_timeout
         self.state = "closed"  # closed, open, half_open
+        # Resultados recientes: (instante, falló)
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._times_opened = 0
+        self._rejected = 0
         self._lock = Lock()
-    
-    def record_success(self):
-        """Registra un éxito y cierra el circuito"""
-        with self._lock:
-            self.failure_count = 0
-            self.state = "closed"
-            self.last_failure_time = None
-    
-    def record_failure(self):
-        """Registra un fallo"""
-        with self._lock:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
-            
-            if self.failure_count >= self.failure_threshold:
-                self.state = "open"
-    
-    def can_proceed(self) -> bool:
-        """Verifica si se puede hacer una petición"""
+
+    def _prune(self, now: float) -> None:
+        """Descarta los resultados fuera de la ventana (requiere el lock)"""
+        limit = now - self.window
+        while self._outcomes and self._outcomes[0][0] < limit:
+            _, failed = self._outcomes.popleft()
+            if failed:
+                self._failures -= 1
+
+    def _open(self, now: float) -> None:
+        """Abre el circuito (requiere el lock)"""
+        self.state = "open"
+        self._opened_at = now
+        self._probe_started = None
+        self._times_opened += 1
+
+    def _close(self) -> None:
+        """Cierra el circuito y olvida los fallos previos (requiere el lock)"""
+        self.state = "closed"
+        self._opened_at = None
+        self._probe_started = None
+        self._outcomes.clear()
+        self._failures = 0
+
+    def allow_request(self) -> bool:
+        """
+        Verifica si se puede hacer una petición (en semiabierto concede la única prueba)
+
+        Returns:
+            True si la petición puede hacerse; quien la hace debe reportar su resultado
+        """
         with self._lock:
+            now = time.monotonic()
             if self.state == "closed":
                 return True
-            
+
             if self.state == "open":
-                # Verificar si ha pasado suficiente tiempo para intentar de nuevo
-                if self.last_failure_time and (time.time() - self.last_failure_time) >= self.recovery_timeout:
-                    self.state = "half_open"
-                    self.failure_count = 0  # Resetear contador en half_open
-                    return True
+                if now - self._opened_at < self.recovery_timeout:
+                    self._rejected += 1
+                    return False
+                self.state = "half_open"
+
+            # half_open: una sola prueba a la vez
+            if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+                self._rejected += 1
                 return False
-            
-            # half_open: permitir un intento
+            self._probe_started = now
             return True
-    
+
+    def release_probe(self) -> None:
+        """Devuelve la prueba semiabierta concedida cuando la petición no llegó a hacerse"""
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_started = None
+
+    def can_proceed(self) -> bool:
+        """Alias de allow_request (compatibilidad)"""
+        return self.allow_request()
+
+    def record_success(self) -> None:
+        """Registra una petición exitosa (en semiabierto cierra el circuito)"""
+        with self._lock:
+            if self.state == "half_open":
+                self._close()
+                return
+            now = time.monotonic()
+            self._outcomes.append((now, False))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        """Registra un fallo (en semiabierto vuelve a abrir el circuito)"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "half_open":
+                self._open(now)
+                return
+            self._outcomes.append((now, True))
+            self._failures += 1
+            self._prune(now)
+            if self.state == "closed" and self._should_open():
+                self._open(now)
+
+    def _should_open(self) -> bool:
+        """Si la tasa de error de la ventana supera el umbral (requiere el lock)"""
+        total = len(self._outcomes)
+        return total >= self.min_requests and self._failures / total >= self.failure_rate
+
     def get_wait_time(self) -> float:
         """Obtiene el tiempo de espera recomendado si el circuito está abierto"""
         with self._lock:
-            if self.state == "open" and self.last_failure_time:
-                elapsed = time.time() - self.last_failure_time
-                remaining = self.recovery_timeout - elapsed
-                return max(0, remaining)
+            if self.state == "open" and self._opened_at is not None:
+                return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
             return 0.0
-    
+
     def get_state(self) -> str:
         """Obtiene el estado actual del circuito"""
         with self._lock:
             return self.state
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Estado, tasa de error de la ventana y contadores del circuito"""
+        with self._lock:
+            self._prune(time.monotonic())
+            total = len(self._outcomes)
+            stats = {
+                'name': self.name,
+                'state': self.state,
+                'window_requests': total,
+                'window_failures': self._failures,
+                'failure_rate': round(self._failures / total, 3) if total else 0.0,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+                'probe_in_flight': self._probe_started is not None,
+            }
+        stats['retry_in'] = round(self.get_wait_time(), 1)
+        return stats
+
+
+class CircuitOpenError(Exception):
+    """Petición rechazada porque el circuito de la fuente está abierto"""
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        super().__init__(
+            f"Circuit breaker abierto para {breaker.name}. "
+            f"Espera {int(breaker.get_wait_time())} segundos antes de intentar de nuevo."
+        )
+
+
+class CircuitBreakerRegistry:
+    """Un circuit breaker por host de la fuente, creado bajo demanda"""
+
+    def __init__(self, configs: Dict[str, Dict[str, float]], default: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            configs: Configuración por host (window, min_requests, failure_rate, recovery_timeout)
+            default: Configuración para hosts sin entrada propia
+        """
+        self._configs = dict(configs)
+        self._default = dict(default or {})
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = Lock()
+        # Los hosts configurados aparecen en el estado desde el inicio
+        for host in self._configs:
+            self.get(host)
+
+    def get(self, host: str) -> CircuitBreaker:
+        """Obtiene (o crea) el circuit breaker de un host"""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                config = self._configs.get(host, self._default)
+                breaker = CircuitBreaker(
+                    name=host,
+                    window=float(config.get("window", 60.0)),
+                    min_requests=int(config.get("min_requests", 5)),
+                    failure_rate=float(config.get("failure_rate", 0.5)),
+                    recovery_timeout=float(config.get("recovery_timeout", 60.0)),
+                    probe_timeout=float(config.get("probe_timeout", 30.0))
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def get_states(self) -> Dict[str, str]:
+        """Estado de cada circuito creado"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.get_state() for host, breaker in breakers.items()}
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Estadísticas de todos los circuitos creados"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.get_stats() for host, breaker in breakers.items()}
+
 
-# Instancia global del circuit breaker
-circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=300)  # 5 minutos
+# Registro global: un circuito por host (configuración en settings.CIRCUIT_BREAKERS)
+circuit_breakers = CircuitBreakerRegistry(settings.CIRCUIT_BREAKERS)
 
+# Circuito de Yahoo Finance (alias por compatibilidad con el antiguo breaker global)
+circuit_breaker = circuit_breakers.get(YAHOO_HOST)
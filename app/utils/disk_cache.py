@@ -0,0 +1,184 @@
+"""
+Segundo nivel de caché persistente en disco (SQLite) para sobrevivir reinicios y cold starts
+"""
+import os
+import pickle
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+
+class DiskCache:
+    """
+    Caché persistente en un archivo SQLite con uso de disco acotado
+
+    Guarda cada entrada serializada junto con su expiración (TTL suave y duro).
+    Cuando el tamaño total supera max_bytes elimina primero las entradas vencidas
+    y luego las menos usadas recientemente, y compacta el archivo con
+    incremental_vacuum para devolver el espacio al sistema.
+    """
+
+    # Tras superar max_bytes se libera espacio hasta esta fracción del límite
+    LOW_WATERMARK = 0.8
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: Ruta del archivo SQLite
+            max_bytes: Tamaño máximo aproximado de los valores almacenados en bytes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # auto_vacuum debe configurarse antes de crear las tablas
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                stale_until REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_stale ON entries (stale_until)")
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._total_bytes = int(row[0])
+        self._compactions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, float, float]]:
+        """
+        Obtiene una entrada si no superó su TTL duro
+
+        Args:
+            key: Clave del caché
+
+        Returns:
+            Tupla (valor, expires_at, stale_until, created_at) o None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, stale_until, created_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, expires_at, stale_until, created_at = row
+            if now > stale_until:
+                self._delete(key)
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+        try:
+            value = pickle.loads(blob)
+        except Exception as e:
+            print(f"Caché en disco: entrada corrupta {key}: {e}")
+            self.delete(key)
+            return None
+
+        return value, expires_at, stale_until, created_at
+
+    def set(self, key: str, value: Any, expires_at: float, stale_until: float, created_at: float) -> None:
+        """
+        Almacena una entrada serializada
+
+        Args:
+            key: Clave del caché
+            value: Valor a almacenar (debe ser serializable con pickle)
+            expires_at: Timestamp del TTL suave
+            stale_until: Timestamp del TTL duro
+            created_at: Timestamp de creación del valor
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(blob)
+
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (key, value, expires_at, stale_until, created_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, blob, expires_at, stale_until, created_at, time.time(), size)
+            )
+            self._total_bytes += size
+
+            if self._total_bytes > self.max_bytes:
+                self._shrink()
+
+    def _delete(self, key: str) -> None:
+        """Elimina una entrada (requiere el lock)"""
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _shrink(self) -> None:
+        """Libera espacio: vencidas primero, luego LRU, y compacta el archivo (requiere el lock)"""
+        target = int(self.max_bytes * self.LOW_WATERMARK)
+
+        self._conn.execute("DELETE FROM entries WHERE stale_until < ?", (time.time(),))
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._total_bytes = int(row[0])
+
+        if self._total_bytes > target:
+            cursor = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at")
+            to_delete = []
+            remaining = self._total_bytes
+            for key, size in cursor:
+                if remaining <= target:
+                    break
+                to_delete.append((key,))
+                remaining -= size
+            cursor.close()
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+            self._total_bytes = remaining
+
+        self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        self._compactions += 1
+
+    def delete(self, key: str) -> None:
+        """Elimina una entrada"""
+        with self._lock:
+            self._delete(key)
+
+    def clear(self) -> None:
+        """Elimina todas las entradas y compacta el archivo"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene estadísticas del caché en disco"""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return {
+                'path': self.path,
+                'size': row[0],
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'compactions': self._compactions
+            }
@@ -0,0 +1,149 @@
+"""
+Ejecución de los servicios síncronos fuera del event loop, con un pool de hilos por fuente
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict
+from app.config import settings
+from app.utils.request_context import run_cache_probe, CacheProbeMiss
+
+
+# Fuentes externas con pool propio (Alpha Vantage y TradingView usan clientes async)
+YAHOO = "yahoo"
+
+
+class _PoolStats:
+    """Contadores de un pool (se modifican bajo el lock del dispatcher)"""
+
+    __slots__ = ("queued", "running", "completed", "probe_hits")
+
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.probe_hits = 0
+
+
+class ServiceDispatcher:
+    """
+    Despacha los servicios síncronos a un pool de hilos por fuente externa
+
+    Los servicios hacen peticiones bloqueantes (requests, yfinance, esperas del
+    rate limiter), así que ejecutarlos en el event loop congela el worker
+    entero, /health incluido. Cada fuente tiene su propio pool con un número
+    fijo de hilos: una fuente lenta solo agota sus hilos y las demás siguen
+    respondiendo. El contexto de la petición (contextvars) viaja con la tarea.
+
+    Antes de ocupar un hilo se sondea el caché en el propio event loop: si la
+    respuesta está completa en el caché se retorna en milisegundos, sin cola.
+    """
+
+    def __init__(self, workers: Dict[str, int], default_workers: int = 4):
+        """
+        Args:
+            workers: Número de hilos por fuente
+            default_workers: Hilos para fuentes sin entrada propia
+        """
+        self._workers = dict(workers)
+        self._default_workers = default_workers
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+        self._lock = Lock()
+
+    def _executor(self, upstream: str) -> ThreadPoolExecutor:
+        """Obtiene (o crea) el pool de una fuente"""
+        with self._lock:
+            executor = self._executors.get(upstream)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self._workers.get(upstream, self._default_workers),
+                    thread_name_prefix=f"dispatch-{upstream}"
+                )
+                self._executors[upstream] = executor
+                self._stats[upstream] = _PoolStats()
+            return executor
+
+    def _run_tracked(self, upstream: str, context: contextvars.Context, call: Callable[[], Any]) -> Any:
+        """Ejecuta la tarea en un hilo del pool dentro del contexto de la petición"""
+        stats = self._stats[upstream]
+        with self._lock:
+            stats.queued -= 1
+            stats.running += 1
+        try:
+            return context.run(call)
+        finally:
+            with self._lock:
+                stats.running -= 1
+                stats.completed += 1
+
+    async def run(
+        self,
+        upstream: str,
+        fn: Callable[..., Any],
+        *args,
+        probe_cache: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        Ejecuta un servicio síncrono sin bloquear el event loop
+
+        Args:
+            upstream: Fuente externa que consulta el servicio (elige el pool)
+            fn: Función síncrona del servicio
+            *args, **kwargs: Argumentos de fn
+            probe_cache: Intentar responder desde el caché en el event loop
+                (False para servicios sin caché, que siempre van a la fuente)
+
+        Returns:
+            Resultado de fn
+        """
+        executor = self._executor(upstream)
+        if probe_cache:
+            try:
+                result = run_cache_probe(fn, *args, **kwargs)
+                with self._lock:
+                    self._stats[upstream].probe_hits += 1
+                return result
+            except CacheProbeMiss:
+                pass
+
+        with self._lock:
+            self._stats[upstream].queued += 1
+        call = functools.partial(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            self._run_tracked,
+            upstream,
+            contextvars.copy_context(),
+            call
+        )
+
+    def shutdown(self) -> None:
+        """Cierra los pools (las tareas en curso terminan, las encoladas se cancelan)"""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hilos, tareas en cola, en curso y respondidas desde el caché por fuente"""
+        with self._lock:
+            return {
+                upstream: {
+                    'max_workers': self._workers.get(upstream, self._default_workers),
+                    'queued': stats.queued,
+                    'running': stats.running,
+                    'completed': stats.completed,
+                    'probe_hits': stats.probe_hits,
+                }
+                for upstream, stats in self._stats.items()
+            }
+
+
+# Instancia global compartida por todos los endpoints (hilos por fuente en settings.DISPATCH_WORKERS)
+dispatcher = ServiceDispatcher(settings.DISPATCH_WORKERS)
@@ -0,0 +1,217 @@
+"""
+Consultas en carrera (hedged requests) entre dos fuentes con tiempo límite
+"""
+import contextvars
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from threading import Event, Lock
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from app.config import settings
+from app.utils.request_context import run_cancellable
+
+
+# Una fuente de la carrera: (nombre, función sin argumentos)
+Leg = Tuple[str, Callable[[], Any]]
+
+
+class HedgedRacer:
+    """
+    Ejecuta una consulta contra una fuente primaria y, si tarda, también contra una secundaria
+
+    La primaria se lanza de inmediato. Si no dio una respuesta válida en el
+    retardo de cobertura (percentil de sus latencias recientes) se lanza la
+    secundaria, y si la primaria falla antes se lanza en ese momento. Gana la
+    primera respuesta válida; la otra consulta se cancela: si no había empezado
+    no llega a ejecutarse y si está en curso no hace más peticiones a su fuente
+    (la que ya está en vuelo termina y su resultado se descarta). Nada espera
+    más allá del tiempo límite de la carrera.
+    """
+
+    def __init__(self, max_workers: int = 16, samples: int = 50, min_samples: int = 5):
+        """
+        Args:
+            max_workers: Hilos para las consultas en carrera
+            samples: Latencias recientes que se guardan por fuente
+            min_samples: Latencias necesarias antes de usar el percentil
+        """
+        self._max_workers = max_workers
+        self._min_samples = min_samples
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._samples = samples
+        self._races = 0
+        self._hedged = 0
+        self._timeouts = 0
+        self._wins: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Obtiene (o crea) el pool de hilos de las consultas"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def record_latency(self, source: str, seconds: float) -> None:
+        """Registra la latencia de una respuesta válida de una fuente"""
+        with self._lock:
+            samples = self._latencies.get(source)
+            if samples is None:
+                samples = self._latencies[source] = deque(maxlen=self._samples)
+            samples.append(seconds)
+
+    def hedge_delay(self, source: str, percentile: float, min_delay: float, max_delay: float) -> float:
+        """
+        Segundos a esperar a una fuente antes de lanzar la secundaria
+
+        Args:
+            source: Fuente primaria
+            percentile: Percentil (0-1) de sus latencias recientes
+            min_delay: Retardo mínimo
+            max_delay: Retardo máximo (también el usado mientras no hay suficientes muestras)
+
+        Returns:
+            Retardo en segundos
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(source, ()))
+        if len(samples) < self._min_samples:
+            return max_delay
+        index = min(len(samples) - 1, max(0, math.ceil(percentile * len(samples)) - 1))
+        return min(max_delay, max(min_delay, samples[index]))
+
+    def _run_leg(self, source: str, fn: Callable[[], Any], cancel: Event, is_valid: Callable[[Any], bool]) -> Any:
+        """Ejecuta una consulta de la carrera y registra su latencia si fue válida"""
+        start = time.perf_counter()
+        result = run_cancellable(cancel, fn)
+        if is_valid(result):
+            self.record_latency(source, time.perf_counter() - start)
+        return result
+
+    def race(
+        self,
+        primary: Leg,
+        secondary: Leg,
+        is_valid: Callable[[Any], bool],
+        deadline: float,
+        hedge_after: float
+    ) -> Tuple[Optional[str], Any, Dict[str, Any]]:
+        """
+        Corre la carrera entre las dos fuentes
+
+        Args:
+            primary: Fuente primaria (nombre, función)
+            secondary: Fuente secundaria (nombre, función)
+            is_valid: Indica si un resultado es una respuesta válida
+            deadline: Tiempo límite total en segundos
+            hedge_after: Segundos a esperar a la primaria antes de lanzar la secundaria
+
+        Returns:
+            (fuente ganadora o None, su resultado o el último resultado no válido
+            recibido, metadata con tiempos y el desenlace de cada fuente)
+        """
+        executor = self._get_executor()
+        start = time.perf_counter()
+        cancels: Dict[str, Event] = {}
+        pending: Dict[Future, str] = {}
+        outcomes: Dict[str, str] = {}
+        started_at: Dict[str, float] = {}
+
+        def _launch(leg: Leg) -> None:
+            source, fn = leg
+            cancels[source] = Event()
+            started_at[source] = time.perf_counter() - start
+            outcomes[source] = "pending"
+            context = contextvars.copy_context()
+            future = executor.submit(context.run, self._run_leg, source, fn, cancels[source], is_valid)
+            pending[future] = source
+
+        _launch(primary)
+        hedged = False
+        winner: Optional[str] = None
+        winner_result: Any = None
+        fallback: Any = None
+
+        while winner is None:
+            elapsed = time.perf_counter() - start
+            if elapsed >= deadline:
+                break
+            if not hedged and (elapsed >= hedge_after or not pending):
+                _launch(secondary)
+                hedged = True
+            if not pending:
+                break
+            timeout = deadline - elapsed if hedged else min(deadline, hedge_after) - elapsed
+            done, _ = wait(list(pending), timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    result = future.result()
+                except BaseException as e:
+                    outcomes[source] = f"error: {e}" if str(e) else "error"
+                    continue
+                if is_valid(result):
+                    if winner is None:
+                        winner, winner_result = source, result
+                        outcomes[source] = "won"
+                    else:
+                        outcomes[source] = "discarded"
+                else:
+                    outcomes[source] = "invalid"
+                    fallback = result
+
+        # Cancelar lo que siga en curso (perdedoras o todo si se agotó el tiempo)
+        for future, source in pending.items():
+            cancels[source].set()
+            future.cancel()
+            outcomes[source] = "cancelled"
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._races += 1
+            if hedged:
+                self._hedged += 1
+            if winner is None:
+                if elapsed >= deadline:
+                    self._timeouts += 1
+            else:
+                self._wins[winner] = self._wins.get(winner, 0) + 1
+
+        metadata = {
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "deadline_ms": round(deadline * 1000, 1),
+            "hedge_after_ms": round(hedge_after * 1000, 1),
+            "hedged": hedged,
+            "started_ms": {source: round(t * 1000, 1) for source, t in started_at.items()},
+            "outcomes": outcomes,
+        }
+        return winner, winner_result if winner is not None else fallback, metadata
+
+    def shutdown(self) -> None:
+        """Cierra el pool (las consultas encoladas se cancelan)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Carreras, cuántas lanzaron la secundaria, victorias por fuente y latencias recientes"""
+        with self._lock:
+            latencies = {source: sorted(samples) for source, samples in self._latencies.items()}
+            stats = {
+                'races': self._races,
+                'hedged': self._hedged,
+                'timeouts': self._timeouts,
+                'wins': dict(self._wins),
+            }
+        stats['latency_p50_ms'] = {
+            source: round(samples[len(samples) // 2] * 1000, 1)
+            for source, samples in latencies.items() if samples
+        }
+        return stats
+
+
+# Instancia global (la usa FundamentalsService.get_fundamentals)
+hedged_racer = HedgedRacer(max_workers=settings.HEDGE_WORKERS)
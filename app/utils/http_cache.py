@@ -0,0 +1,53 @@
+"""
+Respuestas JSON pre-serializadas con ETag para endpoints respaldados por el caché
+"""
+from typing import Any, Type
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.utils.cache import cache, compute_etag
+from app.utils.request_context import get_request_context
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Compara el header If-None-Match con el ETag (comparación débil, admite listas y '*')"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, result: Any, response_model: Type[BaseModel]) -> Response:
+    """
+    Construye la respuesta JSON reutilizando la serialización guardada en el caché
+
+    En un hit los bytes y el ETag salen directo de la entrada del caché, sin
+    validar ni codificar de nuevo. Si el cliente envía If-None-Match con el
+    mismo ETag se responde 304 sin cuerpo.
+
+    Args:
+        request: Petición en curso (para leer If-None-Match)
+        result: Valor retornado por el servicio
+        response_model: Modelo de respuesta del endpoint
+
+    Returns:
+        Response con el JSON serializado y el header ETag, o 304 Not Modified
+    """
+    def _encode(value: Any) -> bytes:
+        return response_model.model_validate(value).model_dump_json().encode("utf-8")
+
+    context = get_request_context()
+    if context is not None and context.cache_key is not None:
+        body, etag = cache.get_encoded(context.cache_key, result, _encode)
+    else:
+        body = _encode(result)
+        etag = compute_etag(body)
+
+    headers = {"ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,195 @@
+"""
+Sesiones HTTP síncronas compartidas por host (keep-alive, pool y reintentos comunes)
+"""
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+import requests
+from curl_cffi import CurlInfo, CurlOpt
+from curl_cffi import requests as curl_requests
+from curl_cffi.requests.exceptions import ConnectionError as CurlConnectionError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.config import settings
+from app.utils.rate_limiter import YAHOO_HOST
+
+
+class YahooSession(curl_requests.Session):
+    """
+    Sesión curl_cffi de Yahoo Finance (yfinance exige la huella TLS de un navegador)
+
+    Aplica la misma política de reintentos que las sesiones requests (errores
+    de conexión y los estados de status_forcelist en métodos idempotentes, con
+    backoff exponencial) y cuenta peticiones y conexiones nuevas para medir la
+    reutilización, como los pools de urllib3.
+    """
+
+    def __init__(self, retry: Retry, pool_size: int):
+        """
+        Args:
+            retry: Política de reintentos común
+            pool_size: Conexiones keep-alive que conserva cada handle de curl
+        """
+        super().__init__(
+            impersonate="chrome",
+            curl_options={CurlOpt.MAXCONNECTS: pool_size},
+            curl_infos=[CurlInfo.NUM_CONNECTS]
+        )
+        self.retry_policy = retry
+        self.pool_size = pool_size
+        self.num_requests = 0
+        self.num_connections = 0
+        self._counter_lock = Lock()
+
+    def _count(self, new_connections: int) -> None:
+        with self._counter_lock:
+            self.num_requests += 1
+            self.num_connections += new_connections
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Peticiones hechas y conexiones abiertas para ellas (los reintentos cuentan como peticiones)"""
+        with self._counter_lock:
+            return {'requests': self.num_requests, 'connections': self.num_connections}
+
+    def request(self, method: str, url: str, *args, **kwargs) -> Any:
+        policy = self.retry_policy
+        retryable = method.upper() in policy.allowed_methods
+        attempt = 0
+        while True:
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except CurlConnectionError:
+                self._count(1)
+                if not retryable or attempt >= policy.total:
+                    raise
+            else:
+                self._count(int(response.infos.get(CurlInfo.NUM_CONNECTS, 0)))
+                if not retryable or attempt >= policy.total or response.status_code not in policy.status_forcelist:
+                    return response
+            attempt += 1
+            time.sleep(policy.backoff_factor * 2 ** (attempt - 1))
+
+
+class HTTPSessionRegistry:
+    """
+    Una sesión requests por host, reutilizada por todas las peticiones síncronas
+
+    Cada sesión mantiene un pool de conexiones keep-alive del tamaño configurado
+    para su host, así que las peticiones sucesivas a una fuente reutilizan la
+    conexión TCP+TLS en lugar de abrir una nueva cada vez. Todas comparten la
+    misma política de reintentos: solo errores de conexión y 502/503/504 en
+    métodos idempotentes (los 429 los gestionan el pacer y los circuit breakers).
+
+    La sesión de Yahoo Finance para yfinance es una YahooSession (curl_cffi, la
+    que exige yfinance) con el mismo tamaño de pool y política de reintentos.
+    """
+
+    def __init__(
+        self,
+        pool_sizes: Dict[str, int],
+        default_pool_size: int = 4,
+        retry_total: int = 2,
+        retry_backoff: float = 0.5
+    ):
+        """
+        Args:
+            pool_sizes: Conexiones keep-alive por host
+            default_pool_size: Conexiones para hosts sin entrada propia
+            retry_total: Reintentos máximos por petición
+            retry_backoff: Factor de backoff exponencial entre reintentos (segundos)
+        """
+        self._pool_sizes = dict(pool_sizes)
+        self._default_pool_size = default_pool_size
+        self._retry = Retry(
+            total=retry_total,
+            read=0,
+            backoff_factor=retry_backoff,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False
+        )
+        self._sessions: Dict[str, requests.Session] = {}
+        self._yahoo_session: Optional[YahooSession] = None
+        self._lock = Lock()
+
+    def get(self, host: str) -> requests.Session:
+        """
+        Obtiene (o crea) la sesión de un host
+
+        Args:
+            host: Host de la fuente (ej: www.alphavantage.co)
+
+        Returns:
+            Sesión requests compartida
+        """
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                pool_size = self._pool_sizes.get(host, self._default_pool_size)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=self._retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def get_yahoo(self) -> YahooSession:
+        """Obtiene (o crea) la sesión de Yahoo Finance para yf.Ticker / yf.download"""
+        with self._lock:
+            if self._yahoo_session is None:
+                self._yahoo_session = YahooSession(
+                    self._retry,
+                    self._pool_sizes.get(YAHOO_HOST, self._default_pool_size)
+                )
+            return self._yahoo_session
+
+    def close(self) -> None:
+        """Cierra todas las sesiones y sus conexiones"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            yahoo, self._yahoo_session = self._yahoo_session, None
+        for session in sessions:
+            session.close()
+        if yahoo is not None:
+            yahoo.close()
+
+    @staticmethod
+    def _pool_stats(session: requests.Session) -> Dict[str, int]:
+        """Peticiones y conexiones abiertas por los pools de urllib3 de una sesión"""
+        requests_made = 0
+        connections = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_made += pool.num_requests
+                    connections += pool.num_connections
+        return {'requests': requests_made, 'connections': connections}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Por host: peticiones, conexiones abiertas y proporción de peticiones sobre conexiones reutilizadas"""
+        with self._lock:
+            sessions = dict(self._sessions)
+            yahoo = self._yahoo_session
+        stats: Dict[str, Any] = {}
+        for host, session in sessions.items():
+            pool = self._pool_stats(session)
+            pool['pool_size'] = self._pool_sizes.get(host, self._default_pool_size)
+            pool['reuse_ratio'] = round(1 - pool['connections'] / pool['requests'], 3) if pool['requests'] else 0.0
+            stats[host] = pool
+        if yahoo is not None:
+            pool = yahoo.pool_stats()
+            pool['pool_size'] = yahoo.pool_size
+            pool['reuse_ratio'] = round(1 - pool['connections'] / pool['requests'], 3) if pool['requests'] else 0.0
+            pool['backend'] = 'curl_cffi'
+            stats[YAHOO_HOST] = pool
+        return stats
+
+
+# Instancia global compartida por yfinance, Alpha Vantage y demás clientes síncronos
+http_sessions = HTTPSessionRegistry(
+    settings.HTTP_POOL_SIZES,
+    retry_total=settings.HTTP_RETRY_TOTAL,
+    retry_backoff=settings.HTTP_RETRY_BACKOFF
+)
@@ -0,0 +1,240 @@
+"""
+Motor de indicadores técnicos sobre arrays float64 contiguos (NumPy)
+"""
+import math
+from typing import Dict
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Parámetros del conjunto estándar (los mismos que usaba el cálculo con pandas)
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_PERIOD = 20
+BOLLINGER_STD = 2
+SMA_WINDOWS = (20, 50, 200)
+ADX_PERIOD = 14
+STOCHASTIC_PERIOD = 14
+STOCHASTIC_SMOOTH = 3
+
+# Barras mínimas para el conjunto completo (ADX: 14 DX, cada uno sobre 14 cambios)
+MIN_BARS = 2 * ADX_PERIOD
+
+# Menor potencia de (1 - alpha) que se deja llegar en un bloque de la EMA completa (sin underflow)
+_EWM_BLOCK_FLOOR = 1e-200
+
+
+def as_float_array(values) -> np.ndarray:
+    """Convierte una serie o secuencia en un array float64 contiguo (sin copiar si ya lo es)"""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sumas de todas las ventanas completas de x con una suma acumulada
+
+    Args:
+        x: Valores (1-D, o 2-D con una serie por fila: las ventanas recorren el último eje)
+        window: Tamaño de la ventana
+
+    Returns:
+        Array de n - window + 1 sumas por serie (la i-ésima es x[..., i:i + window].sum())
+    """
+    csum = np.empty(x.shape[:-1] + (x.shape[-1] + 1,))
+    csum[..., 0] = 0.0
+    np.cumsum(x, axis=-1, out=csum[..., 1:])
+    return csum[..., window:] - csum[..., :-window]
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Media móvil alineada con x, como pandas rolling(window).mean()
+
+    Args:
+        x: Valores (puede tener NaN; 1-D o una serie por fila)
+        window: Tamaño de la ventana
+
+    Returns:
+        Array de la forma de x: NaN hasta completar la primera ventana y en las ventanas con algún NaN
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    missing = np.isnan(x)
+    if missing.any():
+        sums = rolling_sum(np.where(missing, 0.0, x), window)
+        sums[rolling_sum(missing.astype(np.float64), window) > 0] = np.nan
+    else:
+        sums = rolling_sum(x, window)
+    out[..., window - 1:] = sums / window
+    return out
+
+
+def shift(x: np.ndarray) -> np.ndarray:
+    """x desplazado una barra hacia adelante (NaN en la primera), como pandas shift()"""
+    out = np.full(x.shape, np.nan)
+    out[..., 1:] = x[..., :-1]
+    return out
+
+
+def _rolling_window(x: np.ndarray, window: int, reduce: str, **kwargs) -> np.ndarray:
+    """Aplica una reducción de NumPy a cada ventana completa (NaN en las anteriores y en las que tienen NaN)"""
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        windows = sliding_window_view(x, window, axis=-1)
+        out[..., window - 1:] = getattr(windows, reduce)(axis=-1, **kwargs)
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Desviación estándar muestral móvil alineada con x, como pandas rolling(window).std()"""
+    return _rolling_window(x, window, "std", ddof=1)
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Mínimo móvil alineado con x, como pandas rolling(window).min()"""
+    return _rolling_window(x, window, "min")
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Máximo móvil alineado con x, como pandas rolling(window).max()"""
+    return _rolling_window(x, window, "max")
+
+
+def ewm_numerator(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Numerador de la EMA ajustada: num[t] = (1 - alpha) * num[t - 1] + x[t]
+
+    Dentro de un bloque se resuelve con una suma acumulada de x escalado por
+    potencias inversas de (1 - alpha), y los bloques se limitan para que esas
+    potencias no desborden. Así no hay un bucle Python por barra.
+
+    Args:
+        x: Valores sin NaN (1-D o una serie por fila)
+        span: Span de la EMA
+
+    Returns:
+        Array de la forma de x con el numerador en cada instante
+    """
+    n = x.shape[-1]
+    beta = 1.0 - 2.0 / (span + 1.0)
+    block = max(1, int(math.log(_EWM_BLOCK_FLOOR) / math.log(beta)))
+    powers = beta ** np.arange(min(block, n))
+    numerator = np.empty(x.shape)
+    carry = np.zeros(x.shape[:-1] + (1,))
+    for start in range(0, n, block):
+        segment = x[..., start:start + block]
+        scale = powers[:segment.shape[-1]]
+        values = scale * (beta * carry + np.cumsum(segment / scale, axis=-1))
+        numerator[..., start:start + segment.shape[-1]] = values
+        carry = values[..., -1:]
+    return numerator
+
+
+def ewm(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    EMA ajustada completa (pandas ewm(span).mean(), adjust=True)
+
+    Es el numerador de ewm_numerator dividido por la suma de los pesos.
+
+    Los NaN iniciales (relleno de series más cortas) se saltan como en pandas:
+    la EMA de cada serie empieza en su primer valor.
+
+    Args:
+        x: Valores (1-D o una serie por fila; NaN solo al inicio)
+        span: Span de la EMA
+
+    Returns:
+        Array de la forma de x con la EMA en cada instante (NaN en el relleno)
+    """
+    n = x.shape[-1]
+    beta = 1.0 - 2.0 / (span + 1.0)
+    missing = np.isnan(x)
+    padded = missing.any()
+    if padded:
+        x = np.where(missing, 0.0, x)
+    numerator = ewm_numerator(x, span)
+    positions = np.arange(1, n + 1, dtype=np.float64)
+    if padded:
+        positions = positions - np.argmax(~missing, axis=-1)[..., np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / ((1.0 - beta ** positions) / (1.0 - beta))
+    if padded:
+        result[positions <= 0] = np.nan
+    return result
+
+
+def compute_series(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Serie completa de cada indicador del conjunto estándar, alineada con las barras
+
+    El último elemento de cada array es el valor escalar del indicador.
+
+    También acepta matrices (una serie por fila, p. ej. tickers × barras)
+    rellenas con NaN al inicio para las series más cortas: cada fila da lo
+    mismo que sus barras sin relleno.
+
+    Args:
+        close, high, low: Arrays float64 de la misma forma (al menos MIN_BARS barras, NaN solo al inicio)
+
+    Returns:
+        Diccionario de arrays de la forma de close (NaN donde el indicador no está definido)
+    """
+    n = close.shape[-1]
+    if n < MIN_BARS:
+        raise ValueError(f"Se necesitan al menos {MIN_BARS} barras")
+
+    prev_close = shift(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # RSI (el primer cambio no existe y cuenta como 0, como en pandas)
+        delta = close - prev_close
+        padding = np.isnan(close)
+        gain = rolling_mean(np.where(padding, np.nan, np.where(delta > 0, delta, 0.0)), RSI_PERIOD)
+        loss = rolling_mean(np.where(padding, np.nan, np.where(delta < 0, -delta, 0.0)), RSI_PERIOD)
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+
+        # MACD
+        ema_fast = ewm(close, MACD_FAST)
+        ema_slow = ewm(close, MACD_SLOW)
+        macd = ema_fast - ema_slow
+        macd_signal = ewm(macd, MACD_SIGNAL)
+
+        # Bollinger (desviación estándar muestral, como pandas)
+        bb_middle = rolling_mean(close, BOLLINGER_PERIOD)
+        bb_std = rolling_std(close, BOLLINGER_PERIOD)
+
+        # ADX simplificado (los movimientos direccionales de la primera barra no existen
+        # y su rango verdadero es high - low: fmax ignora el cierre previo ausente)
+        plus_dm = np.maximum(high - shift(high), 0.0)
+        minus_dm = np.maximum(shift(low) - low, 0.0)
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = rolling_mean(tr, ADX_PERIOD)
+        plus_di = 100.0 * rolling_mean(plus_dm, ADX_PERIOD) / atr
+        minus_di = 100.0 * rolling_mean(minus_dm, ADX_PERIOD) / atr
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        adx = rolling_mean(dx, ADX_PERIOD)
+
+        # Estocástico
+        low_n = rolling_min(low, STOCHASTIC_PERIOD)
+        high_n = rolling_max(high, STOCHASTIC_PERIOD)
+        k_percent = 100.0 * (close - low_n) / (high_n - low_n)
+
+    result = {
+        "rsi": rsi,
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_histogram": macd - macd_signal,
+        "bollinger_upper": bb_middle + bb_std * BOLLINGER_STD,
+        "bollinger_middle": bb_middle,
+        "bollinger_lower": bb_middle - bb_std * BOLLINGER_STD,
+    }
+    for sma_window in SMA_WINDOWS:
+        result[f"sma_{sma_window}"] = rolling_mean(close, sma_window)
+    result["ema_12"] = ema_fast
+    result["ema_26"] = ema_slow
+    result["adx"] = adx
+    result["stochastic_k"] = k_percent
+    result["stochastic_d"] = rolling_mean(k_percent, STOCHASTIC_SMOOTH)
+    return result
@@ -0,0 +1,432 @@
+"""
+Registro de indicadores técnicos: kernels vectorizados con parámetros tipados y dependencias
+"""
+import math
+import re
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from app.utils.cache import cache
+from app.utils.indicator_engine import (
+    ewm, rolling_mean, rolling_std, rolling_min, rolling_max, shift,
+    RSI_PERIOD, MACD_FAST, MACD_SLOW, MACD_SIGNAL, BOLLINGER_PERIOD, BOLLINGER_STD,
+    ADX_PERIOD, STOCHASTIC_PERIOD, STOCHASTIC_SMOOTH
+)
+
+
+# Columnas de las barras disponibles para los kernels
+INPUTS = ("close", "high", "low")
+
+# Parámetros ya resueltos de un indicador, en orden de declaración: (("period", 14),)
+ParamValues = Tuple[Tuple[str, Any], ...]
+
+# nombre o nombre(clave=valor, ...) en la lista de la query
+_SPEC = re.compile(r"\s*([A-Za-z_]\w*)\s*(?:\(([^()]*)\))?\s*")
+
+
+class Param:
+    """Parámetro tipado de un indicador (int o float) con valor por defecto y rango válido"""
+
+    __slots__ = ("name", "kind", "default", "minimum", "maximum", "description")
+
+    def __init__(
+        self,
+        name: str,
+        kind: type,
+        default: Any,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        description: str = ""
+    ):
+        self.name = name
+        self.kind = kind
+        self.default = kind(default)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.description = description
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Convierte y valida un valor (acepta texto, como llega en la query)
+
+        Raises:
+            ValueError: Si el valor no es del tipo del parámetro o está fuera de rango
+        """
+        try:
+            if self.kind is int:
+                converted = int(value.strip()) if isinstance(value, str) else int(value)
+                if converted != value and not isinstance(value, str):
+                    raise ValueError
+            else:
+                converted = float(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"El parámetro {self.name} debe ser {self.kind.__name__}: {value!r}")
+        # NaN no falla ninguna comparación de rango: se rechaza igual que un valor fuera de rango
+        if (
+            not math.isfinite(converted)
+            or (self.minimum is not None and converted < self.minimum)
+            or (self.maximum is not None and converted > self.maximum)
+        ):
+            raise ValueError(f"El parámetro {self.name} debe estar entre {self.minimum} y {self.maximum}: {converted}")
+        return converted
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'type': self.kind.__name__,
+            'default': self.default,
+            'min': self.minimum,
+            'max': self.maximum,
+            'description': self.description,
+        }
+
+
+class Indicator:
+    """Indicador registrado: kernel, parámetros y dependencias declaradas"""
+
+    __slots__ = ("name", "kernel", "params", "depends", "description")
+
+    def __init__(
+        self,
+        name: str,
+        kernel: Callable[..., np.ndarray],
+        params: Tuple[Param, ...],
+        depends: Tuple[str, ...],
+        description: str
+    ):
+        self.name = name
+        self.kernel = kernel
+        self.params = params
+        self.depends = depends
+        self.description = description
+
+    def resolve(self, values: Dict[str, Any]) -> ParamValues:
+        """
+        Completa los parámetros con sus valores por defecto, los convierte y los valida
+
+        Raises:
+            ValueError: Si hay parámetros desconocidos o inválidos
+        """
+        unknown = set(values) - {param.name for param in self.params}
+        if unknown:
+            raise ValueError(f"Parámetros desconocidos para {self.name}: {', '.join(sorted(unknown))}")
+        return tuple(
+            (param.name, param.coerce(values[param.name]) if param.name in values else param.default)
+            for param in self.params
+        )
+
+    def label(self, params: ParamValues) -> str:
+        """Nombre canónico con todos los parámetros (ej: rsi(period=14))"""
+        if not params:
+            return self.name
+        return f"{self.name}({','.join(f'{name}={value}' for name, value in params)})"
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'params': [param.describe() for param in self.params],
+            'depends': list(self.depends),
+        }
+
+
+class IndicatorRegistry:
+    """
+    Indicadores declarados como kernels vectorizados con parámetros tipados y dependencias
+
+    Un kernel recibe el contexto de evaluación y sus parámetros ya validados, y
+    retorna un array alineado con las barras (1-D, o una serie por fila). Los
+    arrays de sus dependencias los pide al contexto (ctx.get("ema", span=12)),
+    que calcula cada (indicador, parámetros) una sola vez por evaluación: el
+    MACD, su señal y su histograma comparten las mismas EMA.
+
+    Las dependencias tienen que estar registradas antes que el indicador que
+    las usa, así que el grafo no puede tener ciclos.
+    """
+
+    def __init__(self):
+        self._indicators: Dict[str, Indicator] = {}
+        self._lock = Lock()
+
+    def register(
+        self,
+        name: str,
+        params: Tuple[Param, ...] = (),
+        depends: Tuple[str, ...] = (),
+        description: str = ""
+    ) -> Callable:
+        """
+        Decorador que registra un kernel: kernel(ctx, **params) -> np.ndarray
+
+        Args:
+            name: Nombre del indicador
+            params: Parámetros tipados
+            depends: Indicadores o entradas (close, high, low) que usa el kernel
+            description: Descripción para el listado del registro
+        """
+        def decorator(kernel: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+            with self._lock:
+                if name in self._indicators or name in INPUTS:
+                    raise ValueError(f"Indicador ya registrado: {name}")
+                missing = [d for d in depends if d not in self._indicators and d not in INPUTS]
+                if missing:
+                    raise ValueError(f"Dependencias no registradas de {name}: {', '.join(missing)}")
+                self._indicators[name] = Indicator(name, kernel, tuple(params), tuple(depends), description)
+            return kernel
+        return decorator
+
+    def get(self, name: str) -> Indicator:
+        """
+        Raises:
+            ValueError: Si el indicador no está registrado
+        """
+        indicator = self._indicators.get(name)
+        if indicator is None:
+            raise ValueError(f"Indicador desconocido: {name}")
+        return indicator
+
+    def resolve(self, name: str, params: Dict[str, Any]) -> Tuple[Indicator, ParamValues]:
+        """Indicador y parámetros validados de una especificación (nombre, parámetros)"""
+        indicator = self.get(name)
+        return indicator, indicator.resolve(params)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Indicadores registrados con sus parámetros y dependencias"""
+        with self._lock:
+            return [indicator.describe() for indicator in self._indicators.values()]
+
+
+class IndicatorContext:
+    """
+    Evaluación de indicadores sobre unas barras
+
+    Cada (indicador, parámetros) se calcula una sola vez y su array se comparte
+    con todos los indicadores que dependen de él. Con memo_prefix los arrays se
+    guardan además en el caché bajo {memo_prefix}:{etiqueta}, así otra petición
+    sobre las mismas barras los reutiliza aunque pida otros indicadores.
+    """
+
+    def __init__(
+        self,
+        registry: IndicatorRegistry,
+        inputs: Dict[str, np.ndarray],
+        memo_prefix: Optional[str] = None,
+        ttl: Optional[int] = None
+    ):
+        """
+        Args:
+            registry: Registro de indicadores
+            inputs: Arrays de las barras (close, high, low)
+            memo_prefix: Prefijo de las claves del caché (ej: ticker, período y última barra)
+            ttl: TTL de los arrays guardados en el caché
+        """
+        self.registry = registry
+        self.inputs = inputs
+        self.memo_prefix = memo_prefix
+        self.ttl = ttl
+        self._arrays: Dict[Tuple[str, ParamValues], np.ndarray] = {}
+        self._stack: List[Indicator] = []
+
+    def get(self, name: str, **params: Any) -> np.ndarray:
+        """
+        Array de un indicador (o de una entrada) con esos parámetros
+
+        Raises:
+            ValueError: Si el indicador o sus parámetros no son válidos, o si un
+                kernel usa algo que no declaró como dependencia
+        """
+        if self._stack and name not in self._stack[-1].depends:
+            raise ValueError(f"{self._stack[-1].name} usa {name} sin declararlo como dependencia")
+        if name in INPUTS:
+            return self.inputs[name]
+
+        indicator = self.registry.get(name)
+        resolved = indicator.resolve(params)
+        key = (name, resolved)
+        array = self._arrays.get(key)
+        if array is not None:
+            return array
+
+        memo_key = f"{self.memo_prefix}:{indicator.label(resolved)}" if self.memo_prefix is not None else None
+        if memo_key is not None:
+            array = cache.get(memo_key)
+        if array is None:
+            self._stack.append(indicator)
+            try:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    array = indicator.kernel(self, **dict(resolved))
+            finally:
+                self._stack.pop()
+            # Compartido entre indicadores y peticiones: de solo lectura
+            array.flags.writeable = False
+            if memo_key is not None:
+                cache.set(memo_key, array, ttl=self.ttl)
+        self._arrays[key] = array
+        return array
+
+
+def parse_indicator_specs(text: str) -> List[Tuple[str, Dict[str, str]]]:
+    """
+    Parsea una lista de indicadores con parámetros opcionales
+
+    Args:
+        text: Especificaciones separadas por comas (ej: "rsi(period=21),macd(fast=8,slow=21),sma")
+
+    Returns:
+        Lista de (nombre, parámetros como texto)
+
+    Raises:
+        ValueError: Si la especificación no se puede parsear
+
+    Examples:
+        >>> parse_indicator_specs("rsi(period=21),sma")
+        [('rsi', {'period': '21'}), ('sma', {})]
+    """
+    specs = []
+    position = 0
+    while position < len(text):
+        match = _SPEC.match(text, position)
+        if match is None:
+            raise ValueError(f"Especificación de indicadores inválida cerca de: {text[position:]!r}")
+        name, arguments = match.group(1).lower(), match.group(2)
+        params = {}
+        if arguments and arguments.strip():
+            for item in arguments.split(","):
+                key, separator, value = item.partition("=")
+                if not separator or not key.strip():
+                    raise ValueError(f"Parámetro inválido en {name}: {item.strip()!r} (usar clave=valor)")
+                params[key.strip()] = value.strip()
+        specs.append((name, params))
+        position = match.end()
+        if position < len(text):
+            if text[position] != ",":
+                raise ValueError(f"Especificación de indicadores inválida cerca de: {text[position:]!r}")
+            position += 1
+    return specs
+
+
+# Instancia global con los indicadores estándar
+indicator_registry = IndicatorRegistry()
+register = indicator_registry.register
+
+_MACD_LINES = (
+    Param("fast", int, MACD_FAST, 1, 500, "Span de la EMA rápida"),
+    Param("slow", int, MACD_SLOW, 1, 500, "Span de la EMA lenta"),
+)
+_MACD_PARAMS = _MACD_LINES + (Param("signal", int, MACD_SIGNAL, 1, 500, "Span de la EMA de la señal"),)
+_BOLLINGER_PARAMS = (
+    Param("period", int, BOLLINGER_PERIOD, 2, 1000, "Barras de la ventana"),
+    Param("std", float, BOLLINGER_STD, 0.0, 10.0, "Desviaciones estándar de las bandas"),
+)
+_ADX_PARAMS = (Param("period", int, ADX_PERIOD, 1, 500, "Barras de la ventana"),)
+_STOCHASTIC_PERIOD = Param("period", int, STOCHASTIC_PERIOD, 1, 500, "Barras de la ventana de máximos y mínimos")
+
+
+@register("sma", params=(Param("window", int, 20, 1, 1000, "Barras de la ventana"),), depends=("close",),
+          description="Media móvil simple del cierre")
+def _sma(ctx: IndicatorContext, window: int) -> np.ndarray:
+    return rolling_mean(ctx.get("close"), window)
+
+
+@register("ema", params=(Param("span", int, 12, 1, 1000, "Span de la EMA"),), depends=("close",),
+          description="Media móvil exponencial ajustada del cierre (pandas ewm)")
+def _ema(ctx: IndicatorContext, span: int) -> np.ndarray:
+    return ewm(ctx.get("close"), span)
+
+
+@register("stddev", params=(Param("window", int, 20, 2, 1000, "Barras de la ventana"),), depends=("close",),
+          description="Desviación estándar muestral móvil del cierre")
+def _stddev(ctx: IndicatorContext, window: int) -> np.ndarray:
+    return rolling_std(ctx.get("close"), window)
+
+
+@register("price_change", depends=("close",),
+          description="Cambio del cierre respecto de la barra anterior (0 en la primera)")
+def _price_change(ctx: IndicatorContext) -> np.ndarray:
+    close = ctx.get("close")
+    delta = close - shift(close)
+    return np.where(np.isnan(delta) & ~np.isnan(close), 0.0, delta)
+
+
+@register("rsi", params=(Param("period", int, RSI_PERIOD, 1, 500, "Barras de la ventana"),), depends=("price_change",),
+          description="RSI con medias simples de ganancias y pérdidas")
+def _rsi(ctx: IndicatorContext, period: int) -> np.ndarray:
+    change = ctx.get("price_change")
+    gain = rolling_mean(np.maximum(change, 0.0), period)
+    loss = rolling_mean(np.maximum(-change, 0.0), period)
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@register("macd", params=_MACD_LINES, depends=("ema",), description="EMA rápida menos EMA lenta")
+def _macd(ctx: IndicatorContext, fast: int, slow: int) -> np.ndarray:
+    return ctx.get("ema", span=fast) - ctx.get("ema", span=slow)
+
+
+@register("macd_signal", params=_MACD_PARAMS, depends=("macd",), description="EMA del MACD")
+def _macd_signal(ctx: IndicatorContext, fast: int, slow: int, signal: int) -> np.ndarray:
+    return ewm(ctx.get("macd", fast=fast, slow=slow), signal)
+
+
+@register("macd_histogram", params=_MACD_PARAMS, depends=("macd", "macd_signal"), description="MACD menos su señal")
+def _macd_histogram(ctx: IndicatorContext, fast: int, slow: int, signal: int) -> np.ndarray:
+    return ctx.get("macd", fast=fast, slow=slow) - ctx.get("macd_signal", fast=fast, slow=slow, signal=signal)
+
+
+@register("bollinger_middle", params=_BOLLINGER_PARAMS[:1], depends=("sma",), description="Banda media de Bollinger")
+def _bollinger_middle(ctx: IndicatorContext, period: int) -> np.ndarray:
+    return ctx.get("sma", window=period)
+
+
+@register("bollinger_upper", params=_BOLLINGER_PARAMS, depends=("sma", "stddev"), description="Banda superior de Bollinger")
+def _bollinger_upper(ctx: IndicatorContext, period: int, std: float) -> np.ndarray:
+    return ctx.get("sma", window=period) + ctx.get("stddev", window=period) * std
+
+
+@register("bollinger_lower", params=_BOLLINGER_PARAMS, depends=("sma", "stddev"), description="Banda inferior de Bollinger")
+def _bollinger_lower(ctx: IndicatorContext, period: int, std: float) -> np.ndarray:
+    return ctx.get("sma", window=period) - ctx.get("stddev", window=period) * std
+
+
+@register("true_range", depends=("close", "high", "low"),
+          description="Rango verdadero (high - low en la primera barra)")
+def _true_range(ctx: IndicatorContext) -> np.ndarray:
+    high, low = ctx.get("high"), ctx.get("low")
+    prev_close = shift(ctx.get("close"))
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+@register("atr", params=_ADX_PARAMS, depends=("true_range",), description="Media simple del rango verdadero")
+def _atr(ctx: IndicatorContext, period: int) -> np.ndarray:
+    return rolling_mean(ctx.get("true_range"), period)
+
+
+@register("plus_di", params=_ADX_PARAMS, depends=("high", "atr"), description="Indicador direccional positivo")
+def _plus_di(ctx: IndicatorContext, period: int) -> np.ndarray:
+    high = ctx.get("high")
+    return 100.0 * rolling_mean(np.maximum(high - shift(high), 0.0), period) / ctx.get("atr", period=period)
+
+
+@register("minus_di", params=_ADX_PARAMS, depends=("low", "atr"), description="Indicador direccional negativo")
+def _minus_di(ctx: IndicatorContext, period: int) -> np.ndarray:
+    low = ctx.get("low")
+    return 100.0 * rolling_mean(np.maximum(shift(low) - low, 0.0), period) / ctx.get("atr", period=period)
+
+
+@register("adx", params=_ADX_PARAMS, depends=("plus_di", "minus_di"), description="ADX simplificado (media simple del DX)")
+def _adx(ctx: IndicatorContext, period: int) -> np.ndarray:
+    plus_di = ctx.get("plus_di", period=period)
+    minus_di = ctx.get("minus_di", period=period)
+    return rolling_mean(100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di), period)
+
+
+@register("stochastic_k", params=(_STOCHASTIC_PERIOD,), depends=("close", "high", "low"), description="Estocástico %K")
+def _stochastic_k(ctx: IndicatorContext, period: int) -> np.ndarray:
+    lowest = rolling_min(ctx.get("low"), period)
+    highest = rolling_max(ctx.get("high"), period)
+    return 100.0 * (ctx.get("close") - lowest) / (highest - lowest)
+
+
+@register("stochastic_d", params=(_STOCHASTIC_PERIOD, Param("smooth", int, STOCHASTIC_SMOOTH, 1, 100, "Barras de la media de %K")),
+          depends=("stochastic_k",), description="Estocástico %D (media simple de %K)")
+def _stochastic_d(ctx: IndicatorContext, period: int, smooth: int) -> np.ndarray:
+    return rolling_mean(ctx.get("stochastic_k", period=period), smooth)
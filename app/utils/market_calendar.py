@@ -0,0 +1,287 @@
+"""
+Calendario de sesiones bursátiles y política de TTL según el horario de cada exchange
+"""
+import datetime
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Optional
+from zoneinfo import ZoneInfo
+from app.config import settings
+
+
+# Intervalos intradía de yfinance (el resto son diarios o mayores)
+_INTRADAY_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600,
+}
+
+# Límite de búsqueda de la siguiente sesión (cubre cualquier racha de feriados)
+_MAX_LOOKAHEAD_DAYS = 15
+
+
+def _easter(year: int) -> datetime.date:
+    """Domingo de Pascua (algoritmo de Meeus/Jones/Butcher)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> datetime.date:
+    """n-ésimo día de la semana del mes (n=-1 para el último)"""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _next_monday(day: datetime.date) -> datetime.date:
+    """Traslada un feriado al lunes siguiente si no cae en lunes (Ley Emiliani en Colombia)"""
+    return day + datetime.timedelta(days=(7 - day.weekday()) % 7)
+
+
+def _observed_us(day: datetime.date) -> datetime.date:
+    """Regla de la NYSE: sábado se observa el viernes, domingo el lunes"""
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+def _us_holidays(year: int) -> set:
+    easter = _easter(year)
+    days = {
+        _nth_weekday(year, 1, 0, 3),                     # Martin Luther King Jr.
+        _nth_weekday(year, 2, 0, 3),                     # Presidents Day
+        easter - datetime.timedelta(days=2),             # Good Friday
+        _nth_weekday(year, 5, 0, -1),                    # Memorial Day
+        _observed_us(datetime.date(year, 6, 19)),        # Juneteenth
+        _observed_us(datetime.date(year, 7, 4)),         # Independence Day
+        _nth_weekday(year, 9, 0, 1),                     # Labor Day
+        _nth_weekday(year, 11, 3, 4),                    # Thanksgiving
+        _observed_us(datetime.date(year, 12, 25)),       # Christmas
+    }
+    # Año nuevo en sábado no se observa el viernes anterior
+    new_year = datetime.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed_us(new_year))
+    return days
+
+
+def _colombia_holidays(year: int) -> set:
+    easter = _easter(year)
+    return {
+        datetime.date(year, 1, 1),
+        _next_monday(datetime.date(year, 1, 6)),         # Reyes Magos
+        _next_monday(datetime.date(year, 3, 19)),        # San José
+        easter - datetime.timedelta(days=3),             # Jueves Santo
+        easter - datetime.timedelta(days=2),             # Viernes Santo
+        datetime.date(year, 5, 1),
+        easter + datetime.timedelta(days=43),            # Ascensión (lunes)
+        easter + datetime.timedelta(days=64),            # Corpus Christi (lunes)
+        easter + datetime.timedelta(days=71),            # Sagrado Corazón (lunes)
+        _next_monday(datetime.date(year, 6, 29)),        # San Pedro y San Pablo
+        datetime.date(year, 7, 20),
+        datetime.date(year, 8, 7),
+        _next_monday(datetime.date(year, 8, 15)),        # Asunción
+        _next_monday(datetime.date(year, 10, 12)),       # Día de la Raza
+        _next_monday(datetime.date(year, 11, 1)),        # Todos los Santos
+        _next_monday(datetime.date(year, 11, 11)),       # Independencia de Cartagena
+        datetime.date(year, 12, 8),
+        datetime.date(year, 12, 25),
+        datetime.date(year, 12, 31),                     # Cierre bancario de fin de año
+    }
+
+
+def _chile_holidays(year: int) -> set:
+    easter = _easter(year)
+    return {
+        datetime.date(year, 1, 1),
+        easter - datetime.timedelta(days=2),             # Viernes Santo
+        datetime.date(year, 5, 1),
+        datetime.date(year, 5, 21),
+        datetime.date(year, 7, 16),
+        datetime.date(year, 8, 15),
+        datetime.date(year, 9, 18),
+        datetime.date(year, 9, 19),
+        datetime.date(year, 11, 1),
+        datetime.date(year, 12, 8),
+        datetime.date(year, 12, 25),
+        datetime.date(year, 12, 31),                     # Feriado bancario
+    }
+
+
+def _peru_holidays(year: int) -> set:
+    easter = _easter(year)
+    return {
+        datetime.date(year, 1, 1),
+        easter - datetime.timedelta(days=3),             # Jueves Santo
+        easter - datetime.timedelta(days=2),             # Viernes Santo
+        datetime.date(year, 5, 1),
+        datetime.date(year, 6, 29),
+        datetime.date(year, 7, 28),
+        datetime.date(year, 7, 29),
+        datetime.date(year, 8, 30),
+        datetime.date(year, 10, 8),
+        datetime.date(year, 11, 1),
+        datetime.date(year, 12, 8),
+        datetime.date(year, 12, 25),
+    }
+
+
+class Exchange:
+    """Horario de negociación y feriados de un exchange"""
+
+    def __init__(
+        self,
+        code: str,
+        timezone: str,
+        open_time: datetime.time,
+        close_time: datetime.time,
+        holidays: Callable[[int], set]
+    ):
+        """
+        Args:
+            code: Código del exchange (ej: "BVC")
+            timezone: Zona horaria IANA
+            open_time: Hora local de apertura
+            close_time: Hora local de cierre
+            holidays: Función que retorna los feriados de un año
+        """
+        self.code = code
+        self.tz = ZoneInfo(timezone)
+        self.open_time = open_time
+        self.close_time = close_time
+        self._holidays = holidays
+
+    @lru_cache(maxsize=32)
+    def holidays(self, year: int) -> FrozenSet[datetime.date]:
+        """Feriados del año, incluidos los configurados en MARKET_EXTRA_HOLIDAYS"""
+        days = set(self._holidays(year))
+        for extra in settings.MARKET_EXTRA_HOLIDAYS.get(self.code, []):
+            day = datetime.date.fromisoformat(extra)
+            if day.year == year:
+                days.add(day)
+        return frozenset(days)
+
+    def is_trading_day(self, day: datetime.date) -> bool:
+        """Indica si hay sesión ese día (lunes a viernes sin feriado)"""
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def is_open(self, now: datetime.datetime) -> bool:
+        """Indica si el mercado está abierto en el instante dado"""
+        local = now.astimezone(self.tz)
+        return self.is_trading_day(local.date()) and self.open_time <= local.time() < self.close_time
+
+    def _next_session_time(self, now: datetime.datetime, at: datetime.time) -> datetime.datetime:
+        """Próximo instante (posterior a now) en que ocurre `at` en un día de sesión"""
+        local = now.astimezone(self.tz)
+        day = local.date()
+        for _ in range(_MAX_LOOKAHEAD_DAYS):
+            if self.is_trading_day(day):
+                candidate = datetime.datetime.combine(day, at, tzinfo=self.tz)
+                if candidate > local:
+                    return candidate
+            day += datetime.timedelta(days=1)
+        return local + datetime.timedelta(days=1)
+
+    def next_open(self, now: datetime.datetime) -> datetime.datetime:
+        """Próxima apertura posterior a now"""
+        return self._next_session_time(now, self.open_time)
+
+    def next_close(self, now: datetime.datetime) -> datetime.datetime:
+        """Próximo cierre posterior a now (el de hoy si la sesión sigue abierta)"""
+        return self._next_session_time(now, self.close_time)
+
+
+EXCHANGES: Dict[str, Exchange] = {
+    "BVC": Exchange("BVC", "America/Bogota", datetime.time(9, 30), datetime.time(16, 0), _colombia_holidays),
+    "BCS": Exchange("BCS", "America/Santiago", datetime.time(9, 30), datetime.time(16, 0), _chile_holidays),
+    "BVL": Exchange("BVL", "America/Lima", datetime.time(9, 0), datetime.time(16, 0), _peru_holidays),
+    "NYSE": Exchange("NYSE", "America/New_York", datetime.time(9, 30), datetime.time(16, 0), _us_holidays),
+}
+
+# Sufijos de Yahoo Finance por exchange (sin sufijo = mercado de EE.UU.)
+_SUFFIX_TO_EXCHANGE = {
+    ".CL": "BVC",
+    ".SN": "BCS",
+    ".LM": "BVL",
+}
+
+
+def get_exchange(ticker: str) -> Optional[Exchange]:
+    """
+    Obtiene el exchange de un ticker formateado para Yahoo Finance
+
+    Args:
+        ticker: Ticker formateado (ej: "ECOPETROL.CL", "AAPL")
+
+    Returns:
+        Exchange o None si el sufijo no es conocido
+
+    Examples:
+        >>> get_exchange("ECOPETROL.CL").code
+        'BVC'
+        >>> get_exchange("AAPL").code
+        'NYSE'
+    """
+    ticker_upper = ticker.upper()
+    if "." not in ticker_upper:
+        return EXCHANGES["NYSE"]
+    suffix = ticker_upper[ticker_upper.rfind("."):]
+    code = _SUFFIX_TO_EXCHANGE.get(suffix)
+    return EXCHANGES[code] if code else None
+
+
+def market_data_ttl(
+    ticker: str,
+    interval: str = "1d",
+    default: int = 900,
+    now: Optional[datetime.datetime] = None
+) -> int:
+    """
+    Calcula el TTL de datos de mercado según la sesión del exchange
+
+    - Barras diarias o mayores (y lo derivado de ellas): hasta el próximo cierre
+      de sesión más MARKET_CLOSE_SETTLE_SECONDS, porque no cambian antes. Dentro
+      de ese asentamiento (recién cerrado el mercado) vence al terminar el de hoy.
+      De noche, fines de semana y feriados esto cubre hasta el cierre siguiente.
+    - Intradía con el mercado abierto: la duración de una barra (acotada por default).
+    - Intradía con el mercado cerrado: hasta la próxima apertura.
+
+    Args:
+        ticker: Ticker formateado
+        interval: Intervalo de yfinance (1m, 5m, 1h, 1d, 1wk, ...)
+        default: TTL a usar si el exchange es desconocido
+        now: Instante de referencia (por defecto ahora)
+
+    Returns:
+        TTL en segundos
+    """
+    exchange = get_exchange(ticker)
+    if exchange is None:
+        return default
+
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+    bar_seconds = _INTRADAY_SECONDS.get(interval)
+    if bar_seconds is not None:
+        if exchange.is_open(now):
+            return max(60, min(bar_seconds, default))
+        return max(60, int((exchange.next_open(now) - now).total_seconds()))
+
+    # Primer cierre cuyo asentamiento (cierre + MARKET_CLOSE_SETTLE_SECONDS) sigue por
+    # venir: entre el cierre y el fin del asentamiento es el de hoy, no el siguiente
+    settle = datetime.timedelta(seconds=settings.MARKET_CLOSE_SETTLE_SECONDS)
+    settled_at = exchange.next_close(now - settle) + settle
+    return max(60, int((settled_at - now).total_seconds()))
@@ -0,0 +1,195 @@
+"""
+Planificador por prioridad de los turnos del rate limiter de una fuente (Yahoo Finance)
+"""
+import heapq
+import itertools
+import time
+from threading import Condition
+from typing import Any, Dict, List, Optional, Tuple
+from app.utils.rate_limiter import RateLimiter
+from app.utils.request_context import get_request_context, ensure_upstream_allowed
+
+
+# Clases de prioridad, de mayor a menor
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_BACKGROUND = "background"
+
+_PRIORITY_RANK = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 1, PRIORITY_BACKGROUND: 2}
+
+# Cliente para peticiones sin contexto (scripts, hilos sueltos)
+_ANONYMOUS_CLIENT = "-"
+
+
+class _Ticket:
+    """Una petición esperando turno"""
+
+    __slots__ = ("priority", "client", "finish", "enqueued_at", "overtaken")
+
+    def __init__(self, priority: str, client: str, finish: float):
+        self.priority = priority
+        self.client = client
+        self.finish = finish
+        self.enqueued_at = time.monotonic()
+        self.overtaken = False
+
+
+class PriorityScheduler:
+    """
+    Reparte los turnos de un RateLimiter por clase de prioridad y, dentro de cada clase, por cliente
+
+    En lugar de asignar los turnos en orden de llegada, las peticiones esperan
+    en una cola y cada turno libre se entrega a la de mayor prioridad:
+
+    - interactive: peticiones de la API (por defecto).
+    - batch: peticiones que ya consumieron más de `interactive_budget` turnos
+      (p. ej. /dividends con 30 tickers) o marcadas como tales.
+    - background: precalentamiento y refrescos del caché en segundo plano.
+
+    Las clases tienen prioridad estricta: el trabajo de fondo encolado cede su
+    lugar en cuanto llega una petición de mayor clase, así que solo ocupa la
+    capacidad ociosa. Dentro de una clase los turnos se reparten entre
+    clientes por colas justas ponderadas (tiempo virtual): un cliente con
+    muchas peticiones en cola no retrasa a otro con una sola.
+
+    Una petición que deja de poder ir a la fuente mientras espera (p. ej. la
+    perdedora de una carrera) sale de la cola sin consumir turno.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        interactive_budget: int = 3,
+        client_weights: Optional[Dict[str, float]] = None,
+        poll_interval: float = 0.5
+    ):
+        """
+        Args:
+            limiter: Rate limiter cuyos turnos se reparten
+            interactive_budget: Turnos por petición antes de pasar a la clase batch
+            client_weights: Peso por cliente (por defecto 1; el doble de peso, el doble de turnos)
+            poll_interval: Máximo de segundos entre comprobaciones de cancelación mientras se espera
+        """
+        self.limiter = limiter
+        self.interactive_budget = interactive_budget
+        self.client_weights = dict(client_weights or {})
+        self.poll_interval = poll_interval
+        self._heap: List[Tuple[int, float, int, _Ticket]] = []
+        self._seq = itertools.count()
+        # Tiempo virtual por clase y último tiempo de fin asignado por (clase, cliente)
+        self._virtual_time: Dict[str, float] = {p: 0.0 for p in _PRIORITY_RANK}
+        self._client_finish: Dict[Tuple[str, str], float] = {}
+        self._granted: Dict[str, int] = {p: 0 for p in _PRIORITY_RANK}
+        self._wait_seconds: Dict[str, float] = {p: 0.0 for p in _PRIORITY_RANK}
+        self._preempted = 0
+        self._cancelled = 0
+        self._cond = Condition()
+
+    def _classify(self) -> Tuple[str, str]:
+        """Clase de prioridad y cliente de la petición en curso (cuenta el turno en su contexto)"""
+        context = get_request_context()
+        if context is None:
+            return PRIORITY_INTERACTIVE, _ANONYMOUS_CLIENT
+        if context.background:
+            return PRIORITY_BACKGROUND, context.client_id or _ANONYMOUS_CLIENT
+        turns = context.count_upstream_turn()
+        priority = context.priority or PRIORITY_INTERACTIVE
+        if priority == PRIORITY_INTERACTIVE and turns > self.interactive_budget:
+            priority = PRIORITY_BATCH
+        return priority, context.client_id or _ANONYMOUS_CLIENT
+
+    def _enqueue(self, priority: str, client: str) -> _Ticket:
+        """Encola un ticket con su tiempo de fin virtual (requiere el lock)"""
+        weight = max(self.client_weights.get(client, 1.0), 1e-6)
+        start = max(self._virtual_time[priority], self._client_finish.get((priority, client), 0.0))
+        ticket = _Ticket(priority, client, start + 1.0 / weight)
+        self._client_finish[(priority, client)] = ticket.finish
+
+        rank = _PRIORITY_RANK[priority]
+        for queued_rank, _, _, queued in self._heap:
+            if queued_rank > rank and not queued.overtaken:
+                queued.overtaken = True
+                if queued.priority == PRIORITY_BACKGROUND:
+                    self._preempted += 1
+        heapq.heappush(self._heap, (rank, ticket.finish, next(self._seq), ticket))
+        return ticket
+
+    def _remove(self, ticket: _Ticket) -> None:
+        """Saca un ticket de la cola (requiere el lock)"""
+        self._heap = [item for item in self._heap if item[3] is not ticket]
+        heapq.heapify(self._heap)
+
+    def _grant(self, ticket: _Ticket) -> None:
+        """Entrega el turno al primer ticket de la cola (requiere el lock)"""
+        heapq.heappop(self._heap)
+        self._virtual_time[ticket.priority] = max(self._virtual_time[ticket.priority], ticket.finish - 1e-9)
+        self._granted[ticket.priority] += 1
+        self._wait_seconds[ticket.priority] += time.monotonic() - ticket.enqueued_at
+        # Olvidar clientes que ya no tienen adelanto sobre el tiempo virtual
+        if len(self._client_finish) > 1024:
+            self._client_finish = {
+                key: finish for key, finish in self._client_finish.items()
+                if finish > self._virtual_time[key[0]]
+            }
+
+    def acquire(self) -> None:
+        """
+        Espera (sin tomar el lock del rate limiter) hasta que a esta petición le toque un turno
+
+        Raises:
+            CacheProbeMiss, UpstreamCancelled: Si la petición ya no puede ir a la fuente
+                (sale de la cola sin consumir turno)
+        """
+        priority, client = self._classify()
+        with self._cond:
+            ticket = self._enqueue(priority, client)
+            self._cond.notify_all()
+            try:
+                while True:
+                    # Una petición cancelada no debe tomar turno
+                    ensure_upstream_allowed()
+                    if self._heap[0][3] is ticket:
+                        acquired, wait = self.limiter.try_acquire()
+                        if acquired:
+                            self._grant(ticket)
+                            self._cond.notify_all()
+                            return
+                        self._cond.wait(timeout=min(wait, self.poll_interval))
+                    else:
+                        self._cond.wait(timeout=self.poll_interval)
+            except BaseException:
+                self._remove(ticket)
+                self._cancelled += 1
+                self._cond.notify_all()
+                raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cola por clase, turnos entregados, espera media y trabajo de fondo adelantado"""
+        with self._cond:
+            queued = {p: 0 for p in _PRIORITY_RANK}
+            for _, _, _, ticket in self._heap:
+                queued[ticket.priority] += 1
+            return {
+                'queued': queued,
+                'granted': dict(self._granted),
+                'avg_wait_seconds': {
+                    p: round(self._wait_seconds[p] / self._granted[p], 3) if self._granted[p] else 0.0
+                    for p in _PRIORITY_RANK
+                },
+                'background_preempted': self._preempted,
+                'cancelled': self._cancelled,
+            }
+
+
+def set_request_priority(priority: str) -> None:
+    """
+    Fija la clase de prioridad de la petición en curso
+
+    Args:
+        priority: PRIORITY_INTERACTIVE, PRIORITY_BATCH o PRIORITY_BACKGROUND
+    """
+    if priority not in _PRIORITY_RANK:
+        raise ValueError(f"Prioridad desconocida: {priority}")
+    context = get_request_context()
+    if context is not None:
+        context.priority = priority
@@ -1,84 +1,219 @@
 """
-Rate limiter para controlar peticiones a Yahoo Finance
+Rate limiter para controlar peticiones a las fuentes externas (Yahoo Finance, Alpha Vantage, TradingView)
 """
+import asyncio
 import time
 from threading import Lock
-from typing import Optional
-from collections import deque
+from typing import Dict, Optional, Tuple
+from app.config import settings
 
 
 class RateLimiter:
-    """Rate limiter usando algoritmo de ventana deslizante"""
-    
-    def __init__(self, max_requests: int = 2, time_window: float = 5.0):
+    """
+    Rate limiter por reservas (GCRA) justo en orden de llegada
+
+    Cada llamada reserva el siguiente turno libre bajo el lock y espera fuera
+    de él, de modo que los turnos se asignan en orden FIFO, nunca se duerme
+    con el lock tomado y las esperas de distintos hilos no se serializan.
+    Permite ráfagas de hasta max_requests peticiones y, en régimen sostenido,
+    una petición cada time_window / max_requests segundos.
+    """
+
+    def __init__(self, max_requests: int = 2, time_window: float = 5.0, name: str = "default"):
         """
         Args:
             max_requests: Número máximo de peticiones permitidas
             time_window: Ventana de tiempo en segundos
+            name: Nombre del bucket (normalmente el host de la fuente)
         """
+        self.name = name
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = deque()
+        # Intervalo de emisión entre peticiones en régimen sostenido
+        self._interval = time_window / max_requests
+        # Theoretical arrival time: instante a partir del cual el bucket vuelve a estar lleno
+        self._tat = time.monotonic()
+        self._waiting = 0
+        self._granted = 0
         self._lock = Lock()
-    
+
+    @property
+    def rate(self) -> float:
+        """Peticiones por segundo en régimen sostenido"""
+        return 1.0 / self._interval
+
+    def set_rate(self, requests_per_second: float) -> None:
+        """
+        Cambia la tasa sostenida conservando la ráfaga máxima
+
+        Args:
+            requests_per_second: Nueva tasa en peticiones por segundo
+        """
+        with self._lock:
+            self._interval = 1.0 / requests_per_second
+            self.time_window = self._interval * self.max_requests
+
+    def drain(self) -> None:
+        """Vacía el bucket: la próxima petición espera un intervalo completo (sin ráfaga)"""
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic() + self._tolerance())
+
+    def _tolerance(self) -> float:
+        """Adelanto permitido respecto al turno teórico (define la ráfaga)"""
+        return self._interval * (self.max_requests - 1)
+
+    def _wait_time(self, now: float) -> float:
+        """Segundos hasta que haya un turno libre (requiere el lock)"""
+        return max(0.0, max(self._tat, now) - self._tolerance() - now)
+
+    def reserve(self) -> float:
+        """
+        Reserva el siguiente turno libre (en orden de llegada)
+
+        Returns:
+            Segundos que hay que esperar antes de hacer la petición
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._wait_time(now)
+            self._tat = max(self._tat, now) + self._interval
+            self._granted += 1
+            return wait
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        """
+        Adquiere un turno solo si está disponible ya, sin esperar
+
+        Returns:
+            Tupla (adquirido, segundos de espera que habría que esperar si no se adquirió)
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._wait_time(now)
+            if wait > 0:
+                return False, wait
+            self._tat = max(self._tat, now) + self._interval
+            self._granted += 1
+            return True, 0.0
+
     def acquire(self, wait: bool = True) -> bool:
         """
         Intenta adquirir un permiso para hacer una petición
-        
+
         Args:
-            wait: Si es True, espera hasta que haya disponibilidad
-        
+            wait: Si es True, espera (fuera del lock) hasta que llegue su turno
+
         Returns:
             True si se adquirió el permiso, False si no
         """
+        if not wait:
+            return self.try_acquire()[0]
+
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep_queued(delay)
+        return True
+
+    def _sleep_queued(self, delay: float) -> None:
+        """Espera bloqueante contabilizada en la profundidad de la cola"""
         with self._lock:
-            current_time = time.time()
-            
-            # Eliminar peticiones fuera de la ventana de tiempo
-            while self.requests and self.requests[0] < current_time - self.time_window:
-                self.requests.popleft()
-            
-            # Si hay espacio disponible, permitir la petición
-            if len(self.requests) < self.max_requests:
-                self.requests.append(current_time)
-                return True
-            
-            # Si no hay espacio y wait=False, retornar False
-            if not wait:
-                return False
-            
-            # Calcular cuánto tiempo esperar
-            oldest_request = self.requests[0]
-            wait_time = self.time_window - (current_time - oldest_request) + 0.1
-            
-            if wait_time > 0:
-                time.sleep(wait_time)
-                # Después de esperar, intentar de nuevo
-                return self.acquire(wait=False)
-            
-            return False
-    
+            self._waiting += 1
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    async def acquire_async(self) -> None:
+        """
+        Versión awaitable de acquire: cede el event loop mientras espera su turno
+
+        Para endpoints async, que así no bloquean un hilo del servidor.
+        """
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        with self._lock:
+            self._waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
     def wait_if_needed(self) -> None:
         """Espera si es necesario antes de hacer una petición"""
         self.acquire(wait=True)
-    
+
+    def available_slots(self) -> float:
+        """Turnos disponibles sin esperar (negativo si hay reservas en cola)"""
+        with self._lock:
+            return self._available_slots(time.monotonic())
+
+    def _available_slots(self, now: float) -> float:
+        """Turnos disponibles sin esperar, como máximo max_requests (requiere el lock)"""
+        return min(self.max_requests, (now + self._tolerance() - self._tat) / self._interval + 1)
+
     def get_stats(self) -> dict:
         """Obtiene estadísticas del rate limiter"""
         with self._lock:
-            current_time = time.time()
-            # Limpiar peticiones antiguas
-            while self.requests and self.requests[0] < current_time - self.time_window:
-                self.requests.popleft()
-            
+            now = time.monotonic()
+            available = self._available_slots(now)
             return {
-                'current_requests': len(self.requests),
+                'name': self.name,
+                'current_requests': max(0, min(self.max_requests, self.max_requests - int(available))),
                 'max_requests': self.max_requests,
                 'time_window': self.time_window,
-                'available_slots': max(0, self.max_requests - len(self.requests))
+                'available_slots': max(0, min(self.max_requests, int(available))),
+                'queue_depth': self._waiting,
+                'next_slot_in': round(self._wait_time(now), 3),
+                'granted': self._granted
             }
 
 
-# Instancia global del rate limiter
-# Máximo 1 petición cada 15 segundos a Yahoo Finance (muy conservador para producción)
-rate_limiter = RateLimiter(max_requests=1, time_window=15.0)
+class RateLimiterRegistry:
+    """Un bucket de rate limiting por host de la fuente, creado bajo demanda"""
+
+    def __init__(self, limits: Dict[str, Dict[str, float]], default: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            limits: Configuración por host ({"max_requests": ..., "time_window": ...})
+            default: Configuración para hosts sin entrada propia
+        """
+        self._limits = dict(limits)
+        self._default = dict(default or {"max_requests": 5, "time_window": 1.0})
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = Lock()
+
+    def get(self, host: str) -> RateLimiter:
+        """Obtiene (o crea) el rate limiter de un host"""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                config = self._limits.get(host, self._default)
+                limiter = RateLimiter(
+                    max_requests=int(config["max_requests"]),
+                    time_window=float(config["time_window"]),
+                    name=host
+                )
+                self._limiters[host] = limiter
+            return limiter
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Estadísticas de todos los buckets creados"""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: limiter.get_stats() for host, limiter in limiters.items()}
+
+
+# Hosts de las fuentes externas
+YAHOO_HOST = "finance.yahoo.com"
+ALPHA_VANTAGE_HOST = "www.alphavantage.co"
+TRADINGVIEW_HOST = "scanner.tradingview.com"
+
+# Registro global: un bucket por host (límites en settings.RATE_LIMITS)
+rate_limiters = RateLimiterRegistry(settings.RATE_LIMITS)
 
+# Instancia global del rate limiter de Yahoo Finance (alias por compatibilidad)
+# Su tasa la ajusta el pacer adaptativo (app/utils/adaptive_pacer.py)
+rate_limiter = rate_limiters.get(YAHOO_HOST)
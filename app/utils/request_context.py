@@ -0,0 +1,205 @@
+"""
+Contexto por petición HTTP compartido entre middleware, servicios y utilidades
+"""
+from contextvars import ContextVar, Token
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional
+
+
+# Prioridad de estados de caché al agregar varias claves en una misma petición
+_CACHE_STATUS_RANK = {"HIT": 0, "NEGATIVE": 1, "STALE": 2, "MISS": 3}
+
+
+class RequestContext:
+    """Datos asociados a la petición en curso"""
+
+    def __init__(self):
+        self.cache_status: Optional[str] = None
+        self.cache_age: float = 0.0
+        self.cache_refreshing = False
+        # Ignorar entradas negativas del caché (Cache-Control: no-cache)
+        self.bypass_negative_cache = False
+        # Última clave de caché resuelta (la que respalda la respuesta serializada)
+        self.cache_key: Optional[str] = None
+        # Segundos antes de expirar en los que una entrada fresca se recarga ya (precalentamiento)
+        self.refresh_ahead: float = 0.0
+        # Petición interna en segundo plano (no cuenta como tráfico en vivo)
+        self.background = False
+        # Clase de prioridad ante el rate limiter de Yahoo (None = interactiva) y cliente que la hace
+        self.priority: Optional[str] = None
+        self.client_id: Optional[str] = None
+        # Turnos del rate limiter de Yahoo consumidos por la petición (los hilos de la
+        # misma petición los cuentan a la vez: se incrementan con count_upstream_turn)
+        self.upstream_turns = 0
+        self.turns_lock = Lock()
+        # Tickers de yfinance de la petición: todos los servicios comparten sus datos
+        self.tickers: Dict[str, Any] = {}
+        self.tickers_lock = Lock()
+
+    def count_upstream_turn(self) -> int:
+        """
+        Cuenta un turno del rate limiter de Yahoo consumido por la petición
+
+        Returns:
+            Turnos consumidos incluyendo este
+        """
+        with self.turns_lock:
+            self.upstream_turns += 1
+            return self.upstream_turns
+
+    def record_cache(self, status: str, age: float = 0.0, refreshing: bool = False) -> None:
+        """
+        Registra el resultado de una consulta al caché
+
+        Si la petición toca varias claves se conserva el peor estado
+        (MISS > STALE > NEGATIVE > HIT), la mayor edad y si alguna se está refrescando.
+
+        Args:
+            status: "HIT", "NEGATIVE", "STALE" o "MISS"
+            age: Edad en segundos del valor servido
+            refreshing: Si hay un refresco en segundo plano en curso
+        """
+        if self.cache_status is None or _CACHE_STATUS_RANK[status] > _CACHE_STATUS_RANK[self.cache_status]:
+            self.cache_status = status
+        self.cache_age = max(self.cache_age, age)
+        self.cache_refreshing = self.cache_refreshing or refreshing
+
+    def cache_headers(self) -> dict:
+        """Headers HTTP con la metadata de caché de la petición"""
+        if self.cache_status is None:
+            return {}
+        return {
+            "X-Cache": self.cache_status,
+            "Age": str(int(self.cache_age)),
+            "X-Cache-Refreshing": "true" if self.cache_refreshing else "false",
+        }
+
+
+class CacheProbeMiss(BaseException):
+    """
+    La sonda de caché necesita ir a la fuente para responder
+
+    Hereda de BaseException para que los `except Exception` de los servicios
+    no la conviertan en una respuesta de error.
+    """
+
+
+class UpstreamCancelled(BaseException):
+    """
+    La tarea fue cancelada (p. ej. perdió una carrera entre fuentes) y no debe
+    hacer más peticiones a la fuente
+
+    Hereda de BaseException por el mismo motivo que CacheProbeMiss.
+    """
+
+
+_current_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+# Sonda de caché en curso: solo se puede responder con lo que ya está en el caché
+_cache_probe: ContextVar[bool] = ContextVar("cache_probe", default=False)
+
+# Señal de cancelación de la tarea en curso (la activa quien la lanzó)
+_cancel_event: ContextVar[Optional[Event]] = ContextVar("cancel_event", default=None)
+
+# Peticiones en vivo en curso (las tareas en segundo plano ceden el paso mientras haya alguna)
+_active_requests = 0
+_active_lock = Lock()
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Obtiene el contexto de la petición en curso (None fuera de una petición)"""
+    return _current_context.get()
+
+
+def start_request_context(background: bool = False) -> Token:
+    """
+    Crea un contexto nuevo para la petición en curso
+
+    Args:
+        background: Tarea interna en segundo plano (no cuenta como petición en vivo)
+    """
+    global _active_requests
+    context = RequestContext()
+    context.background = background
+    if not background:
+        with _active_lock:
+            _active_requests += 1
+    return _current_context.set(context)
+
+
+def end_request_context(token: Token) -> None:
+    """Restaura el contexto anterior al terminar la petición"""
+    global _active_requests
+    context = _current_context.get()
+    if context is not None and not context.background:
+        with _active_lock:
+            _active_requests -= 1
+    _current_context.reset(token)
+
+
+def active_requests() -> int:
+    """Número de peticiones en vivo en curso"""
+    return _active_requests
+
+
+def run_cache_probe(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Ejecuta un servicio respondiendo solo desde el caché
+
+    Sirve para contestar hits directamente en el event loop: en cuanto el
+    servicio necesitaría cargar una clave o llamar a una fuente externa se
+    lanza CacheProbeMiss y quien llama debe ejecutarlo normalmente.
+
+    Args:
+        fn: Función síncrona del servicio
+        *args, **kwargs: Argumentos de fn
+
+    Returns:
+        Resultado de fn
+
+    Raises:
+        CacheProbeMiss: Si el resultado no está completo en el caché
+    """
+    token = _cache_probe.set(True)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _cache_probe.reset(token)
+
+
+def run_cancellable(event: Event, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Ejecuta fn con una señal de cancelación cooperativa
+
+    Una vez activado `event`, la siguiente petición que fn intente hacer a una
+    fuente externa (ensure_upstream_allowed) lanza UpstreamCancelled. Una
+    petición ya en vuelo termina, pero no se hace ninguna más.
+
+    Args:
+        event: Señal que activa quien quiere cancelar la tarea
+        fn: Función síncrona a ejecutar
+        *args, **kwargs: Argumentos de fn
+
+    Returns:
+        Resultado de fn
+    """
+    token = _cancel_event.set(event)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _cancel_event.reset(token)
+
+
+def ensure_upstream_allowed() -> None:
+    """
+    Verifica que la tarea en curso puede ir a la fuente externa
+
+    Raises:
+        CacheProbeMiss: Si se está sondeando el caché (solo se puede responder desde él)
+        UpstreamCancelled: Si la tarea fue cancelada
+    """
+    if _cache_probe.get():
+        raise CacheProbeMiss()
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise UpstreamCancelled()
@@ -0,0 +1,82 @@
+"""
+Coalescencia de peticiones concurrentes (single-flight) por clave
+"""
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """Llamada en curso compartida por todos los que esperan la misma clave"""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Ejecuta una sola vez una función por clave aunque haya llamadas concurrentes
+
+    El primer llamador (líder) ejecuta la función; los demás esperan y reciben
+    el mismo resultado, o la misma excepción si la función falla.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta fn para la clave o espera el resultado de la ejecución en curso
+
+        Args:
+            key: Clave de coalescencia (normalmente la clave del caché)
+            fn: Función sin argumentos que hace la petición real
+
+        Returns:
+            Resultado de fn (compartido entre todos los llamadores concurrentes)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+    def in_flight(self, key: str) -> bool:
+        """Indica si hay una ejecución en curso para la clave"""
+        with self._lock:
+            return key in self._calls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene estadísticas de las llamadas en curso"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'waiters': sum(call.waiters for call in self._calls.values())
+            }
@@ -0,0 +1,629 @@
+"""
+Estado incremental de indicadores técnicos: se actualiza en O(1) por barra nueva
+"""
+import math
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.utils.indicator_engine import (
+    RSI_PERIOD, MACD_FAST, MACD_SLOW, MACD_SIGNAL, BOLLINGER_PERIOD, BOLLINGER_STD,
+    SMA_WINDOWS, ADX_PERIOD, STOCHASTIC_PERIOD, STOCHASTIC_SMOOTH, MIN_BARS,
+    ewm_numerator, rolling_mean, rolling_min, rolling_max, shift
+)
+
+
+_NAN = float("nan")
+
+# Barras finales de la señal MACD cuyo peso supera la precisión de float64 (las demás no la cambian)
+_SIGNAL_BETA = 1.0 - 2.0 / (MACD_SIGNAL + 1.0)
+_SIGNAL_TERMS = int(math.ceil(math.log(np.finfo(np.float64).eps) / math.log(_SIGNAL_BETA))) + 1
+
+# Barras finales que cubren todas las ventanas móviles (la más larga es la SMA)
+_SEED_BARS = max(max(SMA_WINDOWS), 2 * ADX_PERIOD, STOCHASTIC_PERIOD + STOCHASTIC_SMOOTH, BOLLINGER_PERIOD)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Cociente con la semántica de NumPy (x/0 = ±inf, 0/0 = NaN) en lugar de ZeroDivisionError"""
+    if denominator == 0.0:
+        if numerator == 0.0 or math.isnan(numerator):
+            return _NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+class WindowedEMA:
+    """
+    EMA ajustada (pandas ewm(span).mean(), adjust=True) de cualquier ventana de la serie
+
+    Guarda el numerador num[t] = beta * num[t - 1] + x[t] de cada barra. La EMA
+    de la ventana que empieza en la barra s es, en la barra t,
+    (num[t] - beta^(t - s + 1) * num[s - 1]) / ((1 - beta^(t - s + 1)) / (1 - beta)):
+    cuando la ventana se desliza no hay que recalcular desde su nueva primera barra.
+    """
+
+    __slots__ = ("span", "beta", "numerators", "offset")
+
+    def __init__(self, span: int):
+        self.span = span
+        self.beta = 1.0 - 2.0 / (span + 1.0)
+        self.numerators: List[float] = []
+        # Posición de la barra del primer numerador guardado (los anteriores se olvidaron)
+        self.offset = 0
+
+    def update(self, x: float) -> None:
+        """Agrega un valor"""
+        last = self.numerators[-1] if self.numerators else 0.0
+        self.numerators.append(self.beta * last + x)
+
+    def seed(self, values: np.ndarray) -> None:
+        """Reemplaza el estado por el de la serie completa values (vectorizado)"""
+        self.numerators = ewm_numerator(values, self.span).tolist()
+        self.offset = 0
+
+    def covers(self, start: int) -> bool:
+        """Si conserva el numerador previo a la barra start (el que necesita una ventana que empieza ahí)"""
+        return start == 0 or start - 1 >= self.offset
+
+    def trim(self, before: int) -> None:
+        """Olvida los numeradores de las barras anteriores a before (O(1) amortizado)"""
+        drop = before - self.offset
+        if drop > 0 and 2 * drop > len(self.numerators):
+            del self.numerators[:drop]
+            self.offset = before
+
+    def window_tail(self, start: int, x: float, count: int) -> np.ndarray:
+        """
+        EMA de la ventana que empieza en la barra start, en las últimas count barras
+
+        Args:
+            start: Posición de la primera barra de la ventana (covers(start) debe ser True)
+            x: Valor de la barra provisional, que no se incorpora
+            count: Cuántas barras finales (incluida la provisional)
+
+        Returns:
+            Array con la EMA de la ventana en las últimas count barras
+        """
+        numerators = self.numerators
+        tail = np.empty(count)
+        tail[:-1] = numerators[len(numerators) - count + 1:]
+        tail[-1] = self.beta * (numerators[-1] if numerators else 0.0) + x
+        base = numerators[start - 1 - self.offset] if start > 0 else 0.0
+        end = self.offset + len(numerators)
+        decay = self.beta ** np.arange(end - count - start + 2, end - start + 2, dtype=np.float64)
+        return (tail - decay * base) * (1.0 - self.beta) / (1.0 - decay)
+
+
+class RollingMean:
+    """
+    Media móvil con suma corriente, como pandas rolling(window).mean()
+
+    Los NaN no entran en la suma pero se cuentan: la media es NaN mientras haya
+    alguno en la ventana. La suma se recalcula desde la ventana cada `window`
+    actualizaciones para que el error de redondeo no se acumule (O(1) amortizado).
+    """
+
+    __slots__ = ("window", "values", "total", "missing", "since_resync")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.total = 0.0
+        self.missing = 0
+        self.since_resync = 0
+
+    def seed(self, values: np.ndarray) -> None:
+        """Reemplaza el estado por el de haber agregado values (solo importa su última ventana)"""
+        tail = values[-self.window:]
+        missing = np.isnan(tail)
+        self.values = deque(tail.tolist())
+        self.missing = int(missing.sum())
+        self.total = math.fsum(tail[~missing].tolist())
+        self.since_resync = 0
+
+    def update(self, x: float) -> float:
+        """Agrega un valor y retorna la media (NaN hasta completar la ventana)"""
+        self.values.append(x)
+        if math.isnan(x):
+            self.missing += 1
+        else:
+            self.total += x
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.missing -= 1
+            else:
+                self.total -= old
+        self.since_resync += 1
+        if self.since_resync >= self.window:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+            self.since_resync = 0
+        if len(self.values) < self.window or self.missing:
+            return _NAN
+        return self.total / self.window
+
+    def peek(self, x: float) -> float:
+        """Media que resultaría de agregar x, sin modificar el estado"""
+        size = len(self.values) + 1
+        if size < self.window:
+            return _NAN
+        total, missing = self.total, self.missing
+        if size > self.window:
+            old = self.values[0]
+            if math.isnan(old):
+                missing -= 1
+            else:
+                total -= old
+        if missing or math.isnan(x):
+            return _NAN
+        return (total + x) / self.window
+
+
+class RollingStd:
+    """
+    Media y desviación estándar muestral móviles (pandas rolling(window).mean()/.std())
+
+    Acumula desvíos respecto de un valor de referencia que se reajusta a la media
+    en cada recálculo, así la varianza no pierde precisión por cancelación.
+    Solo admite valores finitos.
+    """
+
+    __slots__ = ("window", "values", "shift", "total", "total_sq", "since_resync")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.shift: Optional[float] = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.since_resync = 0
+
+    def seed(self, values: np.ndarray) -> None:
+        """Reemplaza el estado por el de haber agregado values (solo importa su última ventana)"""
+        tail = values[-self.window:].tolist()
+        self.values = deque(tail)
+        self.shift = math.fsum(tail) / len(tail) if tail else None
+        self.total = math.fsum(v - self.shift for v in tail) if tail else 0.0
+        self.total_sq = math.fsum((v - self.shift) ** 2 for v in tail) if tail else 0.0
+        self.since_resync = 0
+
+    def _stats(self, total: float, total_sq: float) -> Tuple[float, float]:
+        mean = total / self.window
+        variance = max(total_sq - total * total / self.window, 0.0) / (self.window - 1)
+        return self.shift + mean, math.sqrt(variance)
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """Agrega un valor y retorna (media, desviación) (NaN hasta completar la ventana)"""
+        if self.shift is None:
+            self.shift = x
+        self.values.append(x)
+        d = x - self.shift
+        self.total += d
+        self.total_sq += d * d
+        if len(self.values) > self.window:
+            old = self.values.popleft() - self.shift
+            self.total -= old
+            self.total_sq -= old * old
+        self.since_resync += 1
+        if self.since_resync >= self.window:
+            self.shift = math.fsum(self.values) / len(self.values)
+            self.total = math.fsum(v - self.shift for v in self.values)
+            self.total_sq = math.fsum((v - self.shift) ** 2 for v in self.values)
+            self.since_resync = 0
+        if len(self.values) < self.window:
+            return _NAN, _NAN
+        return self._stats(self.total, self.total_sq)
+
+    def peek(self, x: float) -> Tuple[float, float]:
+        """(media, desviación) que resultarían de agregar x, sin modificar el estado"""
+        size = len(self.values) + 1
+        if size < self.window:
+            return _NAN, _NAN
+        d = x - self.shift
+        total, total_sq = self.total + d, self.total_sq + d * d
+        if size > self.window:
+            old = self.values[0] - self.shift
+            total -= old
+            total_sq -= old * old
+        return self._stats(total, total_sq)
+
+
+class RollingMax:
+    """
+    Máximo móvil con una deque monótona (pandas rolling(window).max())
+
+    La deque guarda (posición, valor) con valores decrecientes: el frente es el
+    máximo de la ventana y cada valor entra y sale una sola vez (O(1) amortizado).
+    """
+
+    __slots__ = ("window", "count", "candidates")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.candidates: deque = deque()
+
+    def seed(self, values: np.ndarray) -> None:
+        """Reemplaza el estado por el de haber agregado values (solo importa su última ventana)"""
+        self.count = len(values)
+        self.candidates = deque()
+        start = self.count - min(self.count, self.window)
+        for position, x in enumerate(values[start:].tolist(), start):
+            while self.candidates and self.candidates[-1][1] <= x:
+                self.candidates.pop()
+            self.candidates.append((position, x))
+
+    def update(self, x: float) -> float:
+        """Agrega un valor y retorna el máximo (NaN hasta completar la ventana)"""
+        while self.candidates and self.candidates[-1][1] <= x:
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+        return self.candidates[0][1] if self.count >= self.window else _NAN
+
+    def peek(self, x: float) -> float:
+        """Máximo que resultaría de agregar x, sin modificar el estado"""
+        if self.count + 1 < self.window:
+            return _NAN
+        # Si el frente sale de la ventana, el siguiente candidato es el máximo del resto
+        start = self.count + 1 - self.window
+        for position, value in self.candidates:
+            if position >= start:
+                return max(value, x)
+        return x
+
+
+class RollingMin(RollingMax):
+    """Mínimo móvil (pandas rolling(window).min()): un máximo móvil sobre los valores negados"""
+
+    __slots__ = ()
+
+    def seed(self, values: np.ndarray) -> None:
+        super().seed(-values)
+
+    def update(self, x: float) -> float:
+        return -super().update(-x)
+
+    def peek(self, x: float) -> float:
+        return -super().peek(-x)
+
+
+class StreamingIndicators:
+    """
+    Estado del conjunto estándar de indicadores de una serie de barras
+
+    update() incorpora una barra cerrada en O(1) (O(ventana) cada `ventana`
+    barras al recalcular las sumas) y peek() da los indicadores con una barra
+    provisional sin incorporarla, para la última barra de la serie, que sigue
+    cambiando mientras la sesión está abierta.
+
+    peek() da los indicadores de la ventana que empieza en cualquier barra
+    incorporada (la de un período como 6mo, que se desliza con cada barra
+    nueva): las medias móviles solo miran sus últimas barras y las EMA se
+    corrigen por la primera barra de la ventana (WindowedEMA). Los valores
+    coinciden con el último de indicator_engine.compute_series sobre las
+    barras de esa ventana.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = _NAN
+        self.prev_high = _NAN
+        self.prev_low = _NAN
+        self.gain = RollingMean(RSI_PERIOD)
+        self.loss = RollingMean(RSI_PERIOD)
+        self.ema_fast = WindowedEMA(MACD_FAST)
+        self.ema_slow = WindowedEMA(MACD_SLOW)
+        self.bollinger = RollingStd(BOLLINGER_PERIOD)
+        self.smas = {window: RollingMean(window) for window in SMA_WINDOWS}
+        self.plus_dm = RollingMean(ADX_PERIOD)
+        self.minus_dm = RollingMean(ADX_PERIOD)
+        self.true_range = RollingMean(ADX_PERIOD)
+        self.dx = RollingMean(ADX_PERIOD)
+        self.highest = RollingMax(STOCHASTIC_PERIOD)
+        self.lowest = RollingMin(STOCHASTIC_PERIOD)
+        self.k_percent = RollingMean(STOCHASTIC_SMOOTH)
+
+    def _rolling(self, close: float, high: float, low: float, commit: bool) -> Dict[str, float]:
+        """Indicadores de ventana móvil con la barra dada; si commit, además la incorpora al estado"""
+        def feed(stat, x):
+            return stat.update(x) if commit else stat.peek(x)
+
+        first = self.count == 0
+
+        # RSI (el primer cambio no existe y cuenta como 0, como en pandas)
+        delta = 0.0 if first else close - self.prev_close
+        gain = feed(self.gain, delta if delta > 0 else 0.0)
+        loss = feed(self.loss, -delta if delta < 0 else 0.0)
+
+        # Bollinger
+        bb_middle, bb_std = feed(self.bollinger, close)
+
+        # ADX simplificado (los movimientos direccionales de la primera barra no existen)
+        if first:
+            plus_dm = minus_dm = _NAN
+            true_range = high - low
+        else:
+            plus_dm = max(high - self.prev_high, 0.0)
+            minus_dm = max(self.prev_low - low, 0.0)
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        atr = feed(self.true_range, true_range)
+        plus_di = 100.0 * _ratio(feed(self.plus_dm, plus_dm), atr)
+        minus_di = 100.0 * _ratio(feed(self.minus_dm, minus_dm), atr)
+        dx = 100.0 * _ratio(abs(plus_di - minus_di), plus_di + minus_di)
+        adx = feed(self.dx, dx)
+
+        # Estocástico
+        highest = feed(self.highest, high)
+        lowest = feed(self.lowest, low)
+        k_percent = 100.0 * _ratio(close - lowest, highest - lowest)
+        d_percent = feed(self.k_percent, k_percent)
+
+        smas = {window: feed(sma, close) for window, sma in self.smas.items()}
+
+        if commit:
+            self.count += 1
+            self.prev_close, self.prev_high, self.prev_low = close, high, low
+
+        return {
+            "rsi": 100.0 - 100.0 / (1.0 + _ratio(gain, loss)),
+            "bb_middle": bb_middle,
+            "bb_std": bb_std,
+            "smas": smas,
+            "adx": adx,
+            "stochastic_k": k_percent,
+            "stochastic_d": d_percent,
+        }
+
+    def update(self, close: float, high: float, low: float) -> None:
+        """Incorpora una barra cerrada"""
+        self._rolling(close, high, low, commit=True)
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+
+    def seed(self, close: np.ndarray, high: np.ndarray, low: np.ndarray) -> None:
+        """
+        Reemplaza el estado por el de haber incorporado todas las barras dadas (vectorizado)
+
+        Las EMA necesitan la serie completa; las ventanas móviles, solo sus
+        últimas _SEED_BARS barras (más la anterior para los cambios).
+
+        Args:
+            close, high, low: Arrays float64 del mismo largo (sin NaN)
+        """
+        count = len(close)
+        start = max(0, count - _SEED_BARS)
+        first = max(0, start - 1)
+        c, h, l = close[first:], high[first:], low[first:]
+        prev_close = shift(c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = c - prev_close
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+            plus_dm = np.maximum(h - shift(h), 0.0)
+            minus_dm = np.maximum(shift(l) - l, 0.0)
+            true_range = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+            # Descartar la barra previa (solo aportaba los cambios de la primera)
+            skip = start - first
+            c, h, l = c[skip:], h[skip:], l[skip:]
+            gain, loss = gain[skip:], loss[skip:]
+            plus_dm, minus_dm, true_range = plus_dm[skip:], minus_dm[skip:], true_range[skip:]
+
+            atr = rolling_mean(true_range, ADX_PERIOD)
+            plus_di = 100.0 * rolling_mean(plus_dm, ADX_PERIOD) / atr
+            minus_di = 100.0 * rolling_mean(minus_dm, ADX_PERIOD) / atr
+            dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            highest = rolling_max(h, STOCHASTIC_PERIOD)
+            lowest = rolling_min(l, STOCHASTIC_PERIOD)
+            k_percent = 100.0 * (c - lowest) / (highest - lowest)
+
+        self.count = count
+        self.prev_close, self.prev_high, self.prev_low = float(close[-1]), float(high[-1]), float(low[-1])
+        self.gain.seed(gain)
+        self.loss.seed(loss)
+        self.ema_fast.seed(close)
+        self.ema_slow.seed(close)
+        self.bollinger.seed(c)
+        for sma in self.smas.values():
+            sma.seed(c)
+        self.plus_dm.seed(plus_dm)
+        self.minus_dm.seed(minus_dm)
+        self.true_range.seed(true_range)
+        self.dx.seed(dx)
+        self.highest.seed(h)
+        self.lowest.seed(l)
+        self.k_percent.seed(k_percent)
+
+    def covers(self, start: int) -> bool:
+        """Si puede dar los indicadores de una ventana que empieza en la barra start"""
+        return 0 <= start < self.count and self.ema_fast.covers(start) and self.ema_slow.covers(start)
+
+    def trim(self, before: int) -> None:
+        """Olvida la historia de las EMA anterior a la barra before"""
+        self.ema_fast.trim(before)
+        self.ema_slow.trim(before)
+
+    def peek(self, close: float, high: float, low: float, start: int = 0) -> Dict[str, float]:
+        """
+        Indicadores con una barra provisional, sin incorporarla
+
+        Args:
+            close, high, low: Barra provisional
+            start: Posición de la primera barra de la ventana (al menos MIN_BARS
+                barras hasta la provisional; covers(start) debe ser True)
+
+        Returns:
+            Diccionario de indicadores (NaN donde el indicador no está definido)
+        """
+        rolling = self._rolling(close, high, low, commit=False)
+        size = self.count + 1 - start
+
+        # MACD: la señal es una EMA del MACD de la ventana, que basta sumar en su horizonte
+        terms = min(size, _SIGNAL_TERMS)
+        ema_fast = self.ema_fast.window_tail(start, close, terms)
+        ema_slow = self.ema_slow.window_tail(start, close, terms)
+        macd_tail = ema_fast - ema_slow
+        weights = _SIGNAL_BETA ** np.arange(terms - 1, -1, -1, dtype=np.float64)
+        macd = float(macd_tail[-1])
+        macd_signal = float(weights @ macd_tail) * (1.0 - _SIGNAL_BETA) / (1.0 - _SIGNAL_BETA ** size)
+
+        bb_middle, bb_std = rolling["bb_middle"], rolling["bb_std"]
+        result = {
+            "rsi": rolling["rsi"],
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd - macd_signal,
+            "bollinger_upper": bb_middle + bb_std * BOLLINGER_STD,
+            "bollinger_middle": bb_middle,
+            "bollinger_lower": bb_middle - bb_std * BOLLINGER_STD,
+        }
+        # Las demás ventanas caben en MIN_BARS; las SMA largas pueden no caber en la del período
+        for window, value in rolling["smas"].items():
+            result[f"sma_{window}"] = value if size >= window else _NAN
+        result["ema_12"] = float(ema_fast[-1])
+        result["ema_26"] = float(ema_slow[-1])
+        result["adx"] = rolling["adx"]
+        result["stochastic_k"] = rolling["stochastic_k"]
+        result["stochastic_d"] = rolling["stochastic_d"]
+        result["current_price"] = close
+        return result
+
+
+class _TickerState:
+    """Estado de indicadores de una serie de barras y la última barra incorporada"""
+
+    __slots__ = ("indicators", "last_ts", "last_bar", "lock")
+
+    def __init__(self):
+        self.indicators = StreamingIndicators()
+        self.last_ts: Optional[int] = None
+        self.last_bar: Optional[Tuple[float, float, float]] = None
+        self.lock = Lock()
+
+
+class IndicatorStateStore:
+    """
+    Estado incremental de indicadores por serie de barras, acotado con LRU
+
+    Cada llamada recibe la serie completa de barras compartidas (sin recortar
+    al período) y la posición donde empieza la ventana del período, pero solo
+    incorpora al estado las barras que llegaron desde la anterior: la barra ya
+    incorporada se ubica por timestamp (búsqueda binaria) y el costo depende de
+    las barras nuevas, no del largo del historial. La serie puede perder sus
+    primeras barras (la descarga de un período también se desliza) y la
+    ventana puede empezar en cualquier barra ya incorporada. La última barra
+    queda siempre provisional (peek) porque puede cambiar hasta el cierre.
+
+    El estado se reconstruye (vectorizado) si la barra incorporada ya no está
+    o cambió (ajustes por splits/dividendos, historial reescrito por la
+    fuente) o si la ventana empieza antes de la historia que conserva.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Args:
+            max_entries: Máximo de claves con estado (se descartan las menos usadas)
+        """
+        self.max_entries = max_entries
+        self._states: "OrderedDict[str, _TickerState]" = OrderedDict()
+        self._lock = Lock()
+        self._incremental = 0
+        self._rebuilds = 0
+        self._bars_applied = 0
+
+    def _get_state(self, key: str) -> _TickerState:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _TickerState()
+                self._states[key] = state
+                while len(self._states) > self.max_entries:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(key)
+            return state
+
+    def latest(
+        self,
+        key: str,
+        timestamps: np.ndarray,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        start: int = 0
+    ) -> Dict[str, float]:
+        """
+        Último valor de cada indicador en la ventana, incorporando al estado solo las barras nuevas
+
+        Args:
+            key: Clave del estado (ej: ticker e intervalo de las barras compartidas)
+            timestamps: Timestamps de las barras (int64, crecientes)
+            close, high, low: Arrays float64 del mismo largo (sin NaN)
+            start: Posición en los arrays de la primera barra de la ventana
+                (al menos MIN_BARS barras desde ella)
+
+        Returns:
+            Diccionario de indicadores (NaN donde el indicador no está definido)
+        """
+        n = len(close)
+        if n - start < MIN_BARS:
+            raise ValueError(f"Se necesitan al menos {MIN_BARS} barras")
+
+        state = self._get_state(key)
+        with state.lock:
+            indicators = state.indicators
+            position = None
+            if state.last_ts is not None:
+                found = int(np.searchsorted(timestamps, state.last_ts))
+                if (
+                    found < n - 1
+                    and timestamps[found] == state.last_ts
+                    and (close[found], high[found], low[found]) == state.last_bar
+                ):
+                    position = found
+
+            # Posición en el estado de la primera barra recibida
+            offset = 0 if position is None else indicators.count - 1 - position
+            if position is None or not indicators.covers(start + offset):
+                indicators = state.indicators = StreamingIndicators()
+                indicators.seed(close[:n - 1], high[:n - 1], low[:n - 1])
+                offset = 0
+                applied = n - 1
+                rebuilt = True
+            else:
+                for i in range(position + 1, n - 1):
+                    indicators.update(float(close[i]), float(high[i]), float(low[i]))
+                applied = n - 2 - position
+                rebuilt = False
+
+            # La historia anterior a la serie recibida ya no la pide ninguna ventana
+            indicators.trim(offset - 1)
+            state.last_ts = int(timestamps[n - 2])
+            state.last_bar = (close[n - 2], high[n - 2], low[n - 2])
+            values = indicators.peek(float(close[-1]), float(high[-1]), float(low[-1]), start + offset)
+
+        with self._lock:
+            if rebuilt:
+                self._rebuilds += 1
+            else:
+                self._incremental += 1
+            self._bars_applied += applied
+        return values
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Claves con estado, actualizaciones incrementales, reconstrucciones y barras incorporadas"""
+        with self._lock:
+            return {
+                'entries': len(self._states),
+                'max_entries': self.max_entries,
+                'incremental_updates': self._incremental,
+                'rebuilds': self._rebuilds,
+                'bars_applied': self._bars_applied,
+            }
+
+
+# Instancia global (estado por ticker e intervalo de las barras compartidas de /technical-indicators)
+indicator_states = IndicatorStateStore(settings.INDICATOR_STATE_MAX_ENTRIES)
@@ -0,0 +1,58 @@
+"""
+Clasificación de errores de las fuentes externas (Yahoo Finance, Alpha Vantage, TradingView)
+"""
+
+# Tipos de error
+ERROR_NOT_FOUND = "not_found"        # Ticker inexistente, deslistado o sin datos
+ERROR_RATE_LIMITED = "rate_limited"  # 429, bloqueo temporal o circuit breaker abierto
+ERROR_TRANSIENT = "transient"        # Timeouts, errores de red u otros fallos temporales
+
+_RATE_LIMITED_PATTERNS = (
+    "429",
+    "too many requests",
+    "rate limit",
+    "ratelimit",
+    "circuit breaker",
+    "bloqueando",
+)
+
+_NOT_FOUND_PATTERNS = (
+    "404",
+    "not found",
+    "delisted",
+    "no data found",
+    "no timezone found",
+    "no price data",
+    "invalid ticker",
+    "invalid symbol",
+    "datos insuficientes",
+)
+
+
+def classify_error(message: str) -> str:
+    """
+    Clasifica un mensaje de error según su tipo
+
+    Args:
+        message: Mensaje de error (str(e) o el campo "error" de la respuesta)
+
+    Returns:
+        ERROR_NOT_FOUND, ERROR_RATE_LIMITED o ERROR_TRANSIENT
+
+    Examples:
+        >>> classify_error("429 Client Error: Too Many Requests")
+        'rate_limited'
+        >>> classify_error("ECOPETROL.CL: possibly delisted; no price data found")
+        'not_found'
+        >>> classify_error("Read timed out")
+        'transient'
+    """
+    text = (message or "").lower()
+
+    if any(pattern in text for pattern in _RATE_LIMITED_PATTERNS):
+        return ERROR_RATE_LIMITED
+
+    if any(pattern in text for pattern in _NOT_FOUND_PATTERNS):
+        return ERROR_NOT_FOUND
+
+    return ERROR_TRANSIENT
@@ -2,54 +2,20 @@
 Cliente mejorado para yfinance con manejo de rate limiting y retry logic
 """
 import yfinance as yf
-import time
-import random
 from typing import Optional
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from app.utils.rate_limiter import rate_limiter
-from app.utils.circuit_breaker import circuit_breaker
+from app.utils.circuit_breaker import circuit_breaker, CircuitOpenError
+from app.utils.adaptive_pacer import PacedTicker, yahoo_pacer
+from app.utils.request_context import get_request_context
+from app.utils.http_sessions import http_sessions
 
 
 class YFinanceClient:
     """Cliente mejorado para yfinance con manejo de errores y rate limiting"""
     
-    _session = None
-    
-    @classmethod
-    def get_session(cls):
-        """Obtiene o crea una sesión con headers personalizados"""
-        if cls._session is None:
-            cls._session = requests.Session()
-            
-            # Headers personalizados más realistas para evitar bloqueos
-            cls._session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Cache-Control': 'max-age=0',
-            })
-            
-            # Configurar retry strategy
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[429, 500, 502, 503, 504],
-                allowed_methods=["GET", "POST"]
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            cls._session.mount("http://", adapter)
-            cls._session.mount("https://", adapter)
-        
-        return cls._session
+    @staticmethod
+    def get_session():
+        """Obtiene la sesión HTTP compartida de Yahoo Finance (pool keep-alive del registro)"""
+        return http_sessions.get_yahoo()
     
     @classmethod
     def get_ticker(cls, ticker: str, max_retries: int = 3, delay: float = 1.0):
@@ -62,28 +28,40 @@ class YFinanceClient:
             delay: Delay inicial entre reintentos (se incrementa exponencialmente)
         
         Returns:
-            Objeto yf.Ticker
+            Objeto yf.Ticker envuelto en PacedTicker: cada petición real pasa
+            por el pacer adaptativo compartido (yahoo_pacer). Dentro de una
+            petición HTTP se retorna siempre el mismo objeto por ticker, así que
+            info, history(period), actions, financials, etc. se descargan una
+            sola vez aunque los pidan varios servicios.
         """
-        # Verificar circuit breaker
-        if not circuit_breaker.can_proceed():
-            wait_time = circuit_breaker.get_wait_time()
-            if wait_time > 0:
-                raise Exception(f"Circuit breaker abierto. Yahoo Finance está bloqueando. Espera {int(wait_time)} segundos antes de intentar de nuevo.")
+        # Fallar rápido con el circuito abierto (sin consumir la prueba del semiabierto:
+        # esa la concede el pacer a la primera petición real)
+        if circuit_breaker.get_wait_time() > 0:
+            raise CircuitOpenError(circuit_breaker)
         
-        # Esperar si es necesario para respetar rate limiting
-        rate_limiter.wait_if_needed()
-        
-        # Delay adicional antes de crear el ticker (más conservador en producción)
-        # Delay aleatorio entre 2-4 segundos para parecer más humano
-        time.sleep(2.0 + random.uniform(0, 2.0))
+        # Reutilizar el Ticker de la petición en curso (datos compartidos entre servicios)
+        context = get_request_context()
+        if context is not None:
+            with context.tickers_lock:
+                stock = context.tickers.get(ticker)
+                if stock is None:
+                    stock = context.tickers[ticker] = cls._create_ticker(ticker)
+            return stock
         
+        return cls._create_ticker(ticker)
+    
+    @staticmethod
+    def _create_ticker(ticker: str) -> PacedTicker:
+        """Crea un Ticker envuelto en el pacer adaptativo"""
         # Crear Ticker sin hacer peticiones todavía
-        # La sesión personalizada se usará cuando se haga la primera petición real
-        stock = yf.Ticker(ticker)
+        # El ritmo lo marca el pacer en cada petición real (info, history, ...), que
+        # acelera mientras Yahoo responde bien y retrocede ante un 429
+        # Todas las peticiones de yfinance van por la sesión compartida (conexiones reutilizadas)
+        stock = yf.Ticker(ticker, session=http_sessions.get_yahoo())
         
         # Retornar el objeto sin validar (evita doble petición)
         # La validación y manejo de errores se hará cuando el servicio llame a stock.info
-        return stock
+        return PacedTicker(stock, yahoo_pacer)
     
     @classmethod
     def safe_get_info(cls, ticker: str, max_retries: int = 3):
@@ -101,9 +79,8 @@ class YFinanceClient:
             stock = cls.get_ticker(ticker, max_retries=max_retries)
             return stock.info
         except Exception as e:
-            # Si es error 429, esperar más tiempo
+            # Si es error 429, reintentar una vez: el pacer ya redujo la tasa y espaciará la petición
             if "429" in str(e) or "Too Many Requests" in str(e):
-                time.sleep(5)  # Esperar 5 segundos adicionales
                 try:
                     stock = cls.get_ticker(ticker, max_retries=2)
                     return stock.info
@@ -7,6 +7,7 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.chile_dividends_service import get_preview, sync_to_supabase
+from app.utils.dispatch import run_blocking, SUPABASE
 
 router = APIRouter(tags=["dividends-chile"])
 
@@ -26,7 +27,7 @@ async def preview_chile_dividends():
     El frontend puede editar los datos antes de enviar a /sync.
     """
     try:
-        return get_preview()
+        return await get_preview()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -40,7 +41,7 @@ async def sync_chile_dividends(payload: SyncPayload):
     Clave única: (symbol, fecha_corte, fuente) — sin duplicados.
     """
     try:
-        result = sync_to_supabase(rows=payload.dividendos)
+        result = await run_blocking(SUPABASE, sync_to_supabase, rows=payload.dividendos)
         return {
             "status"         : "ok" if not result["errores"] else "parcial",
             "guardados"      : result["guardados"],
@@ -7,6 +7,7 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.colombia_dividends_service import get_preview, sync_to_supabase
+from app.utils.dispatch import run_blocking, SUPABASE
 
 router = APIRouter(tags=["dividends-colombia"])
 
@@ -18,7 +19,7 @@ class SyncPayload(BaseModel):
 @router.get("/colombia/preview")
 async def preview_colombia_dividends():
     try:
-        return get_preview()
+        return await get_preview()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -26,7 +27,7 @@ async def preview_colombia_dividends():
 @router.post("/colombia/sync")
 async def sync_colombia_dividends(payload: SyncPayload):
     try:
-        result = sync_to_supabase(payload.dividendos)
+        result = await run_blocking(SUPABASE, sync_to_supabase, payload.dividendos)
         return {
             "status"   : "ok" if not result["errores"] else "parcial",
             "guardados": result["guardados"],
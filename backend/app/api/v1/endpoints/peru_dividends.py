@@ -7,6 +7,7 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.peru_dividends_service import get_preview, sync_to_supabase
+from app.utils.dispatch import run_blocking, SUPABASE
 
 router = APIRouter(tags=["dividends-peru"])
 
@@ -27,7 +28,7 @@ async def preview_peru_dividends():
     El frontend puede editar los datos antes de enviar a /sync.
     """
     try:
-        return get_preview()
+        return await get_preview()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -42,7 +43,9 @@ async def sync_peru_dividends(payload: SyncPayload):
     Clave única: (symbol, fecha_corte, fuente) — sin duplicados.
     """
     try:
-        result = sync_to_supabase(
+        result = await run_blocking(
+            SUPABASE,
+            sync_to_supabase,
             tv_rows  = payload.tradingview,
             bvl_rows = payload.bvl,
         )
@@ -2,7 +2,7 @@
 Configuración centralizada de la aplicación
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -23,6 +23,24 @@ class Settings(BaseSettings):
     DEFAULT_COUNTRY_SUFFIX: str = ".CL"
     MAX_TICKER_LENGTH_WITHOUT_SUFFIX: int = 5
     
+    # Hilos por destino para correr scrapers y escrituras fuera del event loop
+    DISPATCH_WORKERS: Dict[str, int] = {"scrapers": 2, "supabase": 4}
+
+    # Sesiones HTTP síncronas: conexiones keep-alive por host y reintentos comunes
+    HTTP_POOL_SIZES: Dict[str, int] = {"documents.bvl.com.pe": 2, "www.bvc.com.co": 2}
+    HTTP_DEFAULT_POOL_SIZE: int = 4
+    HTTP_RETRY_TOTAL: int = 2
+    HTTP_RETRY_BACKOFF: float = 0.5
+
+    # Circuit breakers por fuente externa (ventana en s, mínimo de peticiones,
+    # tasa de error que abre el circuito y segundos abierto antes de la prueba)
+    CIRCUIT_BREAKERS: Dict[str, Dict[str, float]] = {
+        "tradingview": {"window": 60,  "min_requests": 10, "failure_rate": 0.5, "recovery_timeout": 30},
+        "bvl":         {"window": 300, "min_requests": 3,  "failure_rate": 0.5, "recovery_timeout": 120},
+        "bvc":         {"window": 300, "min_requests": 3,  "failure_rate": 0.5, "recovery_timeout": 120},
+        "supabase":    {"window": 120, "min_requests": 4,  "failure_rate": 0.5, "recovery_timeout": 60},
+    }
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.v1.router import api_router
+from app.utils import async_http, circuit_breaker, dispatch, http_sessions
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -22,6 +23,13 @@ app.add_middleware(
 app.include_router(api_router)
 
 
+@app.on_event("shutdown")
+async def shutdown_resources():
+    dispatch.shutdown()
+    http_sessions.close()
+    await async_http.aclose()
+
+
 @app.get("/health", tags=["health"])
 async def health():
-    return {"status": "ok", "version": settings.APP_VERSION}
+    return {"status": "ok", "version": settings.APP_VERSION, "circuits": circuit_breaker.states(), "http": http_sessions.stats()}
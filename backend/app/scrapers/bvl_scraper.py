@@ -1,14 +1,18 @@
 """
 Scraper de Entrega de Derechos (dividendos locales) de BVL.
 Fuente: https://documents.bvl.com.pe/empresas/entrder1.htm
-HTML estático — solo requests + BeautifulSoup, sin browser.
+HTML estático — solo requests/httpx + BeautifulSoup, sin browser.
 """
 import re
 import datetime
-import requests
 from bs4 import BeautifulSoup
+from charset_normalizer import from_bytes
 from typing import Optional
 
+from app.utils.async_http import get_client
+from app.utils.http_sessions import get_session
+from app.utils.circuit_breaker import call_with_breaker, call_with_breaker_async, BVL
+
 BVL_URL = "https://documents.bvl.com.pe/empresas/entrder1.htm"
 
 HEADERS = {
@@ -69,13 +73,34 @@ def scrape_bvl_dividends(timeout: int = 15) -> list[dict]:
     Retorna lista de dicts normalizados.
     """
     try:
-        resp = requests.get(BVL_URL, headers=HEADERS, timeout=timeout)
+        resp = call_with_breaker(BVL, get_session(BVL_URL).get, BVL_URL, headers=HEADERS, timeout=timeout)
         resp.raise_for_status()
         resp.encoding = resp.apparent_encoding or "latin-1"
     except Exception as e:
         raise RuntimeError(f"BVL no disponible: {e}") from e
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return _parse_bvl_html(resp.text)
+
+
+async def scrape_bvl_dividends_async(timeout: int = 15) -> list[dict]:
+    """
+    Igual que scrape_bvl_dividends pero con el cliente httpx compartido:
+    no ocupa un hilo mientras espera a BVL y se puede cancelar.
+    """
+    try:
+        resp = await call_with_breaker_async(BVL, get_client().get, BVL_URL, headers=HEADERS, timeout=timeout)
+        resp.raise_for_status()
+        # Mismo criterio que requests (apparent_encoding): detectar por contenido
+        best = from_bytes(resp.content).best()
+        text = resp.content.decode(best.encoding if best else "latin-1", errors="replace")
+    except Exception as e:
+        raise RuntimeError(f"BVL no disponible: {e}") from e
+
+    return _parse_bvl_html(text)
+
+
+def _parse_bvl_html(html: str) -> list[dict]:
+    soup = BeautifulSoup(html, "html.parser")
 
     # Buscar la tabla principal
     table = soup.find("table")
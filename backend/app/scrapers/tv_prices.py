@@ -0,0 +1,51 @@
+"""
+Precios de cierre desde TradingView (scanner /symbol), async.
+Misma consulta que Overview().get_symbol_overview pero pidiendo solo "close":
+todas las consultas comparten el cliente httpx y corren concurrentes en el
+event loop, en vez de un ThreadPoolExecutor con un hilo por símbolo.
+"""
+import asyncio
+from typing import Optional
+
+from app.utils.async_http import get_client
+from app.utils.circuit_breaker import get_breaker, TRADINGVIEW
+
+TV_SYMBOL_URL   = "https://scanner.tradingview.com/symbol"
+MAX_CONCURRENCY = 16
+
+
+async def fetch_close(symbol: str, timeout: float = 10.0) -> Optional[float]:
+    """Precio de cierre de un símbolo TradingView (ej: BVL:BAP). None si no hay dato
+    o si el circuito de TradingView está abierto."""
+    breaker = get_breaker(TRADINGVIEW)
+    if not breaker.allow_request():
+        return None
+    try:
+        resp = await get_client().get(
+            TV_SYMBOL_URL,
+            params={"symbol": symbol, "fields": "close"},
+            timeout=timeout,
+        )
+    except Exception:
+        breaker.record_failure()
+        return None
+    breaker.record_status(resp.status_code)
+    try:
+        if resp.status_code == 200:
+            close = (resp.json() or {}).get("close")
+            if close:
+                return float(close)
+    except Exception:
+        pass
+    return None
+
+
+async def fetch_closes(symbols: list[str]) -> dict[str, Optional[float]]:
+    """Precios de cierre de varios símbolos, con a lo sumo MAX_CONCURRENCY peticiones a la vez."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def _one(symbol: str):
+        async with semaphore:
+            return symbol, await fetch_close(symbol)
+
+    return dict(await asyncio.gather(*(_one(s) for s in dict.fromkeys(symbols))))
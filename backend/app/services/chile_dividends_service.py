@@ -5,11 +5,12 @@ Moneda base: CLP. Dividendos USD se convierten con TC USDCLP=X.
 """
 import os
 import datetime
-import requests as http
 import yfinance as yf
-from concurrent.futures import ThreadPoolExecutor
 from tradingview_scraper.symbols.cal import CalendarScraper
-from tradingview_scraper.symbols.overview import Overview
+from app.scrapers.tv_prices import fetch_closes
+from app.utils.dispatch import run_blocking, SCRAPERS
+from app.utils.http_sessions import get_session, yahoo_session
+from app.utils.circuit_breaker import call_with_breaker, CircuitOpenError, SUPABASE
 
 SUPABASE_URL         = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY         = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
@@ -501,34 +502,21 @@ def _to_clp(amount, currency, tc) -> float | None:
 
 
 def get_tc_usdclp() -> float:
-    return round(yf.Ticker("USDCLP=X").fast_info["last_price"], 2)
+    return round(yf.Ticker("USDCLP=X", session=yahoo_session()).fast_info["last_price"], 2)
 
 
 # ── Precios BCS via TradingView Overview ──────────────────────────────────────
-def _get_bcs_prices(symbols: list[str]) -> dict[str, float | None]:
+async def _get_bcs_prices(symbols: list[str]) -> dict[str, float | None]:
     """Precio actual en CLP para stocks BCS sin yield en TV."""
     if not symbols:
         return {}
-
-    overview = Overview()
-
-    def _fetch(sym: str):
-        try:
-            result = overview.get_symbol_overview(symbol=f"BCS:{sym}")
-            if result.get("status") == "success":
-                price = result["data"].get("close")
-                if price:
-                    return sym, float(price)
-        except Exception:
-            pass
-        return sym, None
-
-    with ThreadPoolExecutor(max_workers=8) as ex:
-        return dict(ex.map(_fetch, symbols))
+    closes = await fetch_closes([f"BCS:{sym}" for sym in symbols])
+    return {sym: closes.get(f"BCS:{sym}") for sym in symbols}
 
 
 # ── Fetch TradingView Chile ───────────────────────────────────────────────────
-def fetch_tv_chile(tc: float) -> list[dict]:
+def _scrape_tv_chile(tc: float) -> list[dict]:
+    """Calendario de dividendos de TV (CalendarScraper es bloqueante: corre en el pool)."""
     now   = datetime.datetime.now(tz=datetime.timezone.utc)
     today = now.replace(hour=0, minute=0, second=0, microsecond=0)
     ts_from = int((today - datetime.timedelta(weeks=4)).timestamp())
@@ -572,7 +560,11 @@ def fetch_tv_chile(tc: float) -> list[dict]:
             "concepto"       : None,
             "yield_tv_pct"   : ev.get("dividends_yield"),
         }
-    rows = list(seen.values())
+    return list(seen.values())
+
+
+async def fetch_tv_chile(tc: float) -> list[dict]:
+    rows = await run_blocking(SCRAPERS, _scrape_tv_chile, tc)
 
     # Para los sin yield en TV, calcular con precio CLP de Overview
     sin_yield = [
@@ -581,7 +573,7 @@ def fetch_tv_chile(tc: float) -> list[dict]:
         if r["yield_tv_pct"] is None and r["monto_clp"]
     ]
     if sin_yield:
-        precios = _get_bcs_prices(sin_yield)
+        precios = await _get_bcs_prices(sin_yield)
         for r in rows:
             if r["yield_tv_pct"] is None and r["monto_clp"]:
                 sym_short = r["symbol"].split(":")[-1]
@@ -593,10 +585,10 @@ def fetch_tv_chile(tc: float) -> list[dict]:
 
 
 # ── Preview ───────────────────────────────────────────────────────────────────
-def get_preview() -> dict:
-    tc  = get_tc_usdclp()
+async def get_preview() -> dict:
+    tc  = await run_blocking(SCRAPERS, get_tc_usdclp)
     now = datetime.datetime.now(tz=datetime.timezone.utc)
-    rows = fetch_tv_chile(tc)
+    rows = await fetch_tv_chile(tc)
 
     return {
         "fecha_preview" : now.strftime("%Y-%m-%d %H:%M UTC"),
@@ -634,7 +626,11 @@ def sync_to_supabase(rows: list[dict]) -> dict:
 
     for i in range(0, len(rows), BATCH):
         batch = rows[i:i + BATCH]
-        r = http.post(url, json=batch, headers=_supabase_headers(), timeout=30)
+        try:
+            r = call_with_breaker(SUPABASE, get_session(url).post, url, json=batch, headers=_supabase_headers(), timeout=30)
+        except CircuitOpenError as e:
+            results["errores"].append(f"batch {i//BATCH+1}: {e}")
+            continue
         if r.status_code in (200, 201, 204):
             results["guardados"] += len(batch)
         else:
@@ -8,18 +8,20 @@ Precio (solo para calcular yield): TradingView Overview — es lo único que se
 consultando en TV; el calendario de dividendos de TV (fetch_tv_colombia) quedó abajo comentado.
 Moneda base: COP. Cada moneda que traiga el boletín se convierte a COP con su propia tasa FX.
 """
+import asyncio
 import calendar
 import io
 import os
 import re
 import datetime
-import requests as http
 import yfinance as yf
-from concurrent.futures import ThreadPoolExecutor
 from openpyxl import load_workbook
 # from tradingview_scraper.symbols.cal import CalendarScraper  # ya no se usa: dividendos vienen del boletín oficial BVC
-from tradingview_scraper.symbols.overview import Overview
 from tradingview_scraper.symbols.symbol_markets import SymbolMarkets
+from app.scrapers.tv_prices import fetch_closes
+from app.utils.dispatch import run_blocking, SCRAPERS
+from app.utils.http_sessions import get_session, yahoo_session
+from app.utils.circuit_breaker import call_with_breaker, CircuitOpenError, BVC, SUPABASE
 
 SUPABASE_URL         = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY         = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
@@ -247,7 +249,7 @@ def _to_cop(amount, currency, tc) -> float | None:
 
 
 def get_tc_usdcop() -> float:
-    return round(yf.Ticker("USDCOP=X").fast_info["last_price"], 2)
+    return round(yf.Ticker("USDCOP=X", session=yahoo_session()).fast_info["last_price"], 2)
 
 
 # ── Precios BVC via TradingView Overview ──────────────────────────────────────
@@ -284,7 +286,7 @@ def _resolve_mgc_symbol(ticker: str) -> str | None:
     return matches[0]["symbol"]
 
 
-def _get_bvc_prices(symbols: list[str]) -> dict[str, dict]:
+async def _get_bvc_prices(symbols: list[str]) -> dict[str, dict]:
     """Precio actual para tickers de Colombia. Intenta primero BVC:{sym} (precio en COP);
     si no existe (referencias MGC como GECO/JPMCO), resuelve el símbolo real en su bolsa
     de origen (NYSE/NASDAQ/...), cuyo precio viene en la moneda nativa de esa bolsa, no en COP.
@@ -292,64 +294,46 @@ def _get_bvc_prices(symbols: list[str]) -> dict[str, dict]:
     if not symbols:
         return {}
 
-    overview = Overview()
-
-    def _price_of(symbol: str) -> float | None:
-        try:
-            result = overview.get_symbol_overview(symbol=symbol)
-            if result.get("status") == "success":
-                price = result["data"].get("close")
-                if price:
-                    return float(price)
-        except Exception:
-            pass
-        return None
-
-    def _fetch(sym: str):
-        price = _price_of(f"BVC:{sym}")
-        if price is not None:
-            return sym, {"price": price, "is_cop": True}
-
-        resolved = _resolve_mgc_symbol(sym)
-        if resolved:
-            price = _price_of(resolved)
-            if price is not None:
-                return sym, {"price": price, "is_cop": False}
+    symbols = list(dict.fromkeys(symbols))
+    closes = await fetch_closes([f"BVC:{sym}" for sym in symbols])
+    precios = {
+        sym: {"price": closes[f"BVC:{sym}"], "is_cop": True} if closes.get(f"BVC:{sym}") is not None else None
+        for sym in symbols
+    }
 
-        return sym, None
+    # Sin feed en BVC: resolver el símbolo de origen (SymbolMarkets es bloqueante: en el pool)
+    faltantes = [sym for sym in symbols if precios[sym] is None]
+    if faltantes:
+        resolved = await asyncio.gather(*(run_blocking(SCRAPERS, _resolve_mgc_symbol, sym) for sym in faltantes))
+        origen = {sym: res for sym, res in zip(faltantes, resolved) if res}
+        closes = await fetch_closes(list(origen.values()))
+        for sym, res in origen.items():
+            if closes.get(res) is not None:
+                precios[sym] = {"price": closes[res], "is_cop": False}
 
-    with ThreadPoolExecutor(max_workers=8) as ex:
-        return dict(ex.map(_fetch, symbols))
+    return precios
 
 
 # ── Tasa de cambio {moneda}->COP via TradingView Overview (FX_IDC) ────────────
-def _get_fx_rate_to_cop(currency: str, cache: dict) -> float | None:
-    """Tasa {currency}->COP. Cachea por moneda dentro de la misma ejecución."""
-    currency = (currency or "COP").strip().upper()
-    if currency == "COP":
-        return 1.0
-    if currency in cache:
-        return cache[currency]
-
-    rate = None
-    try:
-        overview = Overview()
-        result = overview.get_symbol_overview(symbol=f"FX_IDC:{currency}COP")
-        if result.get("status") == "success":
-            close = result["data"].get("close")
-            if close:
-                rate = round(float(close), 4)
-    except Exception:
-        rate = None
+def _norm_currency(currency: str | None) -> str:
+    return (currency or "COP").strip().upper()
+
 
-    cache[currency] = rate
-    return rate
+async def _get_fx_rates_to_cop(currencies: set[str]) -> dict[str, float | None]:
+    """Tasas {currency}->COP de todas las monedas del boletín, consultadas en paralelo."""
+    foreign = sorted({_norm_currency(c) for c in currencies} - {"COP"})
+    closes = await fetch_closes([f"FX_IDC:{c}COP" for c in foreign])
+    rates: dict[str, float | None] = {"COP": 1.0}
+    for c in foreign:
+        close = closes.get(f"FX_IDC:{c}COP")
+        rates[c] = round(close, 4) if close else None
+    return rates
 
 
 # ── Fetch TradingView Colombia (LEGACY — reemplazado por boletín oficial BVC) ─
 # Se deja comentado en vez de borrarse por si hay que revertir. El calendario de
 # dividendos ahora viene de fetch_bvc_colombia(); TV solo se sigue usando arriba
-# en _get_bvc_prices()/_get_fx_rate_to_cop() para precio y tasa de cambio.
+# en _get_bvc_prices()/_get_fx_rates_to_cop() para precio y tasa de cambio.
 #
 # def fetch_tv_colombia(tc: float) -> list[dict]:
 #     now   = datetime.datetime.now(tz=datetime.timezone.utc)
@@ -442,7 +426,8 @@ def _discover_hygraph_token() -> str | None:
     (se carga en toda la web, no solo en /informes-y-boletines). Self-healing: si BVC
     rota el token, esto lo vuelve a encontrar sin tocar código ni variables de entorno."""
     try:
-        home = http.get(
+        home = call_with_breaker(
+            BVC, get_session("www.bvc.com.co").get,
             "https://www.bvc.com.co/",
             headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
             timeout=15,
@@ -452,7 +437,8 @@ def _discover_hygraph_token() -> str | None:
         if not chunk_match:
             return None
 
-        chunk = http.get(
+        chunk = call_with_breaker(
+            BVC, get_session("www.bvc.com.co").get,
             f"https://www.bvc.com.co{chunk_match.group(0)}",
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -473,7 +459,8 @@ def _hygraph_query(query: str, variables: dict, operation_name: str) -> dict:
     payload = {"query": query, "variables": variables, "operationName": operation_name}
 
     def _post(token: str | None):
-        return http.post(
+        return call_with_breaker(
+            BVC, get_session(BVC_HYGRAPH_URL).post,
             BVC_HYGRAPH_URL,
             json=payload,
             headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
@@ -518,7 +505,7 @@ def _fetch_bvc_bulletin_meta() -> dict:
 
 def _download_bvc_bulletin() -> bytes:
     meta = _fetch_bvc_bulletin_meta()
-    r = http.get(meta["url"], timeout=30)
+    r = call_with_breaker(BVC, get_session(meta["url"]).get, meta["url"], timeout=30)
     r.raise_for_status()
     return r.content
 
@@ -763,19 +750,20 @@ def _parse_bvc_range(xlsx_bytes: bytes, start_date: datetime.date, end_date: dat
     return rows
 
 
-def fetch_bvc_colombia(n_months: int = 3) -> list[dict]:
+async def fetch_bvc_colombia(n_months: int = 3) -> list[dict]:
     """Dividendos de los últimos n_months meses calendario (incluye el actual)
     desde el boletín oficial BVC. El yield se calcula con precio de TradingView
     Overview (único uso restante de TV)."""
     now = datetime.datetime.now(tz=datetime.timezone.utc)
     start_date, end_date = _month_range(now.year, now.month, n_months)
-    xlsx_bytes = _download_bvc_bulletin()
-    raw_rows = _parse_bvc_range(xlsx_bytes, start_date, end_date)
+    # Descarga (Hygraph + XLSX) y parseo con openpyxl son bloqueantes: en el pool
+    xlsx_bytes = await run_blocking(SCRAPERS, _download_bvc_bulletin)
+    raw_rows = await run_blocking(SCRAPERS, _parse_bvc_range, xlsx_bytes, start_date, end_date)
 
-    fx_cache: dict[str, float | None] = {}
+    fx_rates = await _get_fx_rates_to_cop({r["moneda"] for r in raw_rows})
     seen: dict[tuple, dict] = {}
     for r in raw_rows:
-        tc = _get_fx_rate_to_cop(r["moneda"], fx_cache)
+        tc = fx_rates.get(_norm_currency(r["moneda"]))
         monto_cop = round(r["monto"] * tc, 2) if tc is not None else None
         full_sym = f"BVC:{r['ticker']}"
         key = (full_sym, r["fecha_ex"])
@@ -801,7 +789,7 @@ def fetch_bvc_colombia(n_months: int = 3) -> list[dict]:
     # Yield vía precio de TradingView Overview (BVC no publica precio/yield en el boletín)
     tickers = [r["symbol"].split(":")[-1] for r in rows if r["monto_cop"]]
     if tickers:
-        precios = _get_bvc_prices(tickers)
+        precios = await _get_bvc_prices(tickers)
         for r in rows:
             if not r["monto_cop"]:
                 continue
@@ -818,10 +806,10 @@ def fetch_bvc_colombia(n_months: int = 3) -> list[dict]:
 
 
 # ── Preview ───────────────────────────────────────────────────────────────────
-def get_preview() -> dict:
+async def get_preview() -> dict:
     now = datetime.datetime.now(tz=datetime.timezone.utc)
     start_date, end_date = _month_range(now.year, now.month, 3)
-    rows = fetch_bvc_colombia()
+    rows = await fetch_bvc_colombia()
 
     return {
         "fecha_preview"    : now.strftime("%Y-%m-%d %H:%M UTC"),
@@ -855,7 +843,11 @@ def sync_to_supabase(rows: list[dict]) -> dict:
 
     for i in range(0, len(rows), BATCH):
         batch = rows[i:i + BATCH]
-        r = http.post(url, json=batch, headers=_supabase_headers(), timeout=30)
+        try:
+            r = call_with_breaker(SUPABASE, get_session(url).post, url, json=batch, headers=_supabase_headers(), timeout=30)
+        except CircuitOpenError as e:
+            results["errores"].append(f"batch {i//BATCH+1}: {e}")
+            continue
         if r.status_code in (200, 201, 204):
             results["guardados"] += len(batch)
         else:
@@ -5,13 +5,15 @@ BVL: sin filtro (lista completa declarada)
 Optimizado para Vercel free tier (< 10s): TV y BVL corren en paralelo.
 """
 import os
+import asyncio
 import datetime
-import requests as http
 import yfinance as yf
-from concurrent.futures import ThreadPoolExecutor
 from tradingview_scraper.symbols.cal import CalendarScraper
-from tradingview_scraper.symbols.overview import Overview
-from app.scrapers.bvl_scraper import scrape_bvl_dividends
+from app.scrapers.bvl_scraper import scrape_bvl_dividends_async
+from app.scrapers.tv_prices import fetch_closes
+from app.utils.dispatch import run_blocking, SCRAPERS
+from app.utils.http_sessions import get_session, yahoo_session
+from app.utils.circuit_breaker import call_with_breaker, CircuitOpenError, SUPABASE
 
 SUPABASE_URL          = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY          = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
@@ -200,7 +202,7 @@ def _to_pen(amount, currency, tc) -> float | None:
 
 
 def get_tc_usdpen() -> float:
-    return round(yf.Ticker("USDPEN=X").fast_info["last_price"], 4)
+    return round(yf.Ticker("USDPEN=X", session=yahoo_session()).fast_info["last_price"], 4)
 
 
 # ── Fetch TradingView ─────────────────────────────────────────────────────────
@@ -251,32 +253,18 @@ def fetch_tv(tc: float) -> list[dict]:
 
 
 # ── Precios BVL via TradingView Overview ──────────────────────────────────────
-def _get_bvl_prices(symbols: list[str]) -> dict[str, float | None]:
+async def _get_bvl_prices(symbols: list[str]) -> dict[str, float | None]:
     """Precio de cierre para símbolos BVL via TradingView Overview (solo para yield)."""
     if not symbols:
         return {}
-
-    overview = Overview()
-
-    def _fetch(sym: str):
-        try:
-            result = overview.get_symbol_overview(symbol=f"BVL:{sym}")
-            if result.get("status") == "success":
-                price = result["data"].get("close")
-                if price:
-                    return sym, float(price)
-        except Exception:
-            pass
-        return sym, None
-
-    with ThreadPoolExecutor(max_workers=8) as ex:
-        return dict(ex.map(_fetch, symbols))
+    closes = await fetch_closes([f"BVL:{sym}" for sym in symbols])
+    return {sym: closes.get(f"BVL:{sym}") for sym in symbols}
 
 
 # ── Fetch BVL ─────────────────────────────────────────────────────────────────
-def fetch_bvl(tc: float) -> list[dict]:
+async def fetch_bvl(tc: float) -> list[dict]:
     rows = []
-    for ev in scrape_bvl_dividends():
+    for ev in await scrape_bvl_dividends_async():
         if not ev.get("fecha_corte"):
             continue
         symbol = ev.get("symbol", "")
@@ -323,7 +311,7 @@ def fetch_bvl(tc: float) -> list[dict]:
     # Calcular yield: (monto_pen / precio_actual_pen) * 100
     candidatos = [r["symbol"] for r in rows if r["tipo"] == "efectivo" and r["monto_pen"]]
     if candidatos:
-        precios = _get_bvl_prices(candidatos)
+        precios = await _get_bvl_prices(candidatos)
         for r in rows:
             precio = precios.get(r["symbol"])
             if precio and precio > 0 and r["monto_pen"]:
@@ -333,21 +321,23 @@ def fetch_bvl(tc: float) -> list[dict]:
 
 
 # ── Preview (TV + BVL en paralelo) ────────────────────────────────────────────
-def get_preview() -> dict:
+async def get_preview() -> dict:
     # 1. TC primero (~2s)
-    tc = get_tc_usdpen()
+    tc = await run_blocking(SCRAPERS, get_tc_usdpen)
 
     # 2. TV + BVL en paralelo (~4s) → total ~6s, dentro del límite de 10s de Vercel
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        fut_tv  = executor.submit(fetch_tv, tc)
-        fut_bvl = executor.submit(fetch_bvl, tc)
-        tv_rows  = fut_tv.result()
-        bvl_error = None
-        try:
-            bvl_rows = fut_bvl.result()
-        except Exception as e:
-            bvl_rows  = []
-            bvl_error = str(e)
+    #    TV usa CalendarScraper (bloqueante, en el pool); BVL y sus precios son async
+    tv_rows, bvl_rows = await asyncio.gather(
+        run_blocking(SCRAPERS, fetch_tv, tc),
+        fetch_bvl(tc),
+        return_exceptions=True,
+    )
+    if isinstance(tv_rows, BaseException):
+        raise tv_rows
+    bvl_error = None
+    if isinstance(bvl_rows, BaseException):
+        bvl_error = str(bvl_rows)
+        bvl_rows  = []
 
     now = datetime.datetime.now(tz=datetime.timezone.utc)
     tv_syms  = {r["symbol"].split(":")[-1] for r in tv_rows}
@@ -394,7 +384,11 @@ def sync_to_supabase(tv_rows: list[dict], bvl_rows: list[dict]) -> dict:
     for fuente, rows in [("tv", tv_rows), ("bvl", bvl_rows)]:
         for i in range(0, len(rows), BATCH):
             batch = rows[i:i + BATCH]
-            r = http.post(url, json=batch, headers=_supabase_headers(), timeout=30)
+            try:
+                r = call_with_breaker(SUPABASE, get_session(url).post, url, json=batch, headers=_supabase_headers(), timeout=30)
+            except CircuitOpenError as e:
+                results["errores"].append(f"{fuente} batch {i//BATCH+1}: {e}")
+                continue
             if r.status_code in (200, 201, 204):
                 results[fuente] += len(batch)
             else:
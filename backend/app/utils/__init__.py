@@ -0,0 +1 @@
+"""Utilidades generales de la aplicación"""
@@ -0,0 +1,36 @@
+"""
+Cliente HTTP async compartido (httpx) para scrapers y consultas de precios.
+
+Un solo AsyncClient por event loop: las peticiones reutilizan conexiones
+keep-alive y corren concurrentes en el loop, sin un hilo por petición.
+Cancelar la tarea que espera una respuesta cancela la petición en curso.
+"""
+import asyncio
+
+import httpx
+
+LIMITS  = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Cliente compartido del event loop en curso (se crea en el primer uso)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        # Descartar clientes de loops ya cerrados
+        for old in [l for l in _clients if l.is_closed()]:
+            del _clients[old]
+        client = httpx.AsyncClient(limits=LIMITS, timeout=TIMEOUT, headers=HEADERS, follow_redirects=True)
+        _clients[loop] = client
+    return client
+
+
+async def aclose() -> None:
+    """Cierra el cliente del event loop en curso."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
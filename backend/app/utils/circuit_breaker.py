@@ -0,0 +1,147 @@
+"""
+Circuit breakers por fuente externa (TradingView, BVL, BVC/Hygraph, Supabase).
+
+Cada fuente tiene su propio circuito, así que una fuente caída no corta el
+tráfico a las demás. El circuito se abre cuando en la ventana deslizante hubo
+al menos `min_requests` peticiones y la proporción de fallos llega a
+`failure_rate`; tras `recovery_timeout` segundos deja pasar una sola petición
+de prueba (semiabierto): si responde bien se cierra y si falla se reabre.
+"""
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Awaitable, Callable
+
+from app.config import settings
+
+TRADINGVIEW = "tradingview"
+BVL         = "bvl"
+BVC         = "bvc"
+SUPABASE    = "supabase"
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit breaker abierto para {name}: reintenta en {int(retry_in)}s")
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, window: float = 60.0, min_requests: int = 5,
+                 failure_rate: float = 0.5, recovery_timeout: float = 60.0, probe_timeout: float = 30.0):
+        self.name             = name
+        self.window           = window
+        self.min_requests     = min_requests
+        self.failure_rate     = failure_rate
+        self.recovery_timeout = recovery_timeout
+        self.probe_timeout    = probe_timeout
+        self.state            = "closed"
+        self._outcomes: deque[tuple[float, bool]] = deque()   # (instante, falló)
+        self._failures      = 0
+        self._opened_at     = 0.0
+        self._probe_started: float | None = None
+        self._lock          = Lock()
+
+    def allow_request(self) -> bool:
+        """True si se puede hacer la petición (en semiabierto, solo la primera)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if now - self._opened_at < self.recovery_timeout:
+                    return False
+                self.state = "half_open"
+            if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+                return False
+            self._probe_started = now
+            return True
+
+    def check(self) -> None:
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == "half_open":
+                self.state, self._probe_started = "closed", None
+                self._outcomes.clear()
+                self._failures = 0
+                return
+            self._add(time.monotonic(), False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "half_open":
+                self.state, self._opened_at, self._probe_started = "open", now, None
+                return
+            self._add(now, True)
+            total = len(self._outcomes)
+            if self.state == "closed" and total >= self.min_requests and self._failures / total >= self.failure_rate:
+                self.state, self._opened_at = "open", now
+
+    def record_status(self, status_code: int) -> None:
+        """429 y 5xx cuentan como fallo de la fuente; el resto como respuesta válida."""
+        if status_code == 429 or status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _add(self, now: float, failed: bool) -> None:
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._failures -= self._outcomes.popleft()[1]
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+
+_breakers = {name: CircuitBreaker(name, **config) for name, config in settings.CIRCUIT_BREAKERS.items()}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def states() -> dict[str, str]:
+    return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+def call_with_breaker(name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Llama fn a través del circuito `name` (lanza CircuitOpenError si está abierto)."""
+    breaker = get_breaker(name)
+    breaker.check()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    status = getattr(result, "status_code", None)
+    if status is None:
+        breaker.record_success()
+    else:
+        breaker.record_status(status)
+    return result
+
+
+async def call_with_breaker_async(name: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """Versión async de call_with_breaker."""
+    breaker = get_breaker(name)
+    breaker.check()
+    try:
+        result = await fn(*args, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    status = getattr(result, "status_code", None)
+    if status is None:
+        breaker.record_success()
+    else:
+        breaker.record_status(status)
+    return result
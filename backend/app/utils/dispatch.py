@@ -0,0 +1,50 @@
+"""
+Ejecución de scrapers y escrituras síncronas fuera del event loop.
+
+Las partes bloqueantes de los previews (CalendarScraper, yfinance, boletín
+BVC) y los sync a Supabase, llamadas directo desde un endpoint async,
+congelan el worker entero, /health incluido. Cada destino tiene su propio
+pool con un número fijo de hilos, así un scraper lento no frena los sync.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable
+
+from app.config import settings
+
+SCRAPERS = "scrapers"
+SUPABASE = "supabase"
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_lock = Lock()
+
+
+def _executor(target: str) -> ThreadPoolExecutor:
+    with _lock:
+        executor = _executors.get(target)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=settings.DISPATCH_WORKERS.get(target, 2),
+                thread_name_prefix=f"dispatch-{target}",
+            )
+            _executors[target] = executor
+        return executor
+
+
+async def run_blocking(target: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Corre fn(*args, **kwargs) en el pool del destino y espera su resultado sin bloquear el loop."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    return await loop.run_in_executor(_executor(target), contextvars.copy_context().run, call)
+
+
+def shutdown() -> None:
+    """Cierra los pools (las tareas en curso terminan, las encoladas se cancelan)."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
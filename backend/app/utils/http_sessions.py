@@ -0,0 +1,98 @@
+"""
+Sesiones HTTP síncronas (requests) compartidas por host.
+
+Con requests.get/post a nivel de módulo cada llamada abre una conexión
+TCP+TLS nueva; con una sesión por host las llamadas sucesivas (batches a
+Supabase, token + consulta + descarga de BVC) reutilizan la conexión.
+Todas comparten la misma política de reintentos: solo errores de conexión y
+502/503/504 en métodos idempotentes (un POST a Supabase no se reenvía solo).
+"""
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
+
+try:
+    # Yahoo Finance exige sesiones que imiten un navegador (huella TLS incluida)
+    from curl_cffi import requests as curl_requests
+except ImportError:
+    curl_requests = None
+
+RETRY = Retry(
+    total=settings.HTTP_RETRY_TOTAL,
+    read=0,
+    backoff_factor=settings.HTTP_RETRY_BACKOFF,
+    status_forcelist=[502, 503, 504],
+    raise_on_status=False,
+)
+
+_sessions: dict[str, requests.Session] = {}
+_yahoo = None
+_lock = Lock()
+
+
+def get_session(url: str) -> requests.Session:
+    """Sesión compartida del host de `url` (acepta también el host solo)."""
+    host = urlsplit(url).hostname or url
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.HTTP_POOL_SIZES.get(host, settings.HTTP_DEFAULT_POOL_SIZE),
+                max_retries=RETRY,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def yahoo_session():
+    """Sesión para yf.Ticker (curl_cffi si está instalado; si no, None y yfinance usa la suya)."""
+    global _yahoo
+    if curl_requests is None:
+        return None
+    with _lock:
+        if _yahoo is None:
+            _yahoo = curl_requests.Session(impersonate="chrome")
+        return _yahoo
+
+
+def stats() -> dict[str, dict]:
+    """Por host: peticiones, conexiones abiertas y proporción de peticiones sobre conexiones reutilizadas."""
+    with _lock:
+        sessions = dict(_sessions)
+    result = {}
+    for host, session in sessions.items():
+        made = opened = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    made   += pool.num_requests
+                    opened += pool.num_connections
+        result[host] = {
+            "requests"   : made,
+            "connections": opened,
+            "reuse_ratio": round(1 - opened / made, 3) if made else 0.0,
+        }
+    return result
+
+
+def close() -> None:
+    global _yahoo
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        yahoo, _yahoo = _yahoo, None
+    for session in sessions:
+        session.close()
+    if yahoo is not None:
+        yahoo.close()
@@ -0,0 +1,123 @@
+"""
+Benchmark del cálculo de indicadores de /technical-indicators contra pandas
+Compara TechnicalService.compute_indicators_pandas con los caminos NumPy sobre
+barras sintéticas del tamaño de 6mo y 5y diarios y de 1 minuto intradía:
+
+- NumPy: último valor de cada serie de indicator_engine.compute_series.
+- Estado en frío: indicator_states.latest con el estado sin construir (se
+  reconstruye vectorizado), como tras un reinicio o un ajuste de la serie.
+- Barra nueva: indicator_states.latest cuando llega una barra y la serie se
+  desliza (pierde su primera barra), el caso de cada día con 6mo o 1y.
+
+Verifica además que los tres den los mismos valores que pandas.
+
+Uso:
+    python benchmark_indicators.py [--repeat N]
+"""
+import argparse
+import math
+import timeit
+import numpy as np
+import pandas as pd
+from app.services.technical_service import TechnicalService
+from app.utils.indicator_engine import as_float_array, compute_series
+from app.utils.streaming_indicators import IndicatorStateStore
+
+
+# (nombre, número de barras, frecuencia)
+CASES = [
+    ("6mo diario", 126, "B"),
+    ("5y diario", 1260, "B"),
+    ("1m intradía (7 días)", 7 * 390, "min"),
+    ("1m intradía (30 días)", 30 * 390, "min"),
+]
+
+
+def make_bars(n: int, freq: str, seed: int = 42) -> pd.DataFrame:
+    """Barras OHLC sintéticas (paseo aleatorio geométrico)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    index = pd.date_range("2020-01-01", periods=n, freq=freq)
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+    }, index=index)
+
+
+def run_numpy(hist: pd.DataFrame) -> dict:
+    """Último valor de las series del motor NumPy (incluye la conversión a arrays)"""
+    close = as_float_array(hist["Close"])
+    series = compute_series(close, as_float_array(hist["High"]), as_float_array(hist["Low"]))
+    values = {name: column[-1] for name, column in series.items()}
+    values["current_price"] = close[-1]
+    return values
+
+
+def run_state(store: IndicatorStateStore, hist: pd.DataFrame) -> dict:
+    """Camino del endpoint con el estado incremental (incluye la conversión a arrays)"""
+    return store.latest(
+        "BENCH",
+        hist.index.asi8,
+        as_float_array(hist["Close"]),
+        as_float_array(hist["High"]),
+        as_float_array(hist["Low"])
+    )
+
+
+def max_relative_error(expected: dict, actual: dict) -> float:
+    """Mayor error relativo entre los indicadores de ambos caminos"""
+    worst = 0.0
+    for name, value in expected.items():
+        other = actual[name]
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            if not math.isnan(other):
+                return float("inf")
+            continue
+        worst = max(worst, abs(float(value) - other) / max(abs(float(value)), 1e-12))
+    return worst
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Repeticiones por caso")
+    args = parser.parse_args()
+
+    def best_ms(fn, setup=None) -> float:
+        timer = timeit.repeat(fn, setup=setup or (lambda: None), number=1, repeat=args.repeat)
+        return min(timer) * 1000
+
+    print(
+        f"{'Caso':<24}{'Barras':>8}{'pandas':>9}{'NumPy':>9}{'Frío':>9}{'Nueva':>9}"
+        f"{'NumPy x':>9}{'Frío x':>9}{'Nueva x':>9}{'Error rel.':>12}"
+    )
+    for name, n, freq in CASES:
+        bars = make_bars(n + 1, freq)
+        previous, hist = bars.iloc[:-1], bars.iloc[1:]
+
+        # Estado de la llamada anterior: la nueva trae una barra más y una menos al inicio
+        store = IndicatorStateStore()
+        warm = lambda: run_state(store, previous)
+        warm()
+        expected = TechnicalService.compute_indicators_pandas(hist)
+        error = max(
+            max_relative_error(expected, run_numpy(hist)),
+            max_relative_error(expected, run_state(IndicatorStateStore(), hist)),
+            max_relative_error(expected, run_state(store, hist)),
+        )
+
+        pandas_ms = best_ms(lambda: TechnicalService.compute_indicators_pandas(hist))
+        numpy_ms = best_ms(lambda: run_numpy(hist))
+        cold_ms = best_ms(lambda: run_state(IndicatorStateStore(), hist))
+        next_ms = best_ms(lambda: run_state(store, hist), setup=warm)
+
+        print(
+            f"{name:<24}{n:>8}{pandas_ms:>9.3f}{numpy_ms:>9.3f}{cold_ms:>9.3f}{next_ms:>9.3f}"
+            f"{pandas_ms / numpy_ms:>8.1f}x{pandas_ms / cold_ms:>8.1f}x{pandas_ms / next_ms:>8.1f}x{error:>12.1e}"
+        )
+    print("Tiempos en ms (mínimo de las repeticiones); x = aceleración respecto de pandas")
+
+if __name__ == "__main__":
+    main()
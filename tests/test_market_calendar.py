@@ -0,0 +1,55 @@
+"""
+Pruebas del TTL de datos de mercado alrededor del cierre y su asentamiento
+"""
+import datetime
+from zoneinfo import ZoneInfo
+import pytest
+from app.config import settings
+from app.utils.market_calendar import market_data_ttl
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+SETTLE = settings.MARKET_CLOSE_SETTLE_SECONDS
+
+
+def _at(day: int, hour: int, minute: int = 0, second: int = 0) -> datetime.datetime:
+    """Instante de octubre de 2026 en Nueva York (13 = martes, 16 = viernes)"""
+    return datetime.datetime(2026, 10, day, hour, minute, second, tzinfo=NEW_YORK)
+
+
+@pytest.mark.parametrize("now, expected", [
+    # Sesión abierta: hasta el cierre de hoy más el asentamiento
+    (_at(13, 15, 0), 3600 + SETTLE),
+    # Recién cerrado, dentro del asentamiento: vence al terminar el de hoy
+    (_at(13, 16, 0), SETTLE),
+    (_at(13, 16, 10), SETTLE - 600),
+    # Ya asentado: hasta el cierre del día siguiente
+    (_at(13, 16, 0) + datetime.timedelta(seconds=SETTLE), 24 * 3600),
+    (_at(13, 20, 0), 20 * 3600 + SETTLE),
+])
+def test_daily_ttl_around_close(now, expected):
+    assert market_data_ttl("AAPL", "1d", now=now) == expected
+
+
+def test_settle_window_on_friday_does_not_jump_to_monday():
+    assert market_data_ttl("AAPL", "1d", now=_at(16, 16, 5)) == SETTLE - 300
+
+
+def test_after_friday_settle_expires_at_monday_close():
+    now = _at(16, 16, 0) + datetime.timedelta(seconds=SETTLE + 60)
+    monday_settled = _at(19, 16, 0) + datetime.timedelta(seconds=SETTLE)
+    assert market_data_ttl("AAPL", "1d", now=now) == int((monday_settled - now).total_seconds())
+
+
+def test_ttl_has_a_floor_at_the_end_of_the_settle_window():
+    now = _at(13, 16, 0) + datetime.timedelta(seconds=SETTLE - 10)
+    assert market_data_ttl("AAPL", "1d", now=now) == 60
+
+
+def test_intraday_ttl_is_unchanged():
+    assert market_data_ttl("AAPL", "5m", now=_at(13, 11, 0)) == 300
+    assert market_data_ttl("AAPL", "5m", now=_at(13, 16, 10)) == int((_at(14, 9, 30) - _at(13, 16, 10)).total_seconds())
+
+
+def test_unknown_exchange_uses_default():
+    assert market_data_ttl("FOO.XX", "1d", default=123, now=_at(13, 16, 10)) == 123
@@ -0,0 +1,108 @@
+"""
+Pruebas del estado incremental de indicadores contra un recálculo completo
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.technical_service import TechnicalService
+from app.utils.indicator_engine import compute_series
+from app.utils.streaming_indicators import IndicatorStateStore
+
+
+WINDOW = 126
+
+
+def _bars(n: int, seed: int = 7) -> pd.DataFrame:
+    """Barras diarias sintéticas (paseo aleatorio geométrico)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    index = pd.date_range("2020-01-01", periods=n, freq="B")
+    return pd.DataFrame({"High": close + spread, "Low": close - spread, "Close": close}, index=index)
+
+
+def _latest(store: IndicatorStateStore, bars: pd.DataFrame, start: int = 0) -> dict:
+    return store.latest(
+        "TEST:1d",
+        bars.index.asi8,
+        bars["Close"].to_numpy(),
+        bars["High"].to_numpy(),
+        bars["Low"].to_numpy(),
+        start
+    )
+
+
+def _pandas_latest(hist: pd.DataFrame) -> dict:
+    return {name: series.iloc[-1] for name, series in TechnicalService.compute_series_pandas(hist).items()}
+
+
+def _assert_matches(actual: dict, expected: dict) -> None:
+    for name, value in expected.items():
+        assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True), name
+
+
+def test_sliding_window_matches_pandas_recompute():
+    """Con la serie deslizándose barra a barra, el estado coincide con pandas y se actualiza incrementalmente"""
+    bars = _bars(WINDOW + 60)
+    store = IndicatorStateStore()
+    for end in range(WINDOW, len(bars) + 1):
+        hist = bars.iloc[end - WINDOW:end]
+        _assert_matches(_latest(store, hist), _pandas_latest(hist))
+
+    stats = store.get_stats()
+    assert stats["rebuilds"] == 1
+    assert stats["incremental_updates"] == len(bars) - WINDOW
+
+
+def test_period_window_over_shared_bars():
+    """Ventana de período sobre las barras compartidas: se desliza sin reconstruir el estado"""
+    bars = _bars(3 * WINDOW, seed=5)
+    store = IndicatorStateStore()
+    previous = 0
+    for end in range(2 * WINDOW, len(bars) + 1):
+        # Las barras compartidas (1y) y la ventana (6mo) pierden su primera barra con cada barra nueva
+        shared = bars.iloc[end - 2 * WINDOW:end]
+        start = len(shared) - WINDOW
+        _assert_matches(_latest(store, shared, start), _pandas_latest(shared.iloc[start:]))
+
+        incremental = store.get_stats()["incremental_updates"]
+        assert end == 2 * WINDOW or incremental == previous + 1
+        previous = incremental
+
+    assert store.get_stats()["rebuilds"] == 1
+
+
+def test_short_window_leaves_long_sma_undefined():
+    """Las SMA más largas que la ventana son NaN aunque el estado tenga más historia"""
+    bars = _bars(300, seed=9)
+    values = _latest(IndicatorStateStore(), bars, start=len(bars) - 60)
+    assert not np.isnan(values["sma_50"])
+    assert np.isnan(values["sma_200"])
+
+
+def test_sliding_window_matches_series_path():
+    """El camino escalar (estado) y el de series=true dan los mismos valores"""
+    bars = _bars(WINDOW + 30, seed=11)
+    store = IndicatorStateStore()
+    for end in range(WINDOW, len(bars) + 1, 5):
+        hist = bars.iloc[end - WINDOW:end]
+        series = compute_series(
+            hist["Close"].to_numpy(),
+            hist["High"].to_numpy(),
+            hist["Low"].to_numpy()
+        )
+        _assert_matches(_latest(store, hist), {name: values[-1] for name, values in series.items()})
+
+
+def test_growing_series_updates_incrementally():
+    """Si la primera barra no cambia (period=max), solo se incorporan las barras nuevas"""
+    bars = _bars(WINDOW + 20, seed=3)
+    store = IndicatorStateStore()
+    for end in range(WINDOW, len(bars) + 1):
+        hist = bars.iloc[:end]
+        _assert_matches(_latest(store, hist), _pandas_latest(hist))
+
+    stats = store.get_stats()
+    assert stats["rebuilds"] == 1
+    assert stats["incremental_updates"] == len(bars) - WINDOW
+    assert stats["bars_applied"] == len(bars) - 1